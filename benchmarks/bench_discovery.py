@@ -0,0 +1,128 @@
+"""LAN discovery: time to scan an address range, against emulated hosts.
+
+Run from the repository root:
+
+    python benchmarks/bench_discovery.py [--json] [--controllers N] [--silent N] [--concurrency N]
+
+The whole loopback range 127.0.0.0/24 is scanned on one port. On it run:
+
+* ``--controllers`` emulated controllers, each with its own MAC address,
+  plus one of them answering on a second address to check deduplication;
+* ``--silent`` hosts that accept connections and never answer, like
+  addresses that swallow packets on a real LAN, so the per-host deadline
+  dominates the scan time;
+* a plain web server whose devvars.js isn't a controller's.
+
+Every other address refuses the connection straight away. The result says
+how long the scan took and whether exactly the emulated controllers were
+found, once each.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from aiohttp import web
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+
+from pyhelialux.discovery import DEFAULT_CONCURRENCY, scan  # noqa: E402
+from pyhelialux.emulator import HelialuxEmulator  # noqa: E402
+
+NETWORK = "127.0.0.0/24"
+PORT = 18090
+FIRST_HOST = 10  # last octet of the first emulated host
+
+
+def _mac(index):
+    return f"a0:b1:c2:d3:{index // 256:02x}:{index % 256:02x}"
+
+
+async def _silent_host(address):
+    """Accept connections on ``address`` and never answer."""
+    held = []
+
+    async def hold(reader, writer):
+        held.append(writer)
+
+    return await asyncio.start_server(hold, address, PORT), held
+
+
+async def _other_web_server(address):
+    app = web.Application()
+    app.router.add_get("/devvars.js", lambda request: web.Response(text="var x=1;"))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, address, PORT).start()
+    return runner
+
+
+async def _run(controllers, silent, concurrency):
+    addresses = iter(f"127.0.0.{octet}" for octet in range(FIRST_HOST, 255))
+    emulators = []
+    expected = set()
+    for index in range(controllers):
+        address = next(addresses)
+        info = ("HeliaLux SmartControl", "V2.0", "V2.2.2", address, _mac(index).upper())
+        emulators.append(HelialuxEmulator(info=info))
+        await emulators[-1].start(address, PORT)
+        expected.add(_mac(index))
+    if controllers:
+        # The first controller again on a second address: must be reported once
+        duplicate = HelialuxEmulator(info=emulators[0].info)
+        await duplicate.start(next(addresses), PORT)
+        emulators.append(duplicate)
+    servers = [await _silent_host(next(addresses)) for _ in range(silent)]
+    other = await _other_web_server(next(addresses))
+
+    try:
+        started = time.monotonic()
+        found = await scan(NETWORK, port=PORT, concurrency=concurrency)
+        elapsed = time.monotonic() - started
+    finally:
+        for emulator in emulators:
+            await emulator.stop()
+        for server, held in servers:
+            for writer in held:
+                writer.close()
+            server.close()
+        await other.cleanup()
+
+    macs = [controller.mac_address for controller in found]
+    return {
+        "bench": "discovery",
+        "network": NETWORK,
+        "concurrency": concurrency,
+        "controllers": controllers,
+        "silent_hosts": silent,
+        "seconds": round(elapsed, 3),
+        "found": len(found),
+        "correct": sorted(macs) == sorted(expected) and len(macs) == len(set(macs)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--controllers", type=int, default=30, help="emulated controllers")
+    parser.add_argument("--silent", type=int, default=150, help="hosts that never answer")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args(argv)
+    if args.controllers + args.silent + 2 > 255 - FIRST_HOST:
+        parser.error("too many hosts for a /24")
+
+    result = asyncio.run(_run(args.controllers, args.silent, args.concurrency))
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(" ".join(f"{key}={value}" for key, value in result.items() if key != "bench"))
+
+
+if __name__ == "__main__":
+    main()
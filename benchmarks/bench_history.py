@@ -0,0 +1,126 @@
+"""Daily light figures: the channel history against the recorder's history.
+
+Run from the repository root:
+
+    python benchmarks/bench_history.py [--json] [--interval SECONDS] [--profile NAME ...]
+
+A day of polls is replayed from the emulator's light profiles. Daily light
+figures (photoperiod, per-channel light integral and peak) are worked out
+two ways:
+
+* recorder - from the state history of the four channel sensors, the way a
+             template or SQL sensor had to: every figure update scans the
+             day's rows. Rows and bytes are counted with bench_recorder's
+             RecorderModel.
+* history  - from the integration's ChannelHistory, fed every poll and
+             updated incrementally.
+
+Both must agree on the figures; the result reports the cost per figure
+update and what each keeps (database rows vs the stored ring).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+
+from bench_recorder import RecorderModel  # noqa: E402
+from pyhelialux.emulator import MINUTES_PER_DAY, default_profiles  # noqa: E402
+from pyhelialux.history import MOONLIGHT_LEVEL, ChannelHistory  # noqa: E402
+from pyhelialux.models import CHANNELS  # noqa: E402
+
+START_MINUTE = 28_000_000 - 28_000_000 % MINUTES_PER_DAY  # a midnight, in minutes since the epoch
+
+
+def _recorder_figures(rows, now):
+    """Work the figures out from recorded (minute, levels) changes, holding each until the next."""
+    lit = 0
+    sums = [0] * len(CHANNELS)
+    peaks = [0] * len(CHANNELS)
+    start = now - MINUTES_PER_DAY
+    for index, (minute, levels) in enumerate(rows):
+        until = rows[index + 1][0] if index + 1 < len(rows) else now + 1
+        minutes = min(until, now + 1) - max(minute, start + 1)
+        if minutes <= 0:
+            continue
+        lit += minutes * (max(levels) > MOONLIGHT_LEVEL)
+        for channel, level in enumerate(levels):
+            sums[channel] += minutes * level
+            peaks[channel] = max(peaks[channel], level)
+    return (lit, *sums, *peaks)
+
+
+def bench_profile(profile, interval):
+    history = ChannelHistory()
+    models = [RecorderModel() for _ in CHANNELS]
+    rows = []  # (minute, levels) whenever any channel changed, as the recorder keeps them
+    recorder_seconds = history_seconds = 0.0
+    updates = 0
+    agree = True
+    for second in range(0, 2 * MINUTES_PER_DAY * 60, interval):
+        minute = START_MINUTE + second // 60
+        levels = profile.levels_at(minute % MINUTES_PER_DAY)
+        if second < MINUTES_PER_DAY * 60:
+            # First day only fills both; the second is measured
+            for model, level in zip(models, levels):
+                model.write(str(level), {})
+        if not rows or rows[-1][1] != levels:
+            rows.append((minute, levels))
+        started = time.perf_counter()
+        history.record(minute, levels)
+        figures = history.figures
+        history_seconds += time.perf_counter() - started
+        if second >= MINUTES_PER_DAY * 60 and second % 60 == 0:
+            # A figure update per minute, like the template sensors refreshed
+            started = time.perf_counter()
+            expected = _recorder_figures(rows, minute)
+            recorder_seconds += time.perf_counter() - started
+            updates += 1
+            lit, sums, peaks = figures[0], figures[2:6], figures[6:]
+            agree = agree and expected == (lit, *sums, *peaks)
+    recorded = [model.result() for model in models]
+    return {
+        "bench": "history",
+        "profile": profile.name,
+        "interval": interval,
+        "figures_agree": agree,
+        "recorder_us_per_update": round(recorder_seconds / updates * 1e6, 1),
+        "history_us_per_poll": round(history_seconds / (2 * MINUTES_PER_DAY * 60 // interval) * 1e6, 2),
+        "recorder_rows_per_day": sum(cost["rows"] for cost in recorded),
+        "recorder_kib_per_day": round(sum(cost["bytes"] for cost in recorded) / 1024, 1),
+        "history_stored_kib": round(len(json.dumps(history.dump())) / 1024, 1),
+        "photoperiod_h": round(history.photoperiod, 2),
+        "light_integral": [round(history.light_integral(channel), 1) for channel in range(len(CHANNELS))],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--interval", type=int, default=15, help="poll interval in seconds")
+    parser.add_argument("--profile", action="append", help="emulator profile to replay (default: all)")
+    args = parser.parse_args(argv)
+    if args.interval < 1:
+        parser.error("--interval must be at least 1")
+
+    profiles = default_profiles()
+    selected = [p for p in profiles if not args.profile or p.name in args.profile]
+    if not selected:
+        parser.error("unknown profile; choose from " + ", ".join(p.name for p in profiles))
+
+    for profile in selected:
+        result = bench_profile(profile, args.interval)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(" ".join(f"{key}={value}" for key, value in result.items() if key != "bench"))
+
+
+if __name__ == "__main__":
+    main()
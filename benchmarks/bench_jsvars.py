@@ -0,0 +1,129 @@
+"""Micro-benchmark: single-pass jsvars tokenizer vs. the old regex parser.
+
+Run from the repository root:
+
+    python benchmarks/bench_jsvars.py [--json] [--repeat N]
+
+Before timing anything the conformance corpus from
+tests/fixtures/jsvars_corpus.py is checked against the tokenizer, and the
+regex parser's deviations from it are reported.
+
+Real controller files consist of plain statements, which the tokenizer reads
+from the file split on ';' without tokenizing them. That keeps it at or
+below the regex's time on every payload here (about 0.45-0.95x on CPython
+3.11), while parsing the whole corpus correctly.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+# Appended, not inserted: the integration's select.py would shadow the stdlib module.
+# tests/ is only needed for the fixtures package with the shared corpus.
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "custom_components", "juwel_helialux"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from pyhelialux.jsvars import JSVarsError, parse_js_vars  # noqa: E402
+from fixtures.jsvars_corpus import CORPUS, DEVVARS, STATUSVARS, WPVARS  # noqa: E402
+
+# The parser used before the tokenizer, kept here as the baseline.
+LEGACY_STATUS_VARS_REGEX = re.compile(
+    r"(?P<name>[a-zA-Z0-9]+)=((?P<number>\d+)|'(?P<string>[^']+)'|\[(?P<digit_list>(\d+,?)+)\]|\[(?P<string_list>(\"([^\"]+)\",?)+)\]);"
+)
+
+
+def legacy_parse_status_vars(status_vars):
+    """Regex-based parser as shipped up to 2.0.7."""
+    output = {}
+    for match in LEGACY_STATUS_VARS_REGEX.finditer(status_vars):
+        if match["number"] is not None:
+            value = int(match["number"])
+        elif match["string"] is not None:
+            value = match["string"]
+        elif match["digit_list"] is not None:
+            value = [int(x) for x in match["digit_list"].split(",")]
+        else:
+            value = [x[1:-1] for x in match["string_list"].split(",")]
+        output[match["name"]] = value
+    return output
+
+
+def check_corpus():
+    """Verify the tokenizer against the corpus; return regex mismatches."""
+    regex_mismatches = []
+    for payload, expected in CORPUS:
+        if expected is JSVarsError:
+            try:
+                parse_js_vars(payload)
+            except JSVarsError:
+                continue
+            raise AssertionError(f"Expected JSVarsError for {payload!r}")
+        result = parse_js_vars(payload)
+        if result != expected:
+            raise AssertionError(f"{payload!r}: got {result!r}, expected {expected!r}")
+        if legacy_parse_status_vars(payload) != result:
+            regex_mismatches.append(payload)
+    return regex_mismatches
+
+
+def payloads():
+    """Realistic payloads plus an oversized one to show scaling."""
+    profiles = ",".join(f'"Profile number {i}, variant"' for i in range(200))
+    oversized = STATUSVARS * 50 + f"profnames=[{profiles}];"
+    return {
+        "statusvars": STATUSVARS,
+        "wpvars": WPVARS,
+        "devvars": DEVVARS,
+        "oversized": oversized,
+    }
+
+
+def run(repeat):
+    results = []
+    for name, text in payloads().items():
+        raw = text.encode("utf-8")
+        number = max(1, 20000 // max(1, len(raw) // 100))
+        timings = {
+            "regex": min(timeit.repeat(lambda: legacy_parse_status_vars(text), number=number, repeat=repeat)),
+            "tokenizer_str": min(timeit.repeat(lambda: parse_js_vars(text), number=number, repeat=repeat)),
+            "tokenizer_bytes": min(timeit.repeat(lambda: parse_js_vars(raw), number=number, repeat=repeat)),
+        }
+        for parser, seconds in timings.items():
+            results.append({
+                "benchmark": "jsvars",
+                "payload": name,
+                "parser": parser,
+                "bytes": len(raw),
+                "us_per_parse": seconds / number * 1e6,
+                "mb_per_s": len(raw) * number / seconds / 1e6,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    mismatches = check_corpus()
+    results = run(args.repeat)
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+    print(f"Conformance corpus: {len(CORPUS)} cases OK; regex parser differs on {len(mismatches)}")
+    for payload in mismatches:
+        print(f"  regex mismatch: {payload!r}")
+    for result in results:
+        print(
+            f"{result['payload']:<11} {result['parser']:<16} {result['bytes']:>7} B "
+            f"{result['us_per_parse']:>10.2f} us {result['mb_per_s']:>8.2f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""Polling benchmarks: parsing, poll latency, state writes and fleet scaling.
+
+Run from the repository root:
+
+    python benchmarks/bench_polling.py [--json] [--scenario NAME ...] [--tanks 1,10,50,100,200]
+
+Scenarios:
+
+* parse   - parse_status_vars / parse_devvars throughput on emulator payloads
+* latency - end-to-end poll latency against a local emulator: the Controller
+            snapshot path and the coordinator's _async_update_data
+* writes  - Home Assistant state writes per poll across the tank's entities
+* fleet   - CPU, memory and request concurrency of polling 1 to 200 tanks,
+            each served by its own emulator in a separate process
+
+With --json every result is printed as one JSON object per line, so runs can
+be appended to a file and compared across releases. Without Home Assistant
+the coordinator and entities run on the stand-ins in
+tests/fixtures/hass_stub.py; the "homeassistant" field of their results says
+which was used.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import types
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+sys.path.append(os.path.join(REPO_ROOT, "tests"))
+
+from fixtures import hass_stub  # noqa: E402
+from pyhelialux.emulator import HelialuxEmulator  # noqa: E402
+from pyhelialux.limiter import RequestLimiter  # noqa: E402
+from pyhelialux.models import HelialuxState  # noqa: E402
+from pyhelialux.pool import SessionPool  # noqa: E402
+from pyhelialux.pyHelialux import Controller  # noqa: E402
+
+DEFAULT_TANKS = (1, 10, 50, 100, 200)
+FLEET_CONCURRENCY = 4  # the integration's MAX_CONCURRENT_REQUESTS
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _latency_summary(samples):
+    return {
+        "samples": len(samples),
+        "ms_p50": statistics.median(samples) * 1000,
+        "ms_p95": _percentile(samples, 0.95) * 1000,
+        "ms_max": max(samples) * 1000,
+    }
+
+
+# -- emulators in a child process ----------------------------------------------
+
+
+def _serve_emulators(count, latency, conn):
+    """Child process: run ``count`` emulators and report their URLs."""
+
+    async def serve():
+        emulators = [
+            HelialuxEmulator(start_minutes=600, time_scale=600, latency=latency, seed=i)
+            for i in range(count)
+        ]
+        urls = [await emulator.start() for emulator in emulators]
+        conn.send(urls)
+        # Serve until the parent says stop
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+        for emulator in emulators:
+            await emulator.stop()
+
+    asyncio.run(serve())
+
+
+class EmulatorFleet:
+    """Context manager running emulators in a separate process.
+
+    Keeping the servers out of the benchmark process means its CPU time and
+    memory only cover the client side.
+    """
+
+    def __init__(self, count, latency=0.0):
+        self.count = count
+        self.latency = latency
+        self.urls = []
+
+    def __enter__(self):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve_emulators, args=(self.count, self.latency, child), daemon=True
+        )
+        self._process.start()
+        self.urls = self._conn.recv()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.send("stop")
+        self._process.join(10)
+
+
+# -- parse -------------------------------------------------------------------
+
+
+def bench_parse(repeat):
+    emulator = HelialuxEmulator(start_minutes=600)
+    controller = Controller("http://unused")
+    cases = {
+        "parse_status_vars": (controller.parse_status_vars, emulator.statusvars().encode()),
+        "parse_status_vars_wpvars": (controller.parse_status_vars, emulator.wpvars().encode()),
+        "parse_devvars": (controller.parse_devvars, emulator.devvars().encode()),
+    }
+    results = []
+    for name, (parse, payload) in cases.items():
+        number = 20000
+        seconds = min(timeit.repeat(lambda: parse(payload), number=number, repeat=repeat))
+        results.append({
+            "benchmark": "polling",
+            "scenario": "parse",
+            "function": name,
+            "bytes": len(payload),
+            "us_per_call": seconds / number * 1e6,
+            "calls_per_s": number / seconds,
+        })
+    return results
+
+
+# -- latency -----------------------------------------------------------------
+
+
+def _import_integration():
+    """Import the integration package, on the stand-ins without Home Assistant.
+
+    Returns the Home Assistant version used, or "stub".
+    """
+    version = hass_stub.install()
+    sys.path.insert(0, REPO_ROOT)
+    return version
+
+
+async def _ha_coordinator(url):
+    """Create a Home Assistant instance and a coordinator polling ``url``."""
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.juwel_helialux.coordinator import JuwelHelialuxCoordinator
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    host = url.split("://", 1)[1]
+    coordinator = JuwelHelialuxCoordinator(hass, host, "http", "Bench tank", 1)
+    return hass, coordinator
+
+
+async def _controller_latency(url, polls):
+    samples = []
+    async with Controller(url, pool=SessionPool()) as controller:
+        await controller.get_snapshot()  # warm up the connection
+        for _ in range(polls):
+            start = time.perf_counter()
+            snapshot = await controller.get_snapshot(include_profiles=False)
+            HelialuxState.from_snapshots(snapshot, None)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _coordinator_latency(url, polls):
+    hass, coordinator = await _ha_coordinator(url)
+    samples = []
+    try:
+        await coordinator.async_refresh()
+        for _ in range(polls):
+            coordinator.async_mark_dirty()
+            start = time.perf_counter()
+            await coordinator._async_update_data()
+            samples.append(time.perf_counter() - start)
+    finally:
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return samples
+
+
+def bench_latency(polls, latency):
+    results = []
+    with EmulatorFleet(1, latency) as fleet:
+        url = fleet.urls[0]
+        samples = asyncio.run(_controller_latency(url, polls))
+        results.append({
+            "benchmark": "polling",
+            "scenario": "latency",
+            "path": "controller.get_snapshot",
+            "emulator_latency_ms": latency * 1000,
+            **_latency_summary(samples),
+        })
+        record = {
+            "benchmark": "polling",
+            "scenario": "latency",
+            "path": "coordinator._async_update_data",
+            "emulator_latency_ms": latency * 1000,
+            "homeassistant": _import_integration(),
+        }
+        record.update(_latency_summary(asyncio.run(_coordinator_latency(url, polls))))
+        results.append(record)
+    return results
+
+
+# -- writes ------------------------------------------------------------------
+
+
+async def _count_writes(url, polls):
+    from custom_components.juwel_helialux import binary_sensor, light, select, sensor, switch
+    from custom_components.juwel_helialux.const import DOMAIN
+
+    hass, coordinator = await _ha_coordinator(url)
+    entry = types.SimpleNamespace(
+        entry_id="bench",
+        title="Bench tank",
+        data={"tank_name": "Bench tank", "tank_host": url.split("://", 1)[1], "tank_protocol": "http"},
+        options={},
+    )
+    # As in entry setup, the platforms start from the first poll
+    await coordinator.async_config_entry_first_refresh()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    entities = []
+    for platform in (sensor, light, select, binary_sensor, switch):
+        await platform.async_setup_entry(
+            hass, entry, lambda new, update_before_add=False: entities.extend(new)
+        )
+
+    writes = {"count": 0}
+
+    def count_write():
+        writes["count"] += 1
+
+    for entity in entities:
+        entity.hass = hass
+        entity.async_write_ha_state = count_write
+        coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    try:
+        for _ in range(polls):
+            coordinator.async_mark_dirty()
+            await coordinator.async_refresh()
+    finally:
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return len(entities), writes["count"]
+
+
+def bench_writes(polls):
+    record = {
+        "benchmark": "polling",
+        "scenario": "writes",
+        "polls": polls,
+        "homeassistant": _import_integration(),
+    }
+    with EmulatorFleet(1) as fleet:
+        entities, writes = asyncio.run(_count_writes(fleet.urls[0], polls))
+    record.update(entities=entities, writes=writes, writes_per_poll=writes / polls)
+    return [record]
+
+
+# -- fleet -------------------------------------------------------------------
+
+
+async def _poll_fleet(urls, rounds, limit):
+    """Poll every tank ``rounds`` times the way the coordinator does."""
+    pool = SessionPool()
+    limiter = RequestLimiter(limit)
+    controllers = [Controller(url, pool=pool, limiter=limiter) for url in urls]
+
+    async def poll(controller, include_profiles):
+        snapshot = await controller.get_snapshot(include_profiles=include_profiles)
+        return HelialuxState.from_snapshots(snapshot, snapshot if include_profiles else None)
+
+    try:
+        # The first round also fetches profiles, like a coordinator's first refresh
+        await asyncio.gather(*(poll(controller, True) for controller in controllers))
+        round_times = []
+        ok = 0
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for _ in range(rounds):
+            start = time.perf_counter()
+            states = await asyncio.gather(*(poll(controller, False) for controller in controllers))
+            round_times.append(time.perf_counter() - start)
+            ok += sum(state.online for state in states)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+    finally:
+        for controller in controllers:
+            await controller.close()
+    return {
+        "polls": rounds * len(urls),
+        "polls_ok": ok,
+        "polls_per_s": rounds * len(urls) / wall,
+        "round_ms_p50": statistics.median(round_times) * 1000,
+        "round_ms_max": max(round_times) * 1000,
+        "cpu_ms_per_poll": cpu / (rounds * len(urls)) * 1000,
+        "max_in_flight": limiter.max_in_flight,
+        "max_queue_depth": limiter.max_waiting,
+        "max_request_wait_ms": limiter.max_wait * 1000,
+    }
+
+
+async def _fleet_memory(urls, limit):
+    """Bytes allocated per tank for controllers plus one round of polling."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        pool = SessionPool()
+        limiter = RequestLimiter(limit)
+        controllers = [Controller(url, pool=pool, limiter=limiter) for url in urls]
+        states = await asyncio.gather(*(controller.get_snapshot() for controller in controllers))
+        current, peak = tracemalloc.get_traced_memory()
+        for controller in controllers:
+            await controller.close()
+        del states
+    finally:
+        tracemalloc.stop()
+    return {
+        "kb_per_tank": (current - before) / len(urls) / 1024,
+        "peak_kb": (peak - before) / 1024,
+    }
+
+
+def bench_fleet(tank_counts, rounds, latency):
+    results = []
+    with EmulatorFleet(max(tank_counts), latency) as fleet:
+        for tanks in tank_counts:
+            urls = fleet.urls[:tanks]
+            for label, limit in (("capped", FLEET_CONCURRENCY), ("uncapped", 10**6)):
+                record = {
+                    "benchmark": "polling",
+                    "scenario": "fleet",
+                    "tanks": tanks,
+                    "limit": label,
+                    "emulator_latency_ms": latency * 1000,
+                }
+                record.update(asyncio.run(_poll_fleet(urls, rounds, limit)))
+                record.update(asyncio.run(_fleet_memory(urls, limit)))
+                results.append(record)
+    return results
+
+
+SCENARIOS = ("parse", "latency", "writes", "fleet")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=5, help="parse timing repeats")
+    parser.add_argument("--polls", type=int, default=50, help="polls for latency and writes")
+    parser.add_argument("--rounds", type=int, default=5, help="fleet polling rounds")
+    parser.add_argument("--latency", type=float, default=0.0, help="emulator latency in seconds")
+    parser.add_argument(
+        "--tanks",
+        default=",".join(str(count) for count in DEFAULT_TANKS),
+        help="comma separated fleet sizes",
+    )
+    args = parser.parse_args(argv)
+    scenarios = args.scenario or SCENARIOS
+    tank_counts = [int(count) for count in args.tanks.split(",")]
+
+    runners = {
+        "parse": lambda: bench_parse(args.repeat),
+        "latency": lambda: bench_latency(args.polls, args.latency),
+        "writes": lambda: bench_writes(args.polls),
+        "fleet": lambda: bench_fleet(tank_counts, args.rounds, args.latency),
+    }
+    for scenario in scenarios:
+        for result in runners[scenario]():
+            if args.json:
+                print(json.dumps(result), flush=True)
+            else:
+                print(" ".join(
+                    f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                    for key, value in result.items()
+                    if key != "benchmark"
+                ), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Caching proxy: upstream load with several consumers polling one tank.
+
+Run from the repository root:
+
+    python benchmarks/bench_proxy.py [--json] [--consumers N] [--duration SECONDS]
+
+Scenarios, each against a local emulator:
+
+* direct  - ``--consumers`` Controllers each polling get_snapshot every
+            ``--interval`` seconds, straight at the emulator
+* proxied - the same consumers pointed at a HelialuxProxy in front of it
+* burst   - 50 simultaneous statusvars.js requests through the proxy on a
+            cold cache, answered with one upstream fetch
+* write   - a profile change through the proxy, then a read: the cache must
+            have been dropped so the read shows the new profile
+
+The first two report the requests the emulator saw per minute and the
+proxy's hit ratio; the last two whether the proxy behaved.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+
+from pyhelialux.emulator import HelialuxEmulator  # noqa: E402
+from pyhelialux.pool import SessionPool  # noqa: E402
+from pyhelialux.proxy import HelialuxProxy  # noqa: E402
+from pyhelialux.pyHelialux import Controller  # noqa: E402
+
+SCENARIOS = ("direct", "proxied", "burst", "write")
+BURST = 50
+
+
+async def _poll(url, duration, interval, offset):
+    async with Controller(url, pool=SessionPool()) as controller:
+        await asyncio.sleep(offset)
+        deadline = time.monotonic() + duration
+        polls = failed = 0
+        while time.monotonic() < deadline:
+            snapshot = await controller.get_snapshot()
+            polls += 1
+            failed += not snapshot.status_ok
+            await asyncio.sleep(interval)
+    return polls, failed
+
+
+async def _consumers(scenario, consumers, duration, interval):
+    async with HelialuxEmulator() as emulator:
+        proxy = HelialuxProxy(emulator.url) if scenario == "proxied" else None
+        url = await proxy.start() if proxy else emulator.url
+        try:
+            # Spread over the interval like independent tools would be
+            results = await asyncio.gather(*(
+                _poll(url, duration, interval, interval * index / consumers)
+                for index in range(consumers)
+            ))
+        finally:
+            if proxy:
+                await proxy.stop()
+        upstream = sum(emulator.requests.values())
+    result = {
+        "bench": "proxy",
+        "scenario": scenario,
+        "consumers": consumers,
+        "polls": sum(polls for polls, _ in results),
+        "failed_polls": sum(failed for _, failed in results),
+        "upstream_requests": upstream,
+        "upstream_per_min": round(upstream * 60 / duration, 1),
+    }
+    if proxy:
+        result["hit_ratio"] = proxy.as_dict()["hit_ratio"]
+    return result
+
+
+async def _burst():
+    async with HelialuxEmulator(latency=0.2) as emulator, HelialuxProxy(emulator.url) as proxy:
+        controllers = [Controller(proxy.url, pool=SessionPool()) for _ in range(BURST)]
+        try:
+            statuses = await asyncio.gather(*(controller.get_status() for controller in controllers))
+        finally:
+            for controller in controllers:
+                await controller.close()
+        metrics = proxy.as_dict()
+        upstream = emulator.requests.get("/statusvars.js", 0)
+    return {
+        "bench": "proxy",
+        "scenario": "burst",
+        "clients": BURST,
+        "answered": sum(status is not None for status in statuses),
+        "upstream_requests": upstream,
+        "coalesced": metrics["coalesced"],
+        "ok": upstream == 1 and None not in statuses,
+    }
+
+
+async def _write():
+    async with HelialuxEmulator() as emulator, HelialuxProxy(emulator.url) as proxy:
+        async with Controller(proxy.url, pool=SessionPool()) as controller:
+            before = (await controller.get_profiles())["current_profile"]
+            target = next(profile.name for profile in emulator.profiles if profile.name != before)
+            accepted = await controller.set_profile(target, target)
+            after = (await controller.get_profiles())["current_profile"]
+        metrics = proxy.as_dict()
+    return {
+        "bench": "proxy",
+        "scenario": "write",
+        "accepted": accepted,
+        "before": before,
+        "after": after,
+        "invalidations": metrics["invalidations"],
+        "ok": accepted and after == target,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--consumers", type=int, default=4, help="polling clients")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to poll for")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between polls")
+    args = parser.parse_args(argv)
+
+    for scenario in args.scenario or SCENARIOS:
+        if scenario == "burst":
+            result = asyncio.run(_burst())
+        elif scenario == "write":
+            result = asyncio.run(_write())
+        else:
+            result = asyncio.run(_consumers(scenario, args.consumers, args.duration, args.interval))
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(" ".join(f"{key}={value}" for key, value in result.items() if key != "bench"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Light transitions: device request rate of the ramp engine against the emulator.
+
+Run from the repository root:
+
+    python benchmarks/bench_ramp.py [--json] [--transition SECONDS] [--scenario NAME ...]
+
+Scenarios:
+
+* fade   - one fade on a responsive emulator
+* slow   - the same fade on an emulator slower than the frame interval, so
+           frames have to be skipped
+* cancel - a fade interrupted by a plain colour change part way through
+* naive  - the same fade done the way automations did it before transitions
+           were supported: one queued colour change per step
+
+Every POST to /stat is timestamped on the client, and each result reports
+the requests sent, the busiest one-second window and whether the emulator
+ended on the target colour. The fade scenarios should never exceed one
+frame per second plus the one-off request that starts colour simulation.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+
+from pyhelialux.emulator import HelialuxEmulator  # noqa: E402
+from pyhelialux.pool import SessionPool  # noqa: E402
+from pyhelialux.pyHelialux import Controller  # noqa: E402
+from pyhelialux.tracing import RequestTracer  # noqa: E402
+
+SCENARIOS = ("fade", "slow", "cancel", "naive")
+START = (0, 0, 0, 0)
+TARGET = (80, 60, 40, 20)
+INTERRUPT = (10, 10, 10, 10)
+NAIVE_STEPS = 30
+
+
+def _busiest_second(times):
+    """Return the most requests sent within any one-second window."""
+    busiest = 0
+    first = 0
+    for last, when in enumerate(times):
+        while when - times[first] >= 1.0:
+            first += 1
+        busiest = max(busiest, last - first + 1)
+    return busiest
+
+
+async def _run(scenario, transition, latency):
+    sent = []
+    tracer = RequestTracer(
+        on_request_start=lambda trace: sent.append(time.monotonic())
+        if trace.endpoint == "/stat" else None
+    )
+    async with HelialuxEmulator(latency=latency) as emulator:
+        controller = Controller(emulator.url, pool=SessionPool(), tracer=tracer, command_debounce=0)
+        try:
+            started = time.monotonic()
+            expected = TARGET
+            if scenario == "naive":
+                for step in range(1, NAIVE_STEPS + 1):
+                    levels = [a + (b - a) * step / NAIVE_STEPS for a, b in zip(START, TARGET)]
+                    await controller.queue_manual_color(*levels)
+                    await asyncio.sleep(transition / NAIVE_STEPS)
+                done = True
+            elif scenario == "cancel":
+                fade = asyncio.ensure_future(
+                    controller.queue_manual_color_ramp(START, TARGET, transition)
+                )
+                await asyncio.sleep(transition / 3)
+                await controller.queue_manual_color(*INTERRUPT)
+                done = await fade
+                expected = INTERRUPT
+            else:
+                done = await controller.queue_manual_color_ramp(START, TARGET, transition)
+            elapsed = time.monotonic() - started
+            ramp = controller.ramp.as_dict()
+        finally:
+            await controller.close()
+        final = tuple(emulator.channels)
+
+    return {
+        "bench": "ramp",
+        "scenario": scenario,
+        "transition": transition,
+        "latency": latency,
+        "seconds": round(elapsed, 2),
+        "fade_completed": done,
+        "requests": len(sent),
+        "requests_per_s": round(len(sent) / elapsed, 2) if elapsed else None,
+        "busiest_second": _busiest_second(sent),
+        "frames_sent": ramp["frames_sent"],
+        "frames_skipped": ramp["frames_skipped"],
+        "final_levels": list(final),
+        "reached_target": final == expected,
+    }
+
+
+def _print_human(result):
+    print(
+        f"{result['scenario']:<7} {result['requests']:>3} requests in {result['seconds']:>5}s"
+        f"  busiest second {result['busiest_second']}"
+        f"  frames sent/skipped {result['frames_sent']}/{result['frames_skipped']}"
+        f"  final {result['final_levels']}{'' if result['reached_target'] else ' (wrong)'}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--transition", type=float, default=10.0, help="fade length in seconds")
+    parser.add_argument(
+        "--slow-latency", type=float, default=2.5, help="emulator latency for the slow scenario"
+    )
+    args = parser.parse_args(argv)
+
+    for scenario in args.scenario or SCENARIOS:
+        latency = args.slow_latency if scenario == "slow" else 0.0
+        result = asyncio.run(_run(scenario, args.transition, latency))
+        if args.json:
+            print(json.dumps(result))
+        else:
+            _print_human(result)
+
+
+if __name__ == "__main__":
+    main()
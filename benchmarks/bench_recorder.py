@@ -0,0 +1,180 @@
+"""Recorder cost of the combined sensor: database rows and bytes per tank per day.
+
+Run from the repository root:
+
+    python benchmarks/bench_recorder.py [--json] [--interval SECONDS] [--profile NAME ...]
+
+A day of polls is replayed from the emulator's light profiles, and for each
+poll the combined sensor's state write is run through a model of Home
+Assistant's recorder, once with the attributes shipped up to 2.0.7 (the
+whole device state plus the number settings) and once with the current
+minimal, unrecorded set.
+
+The model follows what the recorder does:
+
+* a ``states`` row is written whenever the state or any attribute changes;
+* attributes are stored as a JSON blob in ``state_attributes``, minus the
+  entity's unrecorded attributes, and identical blobs share one row.
+
+Row counts are exact under that model. Byte counts are the JSON payloads plus
+fixed per-row estimates of the columns and index entries (STATES_ROW_BYTES,
+ATTRIBUTES_ROW_BYTES), so compare them between runs rather than reading them
+as the size of an actual database.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+
+from pyhelialux.emulator import MINUTES_PER_DAY, default_profiles  # noqa: E402
+from pyhelialux.models import HelialuxState  # noqa: E402
+
+# Estimated bytes per row besides the payload: ids, timestamps, binary
+# context ids, the attributes hash and the index entries pointing at the row.
+STATES_ROW_BYTES = 120
+ATTRIBUTES_ROW_BYTES = 40
+
+FRIENDLY_NAME = "Tank Combined Sensor"
+# Number entity defaults, copied into the attributes up to 2.0.7
+SETTINGS = {
+    "manual_color_simulation_duration": 12.0,
+    "manual_daytime_simulation_duration": 12.0,
+    "daytime_simulation_position": 12.0,
+}
+# Mirrors COMBINED_ATTRIBUTES and JuwelHelialuxSensor._watched_fields in sensor.py,
+# which can't be imported without Home Assistant
+COMBINED_ATTRIBUTES = (
+    "current_profile",
+    "manualColorSimulationEnabled",
+    "manualDaytimeSimulationEnabled",
+)
+WATCHED_FIELDS = {"online", "current_profile", "color_simulation", "daytime_simulation"}
+
+
+def _day(profile, profiles, interval):
+    """Yield the HelialuxState of every poll over one day."""
+    names = tuple(p.name for p in profiles)
+    for second in range(0, MINUTES_PER_DAY * 60, interval):
+        minute = second // 60
+        yield HelialuxState(
+            channels=bytes(profile.levels_at(minute)),
+            device_minutes=minute,
+            current_profile=profile.name,
+            available_profiles=names,
+            full_profile_names=names,
+            online=True,
+        )
+
+
+def _legacy_attributes(state):
+    return {**state.as_dict(), **SETTINGS}
+
+
+def _minimal_attributes(state):
+    data = state.as_dict()
+    return {name: data[name] for name in COMBINED_ATTRIBUTES}
+
+
+class RecorderModel:
+    """Counts the rows and bytes the recorder would write for one entity."""
+
+    def __init__(self, unrecorded=frozenset()):
+        self.unrecorded = unrecorded
+        self.last = None
+        self.shared_attrs = set()
+        self.state_rows = self.state_bytes = 0
+        self.attribute_rows = self.attribute_bytes = 0
+
+    def write(self, state, attributes):
+        """Record a state write; unchanged writes are dropped like in Home Assistant."""
+        current = (state, attributes)
+        if current == self.last:
+            return
+        self.last = current
+        self.state_rows += 1
+        self.state_bytes += STATES_ROW_BYTES + len(state.encode())
+        recorded = {"friendly_name": FRIENDLY_NAME}
+        recorded.update((k, v) for k, v in attributes.items() if k not in self.unrecorded)
+        shared = json.dumps(recorded, separators=(",", ":"), sort_keys=True)
+        if shared not in self.shared_attrs:
+            self.shared_attrs.add(shared)
+            self.attribute_rows += 1
+            self.attribute_bytes += ATTRIBUTES_ROW_BYTES + len(shared.encode())
+
+    def result(self):
+        return {
+            "state_rows": self.state_rows,
+            "attribute_rows": self.attribute_rows,
+            "rows": self.state_rows + self.attribute_rows,
+            "bytes": self.state_bytes + self.attribute_bytes,
+        }
+
+
+def bench_profile(profile, profiles, interval):
+    """Replay a day with one profile and return the before/after cost."""
+    before = RecorderModel()
+    after = RecorderModel(unrecorded=frozenset(COMBINED_ATTRIBUTES))
+    previous = None
+    for state in _day(profile, profiles, interval):
+        sensor_state = "online" if state.online else "offline"
+        # 2.0.7: written on every poll with everything as attributes
+        before.write(sensor_state, _legacy_attributes(state))
+        # Now: written only when a watched field changed
+        changed = state.changed_fields(previous)
+        if not changed.isdisjoint(WATCHED_FIELDS):
+            after.write(sensor_state, _minimal_attributes(state))
+        previous = state
+    before, after = before.result(), after.result()
+    return {
+        "bench": "recorder",
+        "profile": profile.name,
+        "interval": interval,
+        "polls": MINUTES_PER_DAY * 60 // interval,
+        "before": before,
+        "after": after,
+        "rows_saved": before["rows"] - after["rows"],
+        "bytes_saved": before["bytes"] - after["bytes"],
+    }
+
+
+def _print_human(result):
+    before, after = result["before"], result["after"]
+    print(f"{result['profile']} ({result['polls']} polls every {result['interval']}s)")
+    for label, cost in (("before", before), ("after", after)):
+        print(
+            f"  {label:<7} {cost['rows']:>6} rows  {cost['bytes'] / 1024:>9.1f} KiB"
+            f"  ({cost['state_rows']} states, {cost['attribute_rows']} state_attributes)"
+        )
+    print(f"  saved   {result['rows_saved']:>6} rows  {result['bytes_saved'] / 1024:>9.1f} KiB per day")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--interval", type=int, default=60, help="poll interval in seconds")
+    parser.add_argument("--profile", action="append", help="emulator profile to replay (default: all)")
+    args = parser.parse_args(argv)
+    if args.interval < 1:
+        parser.error("--interval must be at least 1")
+
+    profiles = default_profiles()
+    selected = [p for p in profiles if not args.profile or p.name in args.profile]
+    if not selected:
+        parser.error("unknown profile; choose from " + ", ".join(p.name for p in profiles))
+
+    for profile in selected:
+        result = bench_profile(profile, profiles, args.interval)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            _print_human(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Settings storage: disk writes during a slider drag, and loads at startup.
+
+Run from the repository root:
+
+    python benchmarks/bench_settings.py [--json] [--steps N] [--step-interval SECONDS]
+
+A slider drag is replayed as ``--steps`` changes of the daytime simulation
+position, ``--step-interval`` seconds apart, against a throwaway Home
+Assistant config directory:
+
+* before - one store per number entity, saved on every change (up to 2.0.7)
+* after  - the entry's EntrySettings, saved once after the changes settle
+
+Both start from the old per-entity files, so the "after" run also covers
+their migration into the single store. Writes are counted where the store
+hands the data to the disk. Without Home Assistant the stores run on the
+stand-ins in tests/fixtures/hass_stub.py; the "homeassistant" field of each
+result says which was used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(REPO_ROOT, "tests"))
+
+from fixtures import hass_stub  # noqa: E402
+
+SAVE_DELAY = 1.0  # seconds; the integration waits SETTINGS_SAVE_DELAY
+SLIDER = "daytime_simulation_position"
+
+
+def _count_disk_writes(counts):
+    """Patch Store so every write to disk is counted per file."""
+    from homeassistant.helpers import storage
+
+    write = storage.Store._write_data
+
+    def counting_write(self, path, data):
+        counts[os.path.basename(path)] = counts.get(os.path.basename(path), 0) + 1
+        return write(self, path, data)
+
+    storage.Store._write_data = counting_write
+
+
+async def _seed_legacy_files(hass, entry_id):
+    """Write the per-entity stores as 2.0.7 left them."""
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.juwel_helialux.const import DOMAIN
+    from custom_components.juwel_helialux.settings import LEGACY_SETTINGS
+
+    for key in LEGACY_SETTINGS:
+        await Store(hass, 1, f"{DOMAIN}_{entry_id}_{key}.json").async_save({"value": 2.0})
+
+
+async def _drag(steps, interval, version):
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.juwel_helialux.const import DOMAIN
+    from custom_components.juwel_helialux.settings import LEGACY_SETTINGS, EntrySettings
+
+    results = []
+    counts = {}
+    _count_disk_writes(counts)
+    for variant in ("before", "after"):
+        hass = HomeAssistant(tempfile.mkdtemp())
+        entry_id = "bench"
+        await _seed_legacy_files(hass, entry_id)
+        counts.clear()
+
+        started = time.monotonic()
+        if variant == "before":
+            stores = {key: Store(hass, 1, f"{DOMAIN}_{entry_id}_{key}.json") for key in LEGACY_SETTINGS}
+            loads = len(stores)
+            for store in stores.values():
+                await store.async_load()
+            loaded = time.monotonic()
+            for step in range(steps):
+                await stores[SLIDER].async_save({"value": step / 4})
+                await asyncio.sleep(interval)
+        else:
+            settings = EntrySettings(hass, entry_id, save_delay=SAVE_DELAY)
+            loads = 1 + len(LEGACY_SETTINGS)  # the new store, then the old files once
+            await settings.async_load()
+            loaded = time.monotonic()
+            migration_writes = sum(counts.values())
+            for step in range(steps):
+                settings[SLIDER] = step / 4
+                await asyncio.sleep(interval)
+        await asyncio.sleep(SAVE_DELAY * 1.5)
+        await hass.async_block_till_done()
+
+        drag_writes = sum(counts.values()) - (migration_writes if variant == "after" else 0)
+        results.append({
+            "bench": "settings",
+            "variant": variant,
+            "homeassistant": version,
+            "steps": steps,
+            "load_files": loads,
+            "load_ms": round((loaded - started) * 1000, 3),
+            "drag_writes": drag_writes,
+            "writes_by_file": dict(counts),
+            "files_left": sorted(os.listdir(hass.config.path(".storage"))),
+        })
+        await hass.async_stop(force=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print one JSON object per result")
+    parser.add_argument("--steps", type=int, default=40, help="slider steps in the drag")
+    parser.add_argument("--step-interval", type=float, default=0.05, help="seconds between steps")
+    args = parser.parse_args(argv)
+
+    version = hass_stub.install()
+    sys.path.insert(0, REPO_ROOT)
+    results = asyncio.run(_drag(args.steps, args.step_interval, version))
+
+    for result in results:
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(" ".join(f"{key}={value}" for key, value in result.items() if key != "bench"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import issue_registry as ir
 from .coordinator import JuwelHelialuxCoordinator 
-from .const import DOMAIN, CONF_TANK_HOST, CONF_TANK_PROTOCOL, CONF_UPDATE_INTERVAL
+from .scheduler import SCHEDULER, FleetScheduler
+from .settings import EntrySettings
+from .history import HistoryStore
+from .const import DOMAIN, CONF_TANK_HOST, CONF_TANK_NAME, CONF_TANK_PROTOCOL, CONF_UPDATE_INTERVAL
+from .const import CONF_FAST_INTERVAL, CONF_OFFLINE_INTERVAL
+from .const import DEFAULT_UPDATE_INTERVAL, DEFAULT_FAST_INTERVAL, DEFAULT_OFFLINE_INTERVAL
 from homeassistant.util import slugify
 import logging
 
@@ -14,24 +20,87 @@ async def async_setup(hass, config):
     return True
 
 
+def _poll_bounds(entry):
+    """Return (update, fast, offline) intervals, preferring options over entry data."""
+    def option(key, default):
+        return entry.options.get(key, entry.data.get(key, default))
+
+    return (
+        option(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        option(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+        option(CONF_OFFLINE_INTERVAL, DEFAULT_OFFLINE_INTERVAL),
+    )
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate a config entry to the current version."""
+    if entry.version == 1:
+        from .config_flow import JuwelHelialuxConfigFlow
+
+        if not await JuwelHelialuxConfigFlow.async_migrate_entry(hass, entry):
+            return False
+
+    if entry.version == 2 and entry.minor_version < 2:
+        # 2.1 -> 2.2: the combined sensor no longer copies every value into its
+        # attributes. Nothing in the entry changes, so tell the user once where
+        # the removed attributes went in case templates or automations use them.
+        ir.async_create_issue(
+            hass,
+            DOMAIN,
+            f"combined_sensor_attributes_{entry.entry_id}",
+            is_fixable=False,
+            is_persistent=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="combined_sensor_attributes",
+            translation_placeholders={"tank_name": entry.title},
+            learn_more_url="https://github.com/MrSleeps/Juwel-HeliaLux-Home-Assistant-Custom-Component/blob/main/UPGRADE.md",
+        )
+        hass.config_entries.async_update_entry(entry, minor_version=2)
+        _LOGGER.debug("Migrated %s to version 2.2", entry.title)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up a config entry for the Juwel Helialux integration."""
     _LOGGER.debug("Setting up config entry: %s", entry.entry_id)
 
     hass.data.setdefault(DOMAIN, {})
+    # One scheduler for all tanks, so their polls don't all land at once
+    scheduler = hass.data[DOMAIN].get(SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DOMAIN][SCHEDULER] = FleetScheduler(hass)
 
     tank_name = entry.data.get("tank_name", "Default Tank")
     tank_host = entry.data[CONF_TANK_HOST]
     tank_protocol = entry.data.get(CONF_TANK_PROTOCOL, "http")
-    update_interval = entry.options.get(CONF_UPDATE_INTERVAL, 30)
+    update_interval, fast_interval, offline_interval = _poll_bounds(entry)
 
     _LOGGER.debug(f"Config entry tank_name: {tank_name}")
     _LOGGER.debug(f"Config entry data: {entry.data}")
 
+    # All of the entry's saved settings in one load, before any entity needs them
+    settings = EntrySettings(hass, entry.entry_id)
+    await settings.async_load()
+    history = HistoryStore(hass, entry.entry_id)
+    await history.async_load()
+
     # Create the coordinator - pass the actual tank_name
-    coordinator = JuwelHelialuxCoordinator(hass, tank_host, tank_protocol, tank_name, update_interval)
+    coordinator = JuwelHelialuxCoordinator(
+        hass,
+        tank_host,
+        tank_protocol,
+        tank_name,
+        update_interval,
+        fast_interval,
+        offline_interval,
+        scheduler=scheduler,
+        settings=settings,
+        history=history,
+    )
     await coordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     _LOGGER.debug("Forwarding setup for platforms")
     try:
@@ -45,6 +114,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_update_listener(hass, entry):
+    """Apply changed options; only a new host or name needs a reload."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is None:
+        return
+    if (
+        entry.data.get(CONF_TANK_HOST) != coordinator.tank_host
+        or entry.data.get(CONF_TANK_PROTOCOL, "http") != coordinator.tank_protocol
+        or entry.data.get(CONF_TANK_NAME, coordinator.tank_name) != coordinator.tank_name
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator.async_set_poll_bounds(*_poll_bounds(entry))
+
+
 async def async_unload_entry(hass, entry):
     """Handle removal of a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(
@@ -52,9 +136,17 @@ async def async_unload_entry(hass, entry):
     )
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_shutdown()
         _LOGGER.debug("Config entry unloaded and coordinator removed")
     else:
         _LOGGER.warning("Failed to unload some platforms for config entry: %s", entry.entry_id)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+
+async def async_remove_entry(hass, entry):
+    """Delete the entry's saved settings and channel history when it is removed."""
+    await EntrySettings(hass, entry.entry_id).async_remove()
+    await HistoryStore(hass, entry.entry_id).async_remove()
@@ -1,9 +1,9 @@
 import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
 from .const import DOMAIN
+from .entity import HelialuxEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,9 +24,11 @@ async def async_setup_entry(hass, entry, async_add_entities):
     _LOGGER.debug("Binary sensors created and added.")
 
 
-class ManualColorSimulationBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class ManualColorSimulationBinarySensor(HelialuxEntity, BinarySensorEntity):
     """Representation of the manual color simulation status."""
 
+    _watched_fields = {"color_simulation"}
+
     def __init__(self, coordinator, tank_slug):
         """Initialize the sensor with a coordinator and tank slug."""
         super().__init__(coordinator)
@@ -45,16 +47,18 @@ class ManualColorSimulationBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self):
         """Return if the binary sensor is on or off."""
-        return self.coordinator.data.get("manualColorSimulationEnabled") == "On"
+        return self.coordinator.data.color_simulation
 
     @property
     def device_class(self):
         return "power"
 
 
-class ManualDaytimeSimulationBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class ManualDaytimeSimulationBinarySensor(HelialuxEntity, BinarySensorEntity):
     """Representation of the manual daytime simulation status."""
 
+    _watched_fields = {"daytime_simulation"}
+
     def __init__(self, coordinator, tank_slug):
         """Initialize the sensor with a coordinator and tank slug."""
         super().__init__(coordinator)
@@ -73,7 +77,7 @@ class ManualDaytimeSimulationBinarySensor(CoordinatorEntity, BinarySensorEntity)
     @property
     def is_on(self):
         """Return if the binary sensor is on or off."""
-        return self.coordinator.data.get("manualDaytimeSimulationEnabled") == "On"
+        return self.coordinator.data.daytime_simulation
 
     @property
     def device_class(self):
@@ -1,16 +1,34 @@
+import ipaddress
 import voluptuous as vol
 from homeassistant import config_entries
+from homeassistant.components import network
 from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 import logging
 
 from .const import DOMAIN, CONF_TANK_HOST, CONF_TANK_NAME, CONF_TANK_PROTOCOL, CONF_UPDATE_INTERVAL
+from .const import CONF_FAST_INTERVAL, CONF_OFFLINE_INTERVAL
+from .const import DEFAULT_UPDATE_INTERVAL, DEFAULT_FAST_INTERVAL, DEFAULT_OFFLINE_INTERVAL
+from .const import CONF_NETWORK, DEFAULT_SCAN_NETWORK
+from .pyhelialux.discovery import MAC_ADDRESS, identify_host, normalize_mac, scan
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_DEVICE = "device"
+
 class JuwelHelialuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 2
+    MINOR_VERSION = 2
+
+    def __init__(self):
+        self._discovered = {}  # MAC address -> DiscoveredController not configured yet
+        self._discovery = None
 
     async def async_step_user(self, user_input=None):
+        """Let the user search the network or enter an address by hand."""
+        return self.async_show_menu(step_id="user", menu_options=["scan", "manual"])
+
+    async def async_step_manual(self, user_input=None):
         errors = {}
         if user_input is not None:
             if not user_input[CONF_TANK_HOST]:
@@ -18,9 +36,24 @@ class JuwelHelialuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             elif not user_input[CONF_TANK_NAME]:
                 errors["base"] = "invalid_name"
             else:
-                unique_id = f"{user_input[CONF_TANK_PROTOCOL]}://{user_input[CONF_TANK_HOST]}"
-                await self.async_set_unique_id(unique_id)
-                self._abort_if_unique_id_configured()
+                host = user_input[CONF_TANK_HOST]
+                protocol = user_input[CONF_TANK_PROTOCOL]
+                # The MAC address, as the scan and discovery steps use, so a tank
+                # added here and found by a scan later isn't added twice
+                controller = await identify_host(host, protocol)
+                if controller is not None:
+                    await self.async_set_unique_id(controller.mac_address)
+                    self._abort_if_unique_id_configured(
+                        updates={CONF_TANK_HOST: host, CONF_TANK_PROTOCOL: protocol}
+                    )
+                    macs, _ = self._configured_tanks()
+                    if controller.mac_address in macs:
+                        return self.async_abort(reason="already_configured")
+                else:
+                    # Not reachable right now: fall back to the address
+                    _LOGGER.debug("No devvars.js from %s, using its URL as unique ID", host)
+                    await self.async_set_unique_id(f"{protocol}://{host}")
+                    self._abort_if_unique_id_configured()
                 if CONF_UPDATE_INTERVAL not in user_input:
                     user_input[CONF_UPDATE_INTERVAL] = 1
 
@@ -37,7 +70,7 @@ class JuwelHelialuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         })
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=data_schema,
             errors=errors,
             description_placeholders={
@@ -48,74 +81,204 @@ class JuwelHelialuxConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
-    @classmethod
-    async def async_migrate_entry(cls, hass, config_entry: config_entries.ConfigEntry):
-        """Migrate old config entry to the new version."""
-        version = config_entry.version
-        _LOGGER.debug(f"Migration process started for entry {config_entry.title}, current version: {version}")
+    async def async_step_scan(self, user_input=None):
+        """Scan an address range for controllers."""
+        errors = {}
+        if user_input is not None:
+            try:
+                found = await scan(user_input[CONF_NETWORK])
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
+            else:
+                macs, hosts = self._configured_tanks()
+                self._discovered = {
+                    controller.mac_address: controller
+                    for controller in found
+                    if controller.mac_address not in macs and controller.host not in hosts
+                }
+                if self._discovered:
+                    return await self.async_step_pick()
+                errors["base"] = "no_new_devices" if found else "no_devices_found"
 
-        if version is None:
-            version = 1
-            _LOGGER.debug(f"No version found, assuming version 1 for migration.")
+        default = user_input[CONF_NETWORK] if user_input else await self._async_default_network()
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema({vol.Required(CONF_NETWORK, default=default): str}),
+            errors=errors,
+        )
 
-        if version == 1:
-            _LOGGER.debug(f"Starting migration from version 1 to version 2 for {config_entry.title}")
+    async def async_step_pick(self, user_input=None):
+        """Add one of the controllers found; the others are offered as discovered."""
+        if user_input is not None:
+            controller = self._discovered.pop(user_input[CONF_DEVICE])
+            await self.async_set_unique_id(controller.mac_address)
+            self._abort_if_unique_id_configured(updates={CONF_TANK_HOST: controller.host})
+            for other in self._discovered.values():
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY},
+                        data={
+                            "host": other.host,
+                            "mac_address": other.mac_address,
+                            "device_type": other.device_type,
+                        },
+                    )
+                )
+            return self._create_tank_entry(controller.host, user_input[CONF_TANK_NAME])
 
-            old_data = config_entry.data
-            tank_name = old_data.get("name")
+        devices = {
+            mac: f"{controller.device_type} ({controller.host}, {mac})"
+            for mac, controller in self._discovered.items()
+        }
+        return self.async_show_form(
+            step_id="pick",
+            data_schema=vol.Schema({
+                vol.Required(CONF_DEVICE, default=next(iter(devices))): vol.In(devices),
+                vol.Required(CONF_TANK_NAME): str,
+            }),
+            description_placeholders={"count": str(len(devices))},
+        )
 
-            if tank_name:
-                _LOGGER.debug(f"Migrating sensor names for {tank_name}")
+    async def async_step_integration_discovery(self, discovery_info):
+        """Handle a controller found by a scan but not picked there."""
+        mac = discovery_info["mac_address"]
+        host = discovery_info["host"]
+        await self.async_set_unique_id(mac)
+        self._abort_if_unique_id_configured(updates={CONF_TANK_HOST: host})
+        macs, hosts = self._configured_tanks()
+        if mac in macs or host in hosts:
+            return self.async_abort(reason="already_configured")
 
-                old_data[f"{tank_name}_blue"] = old_data.pop(f"{tank_name}_blue", 0)
-                old_data[f"{tank_name}_green"] = old_data.pop(f"{tank_name}_green", 0)
-                old_data[f"{tank_name}_red"] = old_data.pop(f"{tank_name}_red", 0)
-                old_data[f"{tank_name}_white"] = old_data.pop(f"{tank_name}_white", 0)
-                old_data[f"{tank_name}_profile"] = old_data.pop(f"{tank_name}_current_profile", "None")
-                old_data[f"{tank_name}_current_profile"] = old_data.pop(f"{tank_name}_current_profile", "None")
+        self._discovery = discovery_info
+        self.context["title_placeholders"] = {"name": f"{discovery_info['device_type']} ({host})"}
+        return await self.async_step_discovery_confirm()
 
-                for color in ["blue", "green", "red", "white"]:
-                    old_data.pop(f"{tank_name}_{color}", None)
+    async def async_step_discovery_confirm(self, user_input=None):
+        """Name a discovered controller and add it."""
+        if user_input is not None:
+            return self._create_tank_entry(self._discovery["host"], user_input[CONF_TANK_NAME])
 
-                _LOGGER.debug(f"Old sensor names for {tank_name} migrated and removed.")
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_TANK_NAME): str}),
+            description_placeholders={
+                "host": self._discovery["host"],
+                "mac_address": self._discovery["mac_address"],
+            },
+        )
 
-                for color in ["blue", "green", "red", "white", "profile"]:
-                    old_entity_id = f"sensor.{tank_name}_{color}"
-                    _LOGGER.debug(f"Checking if old entity {old_entity_id} exists and needs removal.")
-                    if hass.helpers.entity_registry.async_is_registered(old_entity_id):
-                        _LOGGER.debug(f"Removing old entity: {old_entity_id}")
-                        hass.helpers.entity_registry.async_remove(old_entity_id)
-                    else:
-                        _LOGGER.debug(f"Entity {old_entity_id} not found in registry.")
+    def _create_tank_entry(self, host, name):
+        return self.async_create_entry(
+            title=name,
+            data={
+                CONF_TANK_PROTOCOL: "http",
+                CONF_TANK_HOST: host,
+                CONF_TANK_NAME: name,
+                CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+            },
+        )
 
-            _LOGGER.debug("Cleaning up old entities (if any).")
-            for sensor in ['blue', 'green', 'red', 'white', 'profile']:
-                entity_id = f"sensor.{tank_name}_{sensor}"
-                if hass.helpers.entity_registry.async_is_registered(entity_id):
-                    _LOGGER.debug(f"Removing old entity: {entity_id}")
-                    hass.helpers.entity_registry.async_remove(entity_id)
+    def _configured_tanks(self):
+        """Return the MAC addresses and hosts of the tanks already set up.
+
+        Entries added by a scan, or by hand while the controller answered,
+        use the MAC address as unique ID. For the others it is taken from
+        the device info of the running coordinator.
+        """
+        macs = set()
+        hosts = set()
+        for entry in self._async_current_entries(include_ignore=False):
+            hosts.add(entry.data.get(CONF_TANK_HOST))
+            if entry.unique_id and MAC_ADDRESS.match(entry.unique_id):
+                macs.add(normalize_mac(entry.unique_id))
+            coordinator = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            device = coordinator.device_tier.value if coordinator is not None else None
+            if device and MAC_ADDRESS.match(device.get("mac_address", "")):
+                macs.add(normalize_mac(device["mac_address"]))
+        return macs, hosts
+
+    async def _async_default_network(self):
+        """Return the /24 (or smaller) range of Home Assistant's own network."""
+        try:
+            adapters = await network.async_get_adapters(self.hass)
+        except Exception as e:  # Only a default, the user can type any range
+            _LOGGER.debug("Could not read network adapters: %s", e)
+            return DEFAULT_SCAN_NETWORK
+        for adapter in adapters:
+            if not adapter["enabled"]:
+                continue
+            for address in adapter["ipv4"]:
+                prefix = max(24, address["network_prefix"])
+                return str(ipaddress.ip_network(f"{address['address']}/{prefix}", strict=False))
+        return DEFAULT_SCAN_NETWORK
+
+    @classmethod
+    async def async_migrate_entry(cls, hass, config_entry: config_entries.ConfigEntry):
+        """Migrate a version 1 config entry to version 2.1.
 
-            if "manualColorSimulationEnabled" not in old_data:
-                old_data["manualColorSimulationEnabled"] = False
-            if "manualDaytimeSimulationEnabled" not in old_data:
-                old_data["manualDaytimeSimulationEnabled"] = False
-            if "deviceTime" not in old_data:
-                old_data["deviceTime"] = "00:00:00"
-            if "profile" not in old_data:
-                old_data["profile"] = "None"
-            if "current_profile" not in old_data:
-                old_data["current_profile"] = "None"
+        Called from the integration's async_migrate_entry, which takes the
+        entry on from 2.1 to the current minor version.
+        """
+        _LOGGER.debug(
+            "Migration process started for entry %s, current version: %s",
+            config_entry.title,
+            config_entry.version,
+        )
+        if config_entry.version != 1:
+            return True
+
+        _LOGGER.debug("Starting migration from version 1 to version 2 for %s", config_entry.title)
+
+        # config_entry.data is read-only, the migrated data goes back through async_update_entry
+        old_data = dict(config_entry.data)
+        tank_name = old_data.get("name")
+        registry = er.async_get(hass)
 
-            if CONF_UPDATE_INTERVAL not in old_data:
-                _LOGGER.debug(f"Update interval not found, setting to default 1 minute for {config_entry.title}")
-                old_data[CONF_UPDATE_INTERVAL] = 1
+        if tank_name:
+            _LOGGER.debug("Migrating sensor names for %s", tank_name)
 
-            config_entry.version = 2
+            old_data[f"{tank_name}_blue"] = old_data.pop(f"{tank_name}_blue", 0)
+            old_data[f"{tank_name}_green"] = old_data.pop(f"{tank_name}_green", 0)
+            old_data[f"{tank_name}_red"] = old_data.pop(f"{tank_name}_red", 0)
+            old_data[f"{tank_name}_white"] = old_data.pop(f"{tank_name}_white", 0)
+            old_data[f"{tank_name}_profile"] = old_data.pop(f"{tank_name}_current_profile", "None")
+            old_data[f"{tank_name}_current_profile"] = old_data.pop(f"{tank_name}_current_profile", "None")
 
-            hass.config_entries.async_update_entry(config_entry, data=old_data)
+            for color in ["blue", "green", "red", "white"]:
+                old_data.pop(f"{tank_name}_{color}", None)
 
-            _LOGGER.debug(f"Config entry {config_entry.title} migration to version 2 completed.")
+            _LOGGER.debug("Old sensor names for %s migrated and removed.", tank_name)
+
+            _LOGGER.debug("Cleaning up old entities (if any).")
+            for sensor in ["blue", "green", "red", "white", "profile"]:
+                old_entity_id = f"sensor.{tank_name}_{sensor}"
+                if registry.async_is_registered(old_entity_id):
+                    _LOGGER.debug("Removing old entity: %s", old_entity_id)
+                    registry.async_remove(old_entity_id)
+                else:
+                    _LOGGER.debug("Entity %s not found in registry.", old_entity_id)
+
+        if "manualColorSimulationEnabled" not in old_data:
+            old_data["manualColorSimulationEnabled"] = False
+        if "manualDaytimeSimulationEnabled" not in old_data:
+            old_data["manualDaytimeSimulationEnabled"] = False
+        if "deviceTime" not in old_data:
+            old_data["deviceTime"] = "00:00:00"
+        if "profile" not in old_data:
+            old_data["profile"] = "None"
+        if "current_profile" not in old_data:
+            old_data["current_profile"] = "None"
+
+        if CONF_UPDATE_INTERVAL not in old_data:
+            _LOGGER.debug("Update interval not found, setting to default 1 minute for %s", config_entry.title)
+            old_data[CONF_UPDATE_INTERVAL] = 1
+
+        hass.config_entries.async_update_entry(
+            config_entry, data=old_data, version=2, minor_version=1
+        )
 
+        _LOGGER.debug("Config entry %s migration to version 2.1 completed.", config_entry.title)
         return True
 
     @staticmethod
@@ -141,7 +304,9 @@ class JuwelHelialuxOptionsFlow(config_entries.OptionsFlow):
             vol.Required(CONF_TANK_PROTOCOL, default=self._config_entry.data.get(CONF_TANK_PROTOCOL)): vol.In(["http", "https"]),
             vol.Required(CONF_TANK_HOST, default=self._config_entry.data.get(CONF_TANK_HOST)): str,
             vol.Required(CONF_TANK_NAME, default=self._config_entry.data.get(CONF_TANK_NAME)): str,
-            vol.Optional(CONF_UPDATE_INTERVAL, default=self._config_entry.data.get(CONF_UPDATE_INTERVAL, 1)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_UPDATE_INTERVAL, default=self._config_entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(CONF_FAST_INTERVAL, default=self._config_entry.data.get(CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+            vol.Optional(CONF_OFFLINE_INTERVAL, default=self._config_entry.data.get(CONF_OFFLINE_INTERVAL, DEFAULT_OFFLINE_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
         })
 
         return self.async_show_form(
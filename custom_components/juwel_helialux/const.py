@@ -5,4 +5,38 @@ DOMAIN = "juwel_helialux"
 CONF_TANK_HOST = "tank_host"
 CONF_TANK_NAME = "tank_name"
 CONF_TANK_PROTOCOL = "tank_protocol"
-CONF_UPDATE_INTERVAL = "update_interval"
\ No newline at end of file
+CONF_UPDATE_INTERVAL = "update_interval"
+CONF_FAST_INTERVAL = "fast_update_interval"
+CONF_OFFLINE_INTERVAL = "offline_update_interval"
+CONF_NETWORK = "network"
+
+# Polling bounds: fast while the tank is busy, normal when stable, offline when unreachable
+DEFAULT_FAST_INTERVAL = 15  # seconds
+DEFAULT_UPDATE_INTERVAL = 1  # minutes
+DEFAULT_OFFLINE_INTERVAL = 10  # minutes
+
+# Polling tiers: profile names and hardware info change far less often than status
+PROFILE_REFRESH_INTERVAL = 3600  # seconds
+
+# Refresh requests arriving within this window share one device fetch
+REFRESH_COALESCE_WINDOW = 2  # seconds
+
+# Optimistic state after a command: how long it may go unconfirmed, and when to poll to confirm it
+OPTIMISTIC_TTL = 30  # seconds
+OPTIMISTIC_CONFIRM_DELAY = 2  # seconds
+
+# Fleet scheduling across all tanks: requests in flight at once, and the most polls are spread apart
+MAX_CONCURRENT_REQUESTS = 4
+MAX_POLL_SPACING = 2  # seconds
+
+# Recent fetches kept for the diagnostics download
+POLL_HISTORY = 50
+
+# Settings changes are written to disk once this long after the last one
+SETTINGS_SAVE_DELAY = 10  # seconds
+
+# Address range offered for a network scan when Home Assistant's own can't be read
+DEFAULT_SCAN_NETWORK = "192.168.1.0/24"
+
+# Channel history is written to disk at most this often while it is being recorded
+HISTORY_SAVE_DELAY = 300  # seconds
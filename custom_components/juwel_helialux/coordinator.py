@@ -1,34 +1,159 @@
 import logging
+from dataclasses import replace
 from datetime import timedelta
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from .const import DOMAIN, CONF_TANK_HOST, CONF_TANK_NAME, CONF_TANK_PROTOCOL, CONF_UPDATE_INTERVAL
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.core import callback
+from .const import DOMAIN, CONF_TANK_HOST, CONF_TANK_NAME, CONF_TANK_PROTOCOL, CONF_UPDATE_INTERVAL, PROFILE_REFRESH_INTERVAL, REFRESH_COALESCE_WINDOW
+from .const import OPTIMISTIC_TTL, OPTIMISTIC_CONFIRM_DELAY
+from .const import DEFAULT_FAST_INTERVAL, DEFAULT_OFFLINE_INTERVAL, POLL_HISTORY
+from .polling import AdaptivePollPolicy
 from .pyhelialux.pyHelialux import Controller as Helialux
+from .pyhelialux.breaker import CLOSED
+from .pyhelialux.tracing import RequestTracer
+from .pyhelialux.recorder import ResponseRecorder
+from .pyhelialux.models import HelialuxState
+from .pyhelialux.curve import CurveModel, MINUTES_PER_DAY
+from .pyhelialux.history import ChannelHistory
 import asyncio
+import time
+from collections import deque
 from homeassistant.util import slugify
 
 _LOGGER = logging.getLogger(__name__)
 
+
+class PollTier:
+    """Refresh schedule, staleness and last good value for one polling tier."""
+
+    def __init__(self, name, max_age=None):
+        self.name = name
+        self.max_age = max_age  # seconds, None means fetch once until invalidated
+        self.value = None
+        self.last_success = None
+        self.failures = 0
+        self._force = True
+
+    def due(self, now):
+        """Return True if this tier should be fetched now."""
+        if self._force or self.last_success is None:
+            return True
+        return self.max_age is not None and now - self.last_success >= self.max_age
+
+    def invalidate(self):
+        """Fetch this tier on the next refresh regardless of its age."""
+        self._force = True
+
+    def succeeded(self, value, now):
+        """Store a freshly fetched value."""
+        self.value = value
+        self.last_success = now
+        self.failures = 0
+        self._force = False
+
+    def failed(self):
+        """Record a failed fetch, keeping the last good value."""
+        self.failures += 1
+        if self.value is not None:
+            _LOGGER.debug(
+                "Using last good %s data after %s failed fetch(es)", self.name, self.failures
+            )
+
+    def age(self, now):
+        """Return seconds since the last successful fetch, or None."""
+        return None if self.last_success is None else now - self.last_success
+
+
 class JuwelHelialuxCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the Juwel Helialux device."""
 
-    def __init__(self, hass, tank_host, tank_protocol, tank_name, update_interval):
+    def __init__(
+        self,
+        hass,
+        tank_host,
+        tank_protocol,
+        tank_name,
+        update_interval,
+        fast_interval=DEFAULT_FAST_INTERVAL,
+        offline_interval=DEFAULT_OFFLINE_INTERVAL,
+        scheduler=None,
+        settings=None,
+        history=None,
+    ):
+        # update_interval and offline_interval are in minutes, fast_interval in seconds
+        self.poll_policy = AdaptivePollPolicy(
+            fast_interval, update_interval * 60, offline_interval * 60
+        )
         super().__init__(
             hass,
             _LOGGER,
             name="Juwel Helialux Sensor",
-            update_interval=timedelta(minutes=update_interval),
+            update_interval=timedelta(seconds=self.poll_policy.interval),
         )
         self.tank_host = tank_host
         self.tank_protocol = tank_protocol
         self.tank_name = tank_name  # Store original name
         self.tank_slug = slugify(tank_name)  # Store slugified version
-        self._manual_override = False
-        self._override_until = None
+        # Optimistic overlay: field -> (expected value, monotonic expiry)
+        self._overlay = {}
+        self._confirm_unsub = None
+        # Status is polled every update, profiles hourly, device info once per boot
+        self.status_tier = PollTier("status")
+        self.profiles_tier = PollTier("profiles", PROFILE_REFRESH_INTERVAL)
+        self.device_tier = PollTier("device info")
+        self._online = None
+        # Single-flight refresh: concurrent or back-to-back refreshes share one fetch
+        self._fetch_lock = asyncio.Lock()
+        self._last_fetch = None
+        self.fetches = 0
+        self.fetches_saved = 0
+        # Field-level change tracking: entities only write state when a field
+        # they watch is in changed_fields
+        self.changed_fields = None
+        self._notified_state = None
+        self._notified_available = None
+        self.state_writes = 0
+        self.state_writes_saved = 0
+        # (wall time, seconds, online, error, next interval) of recent fetches, for diagnostics
+        self.poll_history = deque(maxlen=POLL_HISTORY)
+        # Learned profile curves: between polls the channels follow the
+        # prediction, and polls that confirm it let the interval stretch
+        self.curve = CurveModel()
+        self._polled_minute = None  # (device minute, monotonic time) of the last learned poll
+        self._predict_unsub = None
+        self._notified_error = None
         _LOGGER.debug("Initializing Coordinator - Tank Name: %s, Tank Slug: %s", tank_name, self.tank_slug)
 
+        # Fleet scheduler shared by all entries, staggering polls and capping requests
+        self._scheduler = scheduler
+        if scheduler is not None:
+            scheduler.register(self)
+
         url = f"{self.tank_protocol}://{self.tank_host}"
-        self.helialux = Helialux(url)
-        self.data = {}  
+        # Per-endpoint request timings, labelled with the firmware once it is known
+        self.tracer = RequestTracer()
+        # Last raw responses and parse errors, for the diagnostics download
+        self.recorder = ResponseRecorder()
+        # Home Assistant's shared session isn't used: the controllers need their
+        # own connector capped at two connections per host, and the tracing
+        # hooks are installed on the session. The pooled session is shared by
+        # all tanks and closed when the last entry is unloaded.
+        self.helialux = Helialux(
+            url,
+            limiter=scheduler.limiter if scheduler else None,
+            tracer=self.tracer,
+            recorder=self.recorder,
+        )
+        self.data = HelialuxState()
+        # Values of the number entities, kept next to (not inside) the device state.
+        # An EntrySettings persists them; a plain dict keeps them in memory only.
+        self.settings = settings if settings is not None else {}
+        # Per-minute channel levels of the last day, for the daily light sensors.
+        # A HistoryStore keeps them across restarts; without one they live in memory.
+        self._history_store = history
+        self.history = history.history if history is not None else ChannelHistory()
+        self._notified_history = None
         
         # Set default device info - use tank_slug for identifiers, tank_name for display
         self.device_info = {
@@ -43,67 +168,349 @@ class JuwelHelialuxCoordinator(DataUpdateCoordinator):
         }
         _LOGGER.debug("Device info created with name: %s", tank_name)
 
-    async def set_manual_override(self, active: bool, duration: int = 5):
-        """Control manual override mode."""
-        self._manual_override = active
-        if active:
-            self._override_until = asyncio.get_event_loop().time() + duration
-            _LOGGER.debug("Manual override active for %s seconds", duration)
-        else:
-            self._override_until = None
-            _LOGGER.debug("Manual override deactivated")
+    def async_apply_optimistic(self, ttl=OPTIMISTIC_TTL, **changes):
+        """Show the expected result of a successful command straight away.
+
+        ``changes`` are HelialuxState fields. They are patched into the current
+        state immediately, and stay overlaid on polled data until a poll
+        reports the same values or ``ttl`` seconds pass. A confirming poll is
+        scheduled shortly after.
+        """
+        expires = time.monotonic() + ttl
+        for field, value in changes.items():
+            previous = self._overlay.get(field)
+            if previous is not None and previous[0] != value:
+                _LOGGER.debug(
+                    "Optimistic %s=%s replaces unconfirmed %s", field, value, previous[0]
+                )
+            self._overlay[field] = (value, expires)
+
+        self.data = replace(self.data, **changes)
+        self.async_update_listeners()
+
+        self.poll_policy.note_command(time.monotonic())
+        self.async_mark_dirty()
+        if self._confirm_unsub is not None:
+            self._confirm_unsub()
+        self._confirm_unsub = async_call_later(
+            self.hass, OPTIMISTIC_CONFIRM_DELAY, self._async_confirm_optimistic
+        )
+
+    def async_update_listeners(self):
+        """Tell entities which state fields changed since they were last notified."""
+        self._record_history()
+        changed = set(self.data.changed_fields(self._notified_state))
+        available = (self.last_update_success, self.data.online)
+        if available != self._notified_available:
+            # Every entity shows availability, whatever fields it watches
+            changed.add("available")
+        if self.curve.last_error != self._notified_error:
+            changed.add("prediction_error")
+        if self.history.figures != self._notified_history:
+            changed.add("history")
+        self.changed_fields = frozenset(changed)
+        self._notified_state = self.data
+        self._notified_available = available
+        self._notified_error = self.curve.last_error
+        self._notified_history = self.history.figures
+
+        writes, saved = self.state_writes, self.state_writes_saved
+        super().async_update_listeners()
+        _LOGGER.debug(
+            "Changed %s: %s state writes, %s saved (%s saved in total)",
+            ", ".join(sorted(self.changed_fields)) or "nothing",
+            self.state_writes - writes,
+            self.state_writes_saved - saved,
+            self.state_writes_saved,
+        )
+
+    def _record_history(self):
+        """Add the current channel levels to the history, or a gap while offline."""
+        online = self.last_update_success and self._online
+        self.history.record(int(time.time() // 60), self.data.channels if online else None)
+        if self._history_store is not None:
+            self._history_store.async_schedule_save()
+
+    def async_set_poll_bounds(self, update_interval, fast_interval, offline_interval):
+        """Apply new polling bounds from the options flow without a reload."""
+        self.poll_policy.set_bounds(fast_interval, update_interval * 60, offline_interval * 60)
+        self.update_interval = timedelta(seconds=self.poll_policy.interval)
+        _LOGGER.debug(
+            "Polling bounds now fast=%ss normal=%ss offline=%ss",
+            self.poll_policy.fast,
+            self.poll_policy.normal,
+            self.poll_policy.offline,
+        )
+        if self._listeners:
+            # Reschedule the pending poll with the new interval
+            self._schedule_refresh()
+
+    def _plan_next_poll(self, state, reachable, expected=False):
+        """Let the adaptive policy pick the interval until the next poll."""
+        interval = self.poll_policy.next_interval(state, reachable, time.monotonic(), expected)
+        if self.update_interval is None or self.update_interval.total_seconds() != interval:
+            _LOGGER.debug("Next poll in %ss", interval)
+            self.update_interval = timedelta(seconds=interval)
+
+    def _schedule_refresh(self):
+        """Schedule the next poll, letting the fleet scheduler stagger it."""
+        if self._scheduler is None or self.update_interval is None:
+            super()._schedule_refresh()
+            return
+        interval = self.update_interval
+        delay = self._scheduler.reserve(self, interval.total_seconds())
+        # The base class schedules update_interval from now, so swap in the
+        # staggered delay just for this call
+        self.update_interval = timedelta(seconds=delay)
+        try:
+            super()._schedule_refresh()
+        finally:
+            self.update_interval = interval
+
+    def _learn_curve(self, status, state):
+        """Check the polled channels against the profile curve and learn them.
+
+        Returns True if the curve had predicted them within its tolerance.
+        """
+        if state.color_simulation or state.daytime_simulation:
+            # Simulations don't follow the program, so there is nothing to learn or predict
+            self._polled_minute = None
+            return False
+        error = self.curve.observe(
+            state.current_profile, state.device_minutes, state.channels, status.profile_times
+        )
+        self._polled_minute = (state.device_minutes, time.monotonic())
+        if self._predict_unsub is None:
+            self._predict_unsub = async_track_time_interval(
+                self.hass, self._async_follow_curve, timedelta(minutes=1)
+            )
+        if error is not None:
+            _LOGGER.debug("Profile curve predicted the channels within %s", error)
+        return error is not None and error <= self.curve.tolerance
+
+    @callback
+    def _async_follow_curve(self, _now):
+        """Advance the device clock between polls and move the channels along the curve."""
+        if self._polled_minute is None or self._overlay or not self.last_update_success:
+            return
+        polled, at = self._polled_minute
+        minute = (polled + int(time.monotonic() - at) // 60) % MINUTES_PER_DAY
+        if minute == self.data.device_minutes:
+            return
+        changes = {"device_minutes": minute}
+        levels = self.curve.predict(self.data.current_profile, minute)
+        if levels is not None:
+            changes["channels"] = bytes(levels)
+        self.data = replace(self.data, **changes)
+        self.async_update_listeners()
+
+    async def _async_confirm_optimistic(self, _now):
+        """Poll the device to confirm or revert the optimistic overlay."""
+        self._confirm_unsub = None
+        await self.async_refresh()
+
+    def _apply_overlay(self, state):
+        """Overlay unconfirmed optimistic values on freshly polled state."""
+        if not self._overlay:
+            return state
+
+        now = time.monotonic()
+        pending = {}
+        for field, (value, expires) in self._overlay.items():
+            polled = getattr(state, field)
+            if polled == value:
+                _LOGGER.debug("Device confirmed %s=%s", field, value)
+            elif now >= expires:
+                _LOGGER.warning(
+                    "Device did not confirm %s=%s (reports %s), reverting", field, value, polled
+                )
+            else:
+                _LOGGER.debug(
+                    "Device reports %s=%s, keeping optimistic %s for %.0fs",
+                    field, polled, value, expires - now,
+                )
+                pending[field] = (value, expires)
+
+        self._overlay = pending
+        if not pending:
+            return state
+        return replace(state, **{field: value for field, (value, _) in pending.items()})
+
+    async def async_shutdown(self):
+        """Stop polling and release the controller's HTTP session."""
+        if self._confirm_unsub is not None:
+            self._confirm_unsub()
+            self._confirm_unsub = None
+        if self._predict_unsub is not None:
+            self._predict_unsub()
+            self._predict_unsub = None
+        await super().async_shutdown()
+        if self._history_store is not None:
+            await self._history_store.async_save()
+        if self._scheduler is not None:
+            self._scheduler.unregister(self)
+        await self.helialux.close()
+
+    def async_mark_dirty(self):
+        """Make the next refresh fetch from the device, e.g. after a command."""
+        self._last_fetch = None
+
+    @property
+    def breaker_state(self):
+        """Return the controller's circuit breaker state (closed, open or half_open)."""
+        return self.helialux.breaker.state
+
+    def async_invalidate_profiles(self):
+        """Refetch wpvars.js on the next refresh, e.g. after a profile change."""
+        self.profiles_tier.invalidate()
 
     async def async_config_entry_first_refresh(self):
-        """Fetch initial data and store device info."""
+        """Fetch initial data; device info is fetched as part of the first poll."""
         await self.async_refresh()
 
-        device_info = await self.helialux.device_info()
+    async def _async_update_device_info(self, now, lamp):
+        """Fetch devvars.js and apply it to the device info.
+
+        ``lamp`` comes from the statusvars.js fetched by the same poll, so
+        statusvars.js isn't fetched a second time.
+        """
+        device_info = await self.helialux.device_info(lamp=lamp)
         _LOGGER.debug("Fetched device info: %s", device_info)
 
-        if device_info:
-            self.device_info.update({
-                "sw_version": device_info.get("firmware_version", "Unknown"),
-                "hw_version": device_info.get("hardware_version", "Unknown"),
-                "model": device_info.get("device_type", "Helialux"),
-            })
+        if not device_info:
+            self.device_tier.failed()
+            return
+
+        previous = self.device_tier.value
+        self.device_tier.succeeded(device_info, now)
+        self.tracer.labels["firmware"] = device_info.get("firmware_version", "Unknown")
+        self.device_info.update({
+            "sw_version": device_info.get("firmware_version", "Unknown"),
+            "hw_version": device_info.get("hardware_version", "Unknown"),
+            "model": device_info.get("device_type", "Helialux"),
+        })
+
+        if previous and previous.get("firmware_version") != device_info.get("firmware_version"):
+            _LOGGER.info(
+                "Firmware changed from %s to %s",
+                previous.get("firmware_version"),
+                device_info.get("firmware_version"),
+            )
+            registry = dr.async_get(self.hass)
+            device = registry.async_get_device(identifiers=self.device_info["identifiers"])
+            if device is not None:
+                registry.async_update_device(
+                    device.id,
+                    sw_version=self.device_info["sw_version"],
+                    hw_version=self.device_info["hw_version"],
+                    model=self.device_info["model"],
+                )
 
     async def _async_update_data(self):
-        """Fetch the latest data from the Helialux device."""
-        if self._manual_override and self._override_until:
-            if asyncio.get_event_loop().time() < self._override_until:
-                _LOGGER.debug("Skipping update due to manual override")
+        """Return fresh device state, sharing one fetch between concurrent callers.
+
+        Entities, services and the scheduled poll can all ask for a refresh at
+        the same moment. Whoever comes first fetches; everyone arriving while
+        that fetch is in flight, or within REFRESH_COALESCE_WINDOW after it,
+        gets the current state (that fetch plus any optimistic values or curve
+        steps applied since) without another request to the device.
+        """
+        async with self._fetch_lock:
+            if (
+                self._last_fetch is not None
+                and time.monotonic() - self._last_fetch < REFRESH_COALESCE_WINDOW
+            ):
+                self.fetches_saved += 1
+                _LOGGER.debug(
+                    "Reusing fetch from %.2fs ago (%s of %s refreshes saved)",
+                    time.monotonic() - self._last_fetch,
+                    self.fetches_saved,
+                    self.fetches + self.fetches_saved,
+                )
+                # Not the fetched result itself: optimistic values and curve
+                # steps applied since then live only in self.data
                 return self.data
-            else:
-                self._manual_override = False
-                self._override_until = None
 
-        try:
-            status_data = await self.helialux.get_status()
-            profile_data = await self.helialux.get_profiles()
-
-            if not isinstance(status_data, dict):
-                _LOGGER.error("Invalid status data format")
-                status_data = {}
-            if not isinstance(profile_data, dict):
-                _LOGGER.error("Invalid profile data format")
-                profile_data = {}
-
-            merged_data = {
-                "current_profile": status_data.get("currentProfile", "offline"),
-                "device_time": status_data.get("deviceTime", "00:00"),
-                "white": status_data.get("currentWhite", 0),
-                "blue": status_data.get("currentBlue", 0),
-                "green": status_data.get("currentGreen", 0),
-                "red": status_data.get("currentRed", 0),
-                "manualColorSimulationEnabled": status_data.get("manualColorSimulationEnabled", False),
-                "manualDaytimeSimulationEnabled": status_data.get("manualDaytimeSimulationEnabled", False),
-                "available_profiles": profile_data.get("available_profiles", []),
-                "full_profile_names": profile_data.get("full_profile_names", []),
-            }
-
-            _LOGGER.debug("Merged data: %s", merged_data)
-            return merged_data
+            self.fetches += 1
+            if self._scheduler is not None:
+                self._scheduler.poll_started(self)
+            started = time.monotonic()
+            error = None
+            try:
+                result = await self._async_fetch_state()
+            except UpdateFailed as err:
+                error = err
+                raise
+            finally:
+                self.poll_history.append((
+                    time.time(),
+                    time.monotonic() - started,
+                    self._online,
+                    error,
+                    self.update_interval.total_seconds() if self.update_interval else None,
+                ))
+            self._last_fetch = time.monotonic()
+            return result
+
+    async def _async_fetch_state(self):
+        """Fetch the latest data from the Helialux device."""
+        now = time.monotonic()
+        fetch_profiles = self.profiles_tier.due(now)
 
+        try:
+            # statusvars.js and wpvars.js are fetched concurrently in one round-trip
+            snapshot = await self.helialux.get_snapshot(include_profiles=fetch_profiles)
         except Exception as e:
             _LOGGER.error("Error fetching data: %s", e)
-            return self.data or {}
\ No newline at end of file
+            self._online = False
+            self._plan_next_poll(self.data, reachable=False)
+            return replace(self.data, online=False)
+
+        if snapshot.status_ok:
+            self.status_tier.succeeded(snapshot, now)
+        else:
+            _LOGGER.error("Invalid status data format")
+            self.status_tier.failed()
+        if snapshot.profiles_ok:
+            self.profiles_tier.succeeded(snapshot, now)
+        elif fetch_profiles:
+            _LOGGER.error("Invalid profile data format")
+            self.profiles_tier.failed()
+
+        # A controller coming back after being unreachable may have rebooted
+        # into new firmware, so device info is fetched again.
+        if snapshot.status_ok and self._online is False:
+            self.device_tier.invalidate()
+        self._online = snapshot.status_ok
+
+        if not snapshot.status_ok and self.helialux.breaker.state != CLOSED:
+            # A single failed poll keeps the last good values (marked offline),
+            # but once the breaker has opened the tank is really gone, so the
+            # whole update fails and every entity is made unavailable.
+            self._plan_next_poll(self.data, reachable=False)
+            raise UpdateFailed(
+                f"{self.tank_name} is unreachable, retrying in {self.helialux.breaker.retry_in:.0f}s"
+            )
+
+        status = self.status_tier.value
+        profiles = self.profiles_tier.value
+        if status is None and profiles is None:
+            _LOGGER.error("Failed to fetch status and profiles")
+            self._plan_next_poll(self.data, reachable=False)
+            return replace(self.data, online=False)
+
+        if snapshot.status_ok and self.device_tier.due(now):
+            await self._async_update_device_info(now, snapshot.lamp)
+
+        state = HelialuxState.from_snapshots(status, profiles, online=snapshot.status_ok)
+        expected = snapshot.status_ok and self._learn_curve(status, state)
+        state = self._apply_overlay(state)
+        self._plan_next_poll(state, reachable=snapshot.status_ok, expected=expected)
+
+        _LOGGER.debug(
+            "New state: %s (status age %ss, profiles age %ss)",
+            state,
+            self.status_tier.age(now),
+            self.profiles_tier.age(now),
+        )
+        return state
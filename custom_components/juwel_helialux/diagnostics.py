@@ -0,0 +1,85 @@
+"""Diagnostics support for Juwel Helialux."""
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+
+from .const import DOMAIN, CONF_TANK_HOST
+from .scheduler import SCHEDULER
+
+TO_REDACT = {CONF_TANK_HOST, "ip_address", "mac_address", "configuration_url"}
+
+
+def _text_redactor(coordinator):
+    """Return a function blanking the tank's addresses out of raw payloads."""
+    device = coordinator.device_tier.value or {}
+    secrets = {
+        value
+        for value in (
+            coordinator.tank_host,
+            device.get("ip_address"),
+            device.get("mac_address"),
+        )
+        if value and value != "Unknown"
+    }
+
+    def redact(text):
+        for secret in secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    return redact
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    policy = coordinator.poll_policy
+    breaker = coordinator.helialux.breaker
+    scheduler = hass.data[DOMAIN].get(SCHEDULER)
+
+    diagnostics = {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "options_in_effect": {
+            "fast_interval": policy.fast,
+            "update_interval": policy.normal,
+            "offline_interval": policy.offline,
+            "current_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval else None,
+            "settings": dict(coordinator.settings),
+        },
+        "state": {
+            "online": coordinator.data.online,
+            "last_update_success": coordinator.last_update_success,
+            **coordinator.data.as_dict(),
+        },
+        "device": dict(coordinator.device_tier.value or {}),
+        "breaker": {
+            "state": breaker.state,
+            "retry_in": round(breaker.retry_in, 1),
+            "rejected": breaker.rejected,
+        },
+        "fetches": {
+            "fetches": coordinator.fetches,
+            "fetches_saved": coordinator.fetches_saved,
+        },
+        "poll_history": [
+            {
+                "time": when,
+                "duration_ms": round(seconds * 1000, 3),
+                "online": online,
+                "error": None if error is None else str(error),
+                "next_interval": interval,
+            }
+            for when, seconds, online, error, interval in coordinator.poll_history
+        ],
+        "curve": coordinator.curve.as_dict(),
+        "history": coordinator.history.as_dict(),
+        "ramp": coordinator.helialux.ramp.as_dict(),
+        "requests": coordinator.tracer.summary(),
+        **coordinator.recorder.as_dict(redact=_text_redactor(coordinator)),
+        "fleet": scheduler.stats() if scheduler is not None else None,
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
@@ -0,0 +1,43 @@
+"""Base entity for Juwel Helialux."""
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class HelialuxEntity(CoordinatorEntity):
+    """Coordinator entity that only writes state when a field it shows changed.
+
+    ``_watched_fields`` names the HelialuxState fields (or single channels such
+    as "white") the entity's state and attributes are built from; None means
+    it depends on everything. Availability changes are always written.
+    Subclasses refresh any cached values in ``_update_state``.
+
+    Entities showing the device's live values are unavailable while the
+    latest status poll failed, rather than showing the last good values as
+    current. Entities that stay meaningful offline set ``_live_state`` False.
+    """
+
+    _watched_fields = None
+    _live_state = True
+
+    @property
+    def available(self):
+        """Return False when the coordinator failed or the tank didn't answer the last poll."""
+        return super().available and (not self._live_state or self.coordinator.data.online)
+
+    def _handle_coordinator_update(self):
+        """Write state only if one of the watched fields changed."""
+        changed = self.coordinator.changed_fields
+        if (
+            self._watched_fields is not None
+            and changed is not None
+            and "available" not in changed
+            and changed.isdisjoint(self._watched_fields)
+        ):
+            self.coordinator.state_writes_saved += 1
+            return
+        self._update_state()
+        self.coordinator.state_writes += 1
+        self.async_write_ha_state()
+
+    def _update_state(self):
+        """Refresh values cached on the entity from coordinator data."""
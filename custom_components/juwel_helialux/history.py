@@ -0,0 +1,57 @@
+"""Channel history of one config entry, kept across restarts."""
+
+import logging
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, HISTORY_SAVE_DELAY
+from .pyhelialux.history import ChannelHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_VERSION = 1
+
+
+class HistoryStore:
+    """Loads an entry's ChannelHistory and saves it in the background.
+
+    The history changes every minute, so instead of a save per change (or a
+    delayed save that is pushed back for ever) one save is scheduled at a
+    time, ``save_delay`` seconds after the first change since the last
+    save. Home Assistant writes a pending save when it stops.
+    """
+
+    def __init__(self, hass, entry_id, save_delay=HISTORY_SAVE_DELAY):
+        self._entry_id = entry_id
+        self._store = Store(hass, HISTORY_VERSION, f"{DOMAIN}.{entry_id}.history")
+        self._save_delay = save_delay
+        self._pending = False
+        self.history = ChannelHistory()
+
+    async def async_load(self):
+        """Load the saved history, starting an empty one if there is none."""
+        data = await self._store.async_load()
+        if data:
+            try:
+                self.history = ChannelHistory.restore(data)
+            except (KeyError, TypeError, ValueError) as e:
+                _LOGGER.warning("Discarding unreadable channel history of %s: %s", self._entry_id, e)
+        _LOGGER.debug("Loaded channel history for %s: %s", self._entry_id, self.history.as_dict())
+
+    def _data_to_save(self):
+        self._pending = False
+        return self.history.dump()
+
+    def async_schedule_save(self):
+        """Save the history ``save_delay`` seconds from now, unless a save is already due."""
+        if not self._pending:
+            self._pending = True
+            self._store.async_delay_save(self._data_to_save, self._save_delay)
+
+    async def async_save(self):
+        """Save the history now, e.g. when the entry is unloaded."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """Delete the store, e.g. when the config entry is removed."""
+        await self._store.async_remove()
@@ -1,15 +1,16 @@
 import logging
 from homeassistant.components.light import (
+    ATTR_TRANSITION,
     LightEntity,
+    LightEntityFeature,
     ColorMode,
 )
-from datetime import timedelta
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
-from .const import DOMAIN, CONF_UPDATE_INTERVAL
+from .const import DOMAIN
+from .entity import HelialuxEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,8 +19,6 @@ async def async_setup_entry(
 ):
     """Set up the Juwel Helialux light platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    update_interval = entry.data.get(CONF_UPDATE_INTERVAL, 1)
-    coordinator.update_interval = timedelta(seconds=15)
 
     _LOGGER.debug("Coordinator contents: %s", dir(coordinator))
 
@@ -27,17 +26,19 @@ async def async_setup_entry(
         _LOGGER.error("Coordinator is missing the 'helialux' attribute!")
         return
 
-    await coordinator.async_config_entry_first_refresh()
-
+    # The coordinator already holds the first poll from entry setup
     _LOGGER.debug("Coordinator initial data: %s", coordinator.data)
 
     tank_name = entry.title
-    async_add_entities([JuwelHelialuxLight(coordinator, tank_name)], True)
+    async_add_entities([JuwelHelialuxLight(coordinator, tank_name)])
 
 
-class JuwelHelialuxLight(CoordinatorEntity, LightEntity):
+class JuwelHelialuxLight(HelialuxEntity, LightEntity):
     """Representation of a Juwel Helialux Light in Home Assistant."""
 
+    # is_on, brightness and rgbw_color are all derived from the channels
+    _watched_fields = {"channels"}
+
     def __init__(self, coordinator, tank_name):
         """Initialize the light entity."""
         super().__init__(coordinator)
@@ -49,6 +50,8 @@ class JuwelHelialuxLight(CoordinatorEntity, LightEntity):
         self._attr_translation_key = "light_name"
         self._attr_supported_color_modes = {ColorMode.RGBW}
         self._attr_color_mode = ColorMode.RGBW
+        # Fades are played by the controller's ramp engine, a frame at a time
+        self._attr_supported_features = LightEntityFeature.TRANSITION
         self._attr_is_on = False
         self._attr_brightness = None
         self._attr_rgbw_color = (0, 0, 0, 0)
@@ -58,65 +61,17 @@ class JuwelHelialuxLight(CoordinatorEntity, LightEntity):
     @property
     def is_on(self):
         """Return true if light is on (any RGBW value is greater than 0)."""
-        if not self.coordinator.data:
-            _LOGGER.warning("Coordinator data is None, returning False for is_on")
-            return False
-        raw_red = self.coordinator.data.get("red", 0)
-        raw_green = self.coordinator.data.get("green", 0)
-        raw_blue = self.coordinator.data.get("blue", 0)
-        raw_white = self.coordinator.data.get("white", 0)
-
-        return raw_red > 0 or raw_green > 0 or raw_blue > 0 or raw_white > 0
+        return self.coordinator.data.is_on
 
     @property
     def rgbw_color(self):
         """Return RGBW color values converted to Home Assistant's scale (0-255)."""
-        if not self.coordinator.data:
-            _LOGGER.warning("Coordinator data is None, returning default RGBW (0,0,0,0)")
-            return (0, 0, 0, 0)
-        raw_red = self.coordinator.data.get("red", 0)
-        raw_green = self.coordinator.data.get("green", 0)
-        raw_blue = self.coordinator.data.get("blue", 0)
-        raw_white = self.coordinator.data.get("white", 0)
-
-        # If the light is off (all values are 0), return black
-        if raw_red == 0 and raw_green == 0 and raw_blue == 0 and raw_white == 0:
-            return (0, 0, 0, 0)
-
-        # Convert from 0-100 scale to 0-255
-        converted_red = int(raw_red * 2.55)
-        converted_green = int(raw_green * 2.55)
-        converted_blue = int(raw_blue * 2.55)
-        converted_white = int(raw_white * 2.55)
-
-        return (converted_red, converted_green, converted_blue, converted_white)
+        return self.coordinator.data.rgbw_color
 
     @property
     def brightness(self):
         """Return the brightness of the light, based on the highest RGBW value."""
-        if not self.coordinator.data:
-            _LOGGER.warning("Coordinator data is None, returning default brightness 0")
-            return 0
-
-        raw_red = self.coordinator.data.get("red", 0)
-        raw_green = self.coordinator.data.get("green", 0)
-        raw_blue = self.coordinator.data.get("blue", 0)
-        raw_white = self.coordinator.data.get("white", 0)
-
-        # If the light is off (all values are 0), return brightness 0
-        if raw_red == 0 and raw_green == 0 and raw_blue == 0 and raw_white == 0:
-            return 0
-
-        # Convert to Home Assistant's scale (0-255) and calculate brightness
-        max_rgbw_value = max(
-            raw_red * 2.55,
-            raw_green * 2.55,
-            raw_blue * 2.55,
-            raw_white * 2.55,
-        )
-
-        # Return the brightness based on the highest value
-        return int(max_rgbw_value)
+        return self.coordinator.data.brightness
 
     async def async_turn_on(self, **kwargs):
         """Turn the light on with optional parameters."""
@@ -141,10 +96,7 @@ class JuwelHelialuxLight(CoordinatorEntity, LightEntity):
             red = min(100, red * scale)
 
         _LOGGER.debug("Setting light to W:%d B:%d G:%d R:%d", white, blue, green, red)
-        
-        # Enable manual override for 5 seconds
-        await self.coordinator.set_manual_override(True, 5)
-        
+
         try:
             # Get duration from number entity (same approach as in switch.py)
             duration_entity = f"number.{self.coordinator.tank_slug}_manual_color_simulation_duration"
@@ -152,20 +104,19 @@ class JuwelHelialuxLight(CoordinatorEntity, LightEntity):
             duration_minutes = int(float(duration_state.state) * 60) if duration_state else 720  # Default to 12 hours if not found
             
             _LOGGER.debug("Using manual color simulation duration: %s minutes", duration_minutes)
-            
-            # Set the light state with the configured duration
-            await self._controller.start_manual_color_simulation(duration_minutes)            
-            await self._controller.set_manual_color(white, blue, green, red)
-            
-            # Update local state immediately
-            self._attr_is_on = True
-            self._attr_brightness = brightness
-            self._attr_rgbw_color = rgbw_color
-            self.async_write_ha_state()
-            
+
+            if kwargs.get(ATTR_TRANSITION):
+                self._start_fade((white, blue, green, red), kwargs[ATTR_TRANSITION], duration_minutes)
+                return
+
+            # Set the light state with the configured duration. Rapid calls (e.g. dragging
+            # a slider) are coalesced so only the final colour is sent to the device.
+            if await self._controller.queue_manual_color(white, blue, green, red, duration_minutes):
+                # Show the new colour now; the next poll confirms or reverts it
+                self._apply_optimistic_color(white, blue, green, red)
+
         except Exception as e:
             _LOGGER.error("Error setting light state: %s", e)
-            await self.coordinator.set_manual_override(False)
             raise
 
     async def async_turn_off(self, **kwargs):
@@ -178,13 +129,40 @@ class JuwelHelialuxLight(CoordinatorEntity, LightEntity):
             duration_minutes = int(float(duration_state.state) * 60) if duration_state else 720  # Default to 12 hours if not found
             
             _LOGGER.debug("Using manual color simulation duration: %s minutes", duration_minutes)
-            
-            await self._controller.start_manual_color_simulation(duration_minutes)
-            await self._controller.set_manual_color(0, 0, 0, 0)
-            self._attr_is_on = False
-            self._attr_brightness = 0
-            self._attr_rgbw_color = (0, 0, 0, 0)
-            self.async_write_ha_state()
+
+            if kwargs.get(ATTR_TRANSITION):
+                self._start_fade((0, 0, 0, 0), kwargs[ATTR_TRANSITION], duration_minutes)
+                return
+
+            if await self._controller.queue_manual_color(0, 0, 0, 0, duration_minutes):
+                self._apply_optimistic_color(0, 0, 0, 0)
         except Exception as e:
             _LOGGER.error("Error turning off light: %s", e)
-            raise
\ No newline at end of file
+            raise
+
+    def _start_fade(self, target, transition, duration_minutes):
+        """Fade to ``target`` in the background, so the service call returns straight away."""
+        start = tuple(self.coordinator.data.channels)
+        _LOGGER.debug("Fading from %s to %s over %ss", start, target, transition)
+        self.hass.async_create_task(self._async_fade(start, target, transition, duration_minutes))
+
+    async def _async_fade(self, start, target, transition, duration_minutes):
+        """Play a fade, showing every frame the device accepts."""
+        try:
+            done = await self._controller.queue_manual_color_ramp(
+                start,
+                target,
+                transition,
+                duration_minutes,
+                on_frame=lambda levels: self._apply_optimistic_color(*levels),
+            )
+        except Exception as e:
+            _LOGGER.error("Error fading light: %s", e)
+            return
+        if not done:
+            _LOGGER.debug("Fade to %s did not complete", target)
+
+    def _apply_optimistic_color(self, white, blue, green, red):
+        """Patch the coordinator state with the colour the device just accepted."""
+        channels = bytes(min(100, max(0, round(value))) for value in (white, blue, green, red))
+        self.coordinator.async_apply_optimistic(channels=channels, color_simulation=True)
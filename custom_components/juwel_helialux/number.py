@@ -1,10 +1,8 @@
 import logging
 from homeassistant.components.number import NumberEntity
 from homeassistant.const import UnitOfTime
-from homeassistant.helpers.storage import Store
 from homeassistant.util import slugify
 from .const import DOMAIN
-import asyncio
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,12 +18,15 @@ async def async_setup_entry(hass, entry, async_add_entities):
         HelialuxDaytimeSimulationPosition(hass, coordinator, entry, tank_name, tank_id)
     ]
 
-    async_add_entities(numbers, update_before_add=True)
+    async_add_entities(numbers)
 
 
 class HelialuxNumberEntity(NumberEntity):
     """Base class for Helialux number entities."""
 
+    # Values are kept locally, there is nothing to poll on the device
+    _attr_should_poll = False
+
     def __init__(self, hass, coordinator, entry, tank_name, tank_id, attribute, min_value, max_value, default_value, step=0.5, unit=UnitOfTime.HOURS):
         self.coordinator = coordinator
         self.entry = entry
@@ -33,7 +34,8 @@ class HelialuxNumberEntity(NumberEntity):
         self.tank_id = tank_id
         self._attr_native_step = step
         self._attr_native_unit_of_measurement = unit
-        self._state = float(default_value)
+        # Saved values were loaded with the entry's settings at setup
+        self._state = float(coordinator.settings.get(attribute, default_value))
         self._attr_has_entity_name = True
         self._attr_unique_id = f"{entry.entry_id}_{attribute}"
         self._attr_native_min_value = float(min_value)
@@ -42,9 +44,6 @@ class HelialuxNumberEntity(NumberEntity):
         self._attr_device_info = coordinator.device_info
         self._attr_translation_key = attribute
 
-        # Initialize persistent storage
-        self._store = Store(hass, 1, f"{DOMAIN}_{self._attr_unique_id}.json")
-
     @property
     def native_value(self):
         """Return the current value."""
@@ -53,30 +52,16 @@ class HelialuxNumberEntity(NumberEntity):
     async def async_set_native_value(self, value):
         """Set the value."""
         self._state = float(value)
-        # Store the value in the coordinator
-        self.coordinator.data[f"{self._attr_translation_key}"] = self._state
+        # Saved to disk shortly after the last change, not on every slider step
+        self.coordinator.settings[self._attr_translation_key] = self._state
         self.async_write_ha_state()
-        await self._store.async_save({"value": self._state})
         _LOGGER.debug(f"Set {self.entity_id} to {value} {self._attr_native_unit_of_measurement}")
 
-    async def async_update(self):
-        """Update the state from HA data."""
-        await self.coordinator.async_refresh()
-        self._update_state()
-
     def _update_state(self):
         """Update internal state from coordinator data."""
         # Override in child classes if needed
         pass
 
-    async def async_added_to_hass(self):
-        """Load previously stored state when added to Home Assistant."""
-        await super().async_added_to_hass()
-        data = await self._store.async_load()
-        if data and "value" in data:
-            self._state = float(data["value"])
-            _LOGGER.debug(f"Restored {self.entity_id} to {self._state} {self._attr_native_unit_of_measurement}")
-
 
 class HelialuxColorSimulationDuration(HelialuxNumberEntity):
     """Number entity for setting the manual color simulation duration."""
@@ -117,14 +102,13 @@ class HelialuxDaytimeSimulationPosition(HelialuxNumberEntity):
         self._state = float(value)
         
         # Store the value
-        self.coordinator.data["daytime_simulation_position"] = self._state
+        self.coordinator.settings["daytime_simulation_position"] = self._state
         self.async_write_ha_state()
-        await self._store.async_save({"value": self._state})
         
         _LOGGER.debug(f"Set {self.entity_id} to {value} hours")
         
         # Check if daytime simulation is currently active
-        is_daytime_active = self.coordinator.data.get("manualDaytimeSimulationEnabled") == "On"
+        is_daytime_active = self.coordinator.data.daytime_simulation
         
         if is_daytime_active:
             _LOGGER.debug("Daytime simulation is active, updating device position")
@@ -154,16 +138,13 @@ class HelialuxDaytimeSimulationPosition(HelialuxNumberEntity):
             
             # Update the device with new position while keeping simulation active
             try:
-                await self.coordinator.helialux.update_daytime_simulation_position(
+                # Slider drags are coalesced, only the final position is sent
+                await self.coordinator.helialux.queue_daytime_simulation_position(
                     target_minutes=target_minutes,
                     duration=duration_formatted
                 )
                 _LOGGER.debug(f"Updated device position to {target_minutes} minutes")
                 
-                # Small delay then refresh
-                await asyncio.sleep(0.5)
-                await self.coordinator.async_refresh()
-                
             except Exception as e:
                 _LOGGER.error(f"Error updating daytime simulation position: {e}")
     
@@ -0,0 +1,77 @@
+"""Adaptive polling interval for the Juwel Helialux coordinator."""
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# How long after a command the tank keeps being polled at the fast interval
+COMMAND_FAST_WINDOW = 60  # seconds
+# How far apart polls may get while they keep confirming the learned profile curve
+PREDICTED_INTERVAL = 300  # seconds
+
+
+class AdaptivePollPolicy:
+    """Pick the next poll interval from what the tank is doing.
+
+    * fast while a manual colour or daytime simulation runs, or shortly after
+      a command was sent;
+    * stepping from fast towards the normal interval, doubling on every poll
+      that finds the lights unchanged, and back to fast as soon as they move;
+    * stepping on up to PREDICTED_INTERVAL (if that is longer) while every
+      poll matches what the learned profile curve predicted, since the
+      entities follow the curve between polls anyway;
+    * backing off exponentially up to the offline interval while the tank is
+      unreachable.
+
+    All intervals are in seconds.
+    """
+
+    def __init__(self, fast, normal, offline):
+        self.interval = fast
+        self._failures = 0
+        self._last_command = None
+        self._last_signature = None
+        self.set_bounds(fast, normal, offline)
+
+    def set_bounds(self, fast, normal, offline):
+        """Apply new bounds, e.g. after the options flow changed them."""
+        self.fast = max(1, fast)
+        self.normal = max(self.fast, normal)
+        self.offline = max(self.normal, offline)
+        self.predicted = max(self.normal, min(self.offline, PREDICTED_INTERVAL))
+        self.interval = min(max(self.interval, self.fast), self.offline)
+
+    def note_command(self, now):
+        """Record that a command was just sent to the tank."""
+        self._last_command = now
+        self.interval = self.fast
+
+    def next_interval(self, state, reachable, now, expected=False):
+        """Return the interval until the next poll after this one.
+
+        ``expected`` says the polled channels matched the profile curve's
+        prediction, so a change in them is no reason to poll fast.
+        """
+        if not reachable:
+            self._failures += 1
+            self.interval = min(self.offline, self.fast * 2 ** self._failures)
+            return self.interval
+        self._failures = 0
+
+        # Only the lights and the program matter here, not the ticking clock
+        signature = (state.channels, state.current_profile)
+        changed = signature != self._last_signature
+        if expected and self._last_signature is not None and signature[1] == self._last_signature[1]:
+            changed = False
+        self._last_signature = signature
+
+        if state.color_simulation or state.daytime_simulation:
+            self.interval = self.fast
+        elif self._last_command is not None and now - self._last_command < COMMAND_FAST_WINDOW:
+            self.interval = self.fast
+        elif changed:
+            self.interval = self.fast
+        else:
+            ceiling = self.predicted if expected else self.normal
+            self.interval = min(ceiling, self.interval * 2)
+        return self.interval
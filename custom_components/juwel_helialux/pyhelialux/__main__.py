@@ -0,0 +1,14 @@
+"""Entry point for ``python -m pyhelialux``; see cli.py."""
+
+import os
+import sys
+
+# Run from custom_components/juwel_helialux, that folder is on the path and
+# the integration's select.py would shadow the standard library module asyncio
+# imports. pyhelialux only uses relative imports, so the folder can go.
+_COMPONENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:] = [path for path in sys.path if os.path.abspath(path or os.curdir) != _COMPONENT]
+
+from .cli import main  # noqa: E402
+
+main()
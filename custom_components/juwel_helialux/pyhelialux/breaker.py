@@ -0,0 +1,110 @@
+"""Circuit breaker guarding the requests made to one HeliaLux controller."""
+
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3  # consecutive failures before the breaker opens
+DEFAULT_BASE_DELAY = 5  # seconds the breaker stays open the first time
+DEFAULT_MAX_DELAY = 300  # upper bound for the open period
+DEFAULT_JITTER = 0.2  # +/- fraction applied to every open period
+
+
+class CircuitBreaker:
+    """Stop talking to a controller that keeps failing.
+
+    * closed: requests go through; consecutive failures are counted and the
+      breaker opens once ``failure_threshold`` is reached.
+    * open: requests fail immediately without touching the network until the
+      open period has passed. The period doubles every time the breaker opens
+      again, up to ``max_delay``, with random jitter so several tanks that went
+      away together don't all retry at the same moment.
+    * half-open: a single trial request is let through. Success closes the
+      breaker, failure opens it again with the next, longer, period.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        base_delay=DEFAULT_BASE_DELAY,
+        max_delay=DEFAULT_MAX_DELAY,
+        jitter=DEFAULT_JITTER,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max(base_delay, max_delay)
+        self.jitter = jitter
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened = 0  # times opened since the breaker was last closed
+        self._open_until = 0.0
+        self._trial_running = False
+        self.rejected = 0
+
+    @property
+    def state(self):
+        """Return closed, open or half_open."""
+        if self._state == OPEN and self._clock() >= self._open_until:
+            self._state = HALF_OPEN
+            self._trial_running = False
+        return self._state
+
+    @property
+    def retry_in(self):
+        """Return the seconds until the next trial request is allowed."""
+        if self.state != OPEN:
+            return 0
+        return max(0.0, self._open_until - self._clock())
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        """Close the breaker after a request got an answer."""
+        if self._state != CLOSED:
+            _LOGGER.info("Controller reachable again, closing circuit breaker")
+        self._state = CLOSED
+        self._failures = 0
+        self._opened = 0
+        self._trial_running = False
+
+    def abandon(self):
+        """Give back permission for a request that was never sent."""
+        self._trial_running = False
+
+    def record_failure(self):
+        """Count a failed request, opening the breaker when needed."""
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        delay = min(self.max_delay, self.base_delay * 2 ** self._opened)
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._opened += 1
+        self._state = OPEN
+        self._trial_running = False
+        self._open_until = self._clock() + delay
+        # Only the first trip is worth a warning, later ones just extend the pause
+        _LOGGER.log(
+            logging.WARNING if self._opened == 1 else logging.DEBUG,
+            "Controller unreachable after %d failed requests, pausing requests for %.0fs",
+            self._failures,
+            delay,
+        )
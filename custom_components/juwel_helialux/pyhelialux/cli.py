@@ -0,0 +1,317 @@
+"""Command-line tool for one or many HeliaLux controllers.
+
+Run it as ``python -m pyhelialux`` from the folder that contains pyhelialux,
+custom_components/juwel_helialux included: __main__.py takes that folder off
+the path again so the integration's select.py doesn't shadow the standard
+library module::
+
+    python -m pyhelialux status 192.168.1.50 192.168.1.51
+    python -m pyhelialux scan 192.168.1.0/24 | python -m pyhelialux info --hosts-file -
+    python -m pyhelialux set-profile Plants --hosts-file tanks.txt --format csv
+    python -m pyhelialux set-color 80 60 40 20 192.168.1.50 --duration 30
+    python -m pyhelialux bench 192.168.1.50 --count 50
+
+Every host is handled by a Controller, the same client and parsers the
+integration uses, and all of them share one RequestLimiter, so
+``--concurrency`` caps the requests in flight across the whole fleet.
+Results are written one record per host as it finishes, as NDJSON (the
+default) or CSV. A hosts file has one host per line, or the NDJSON written
+by ``scan``. The exit status is 1 if any host failed.
+"""
+
+import argparse
+import asyncio
+import csv
+import dataclasses
+import json
+import logging
+import sys
+
+import aiohttp
+
+from .discovery import scan
+from .limiter import RequestLimiter
+from .pool import SessionPool
+from .pyHelialux import SNAPSHOT_TIMEOUT, Controller
+from .tracing import RequestTracer
+
+DEFAULT_CONCURRENCY = 16  # requests in flight across all hosts
+DEFAULT_BENCH_COUNT = 20
+
+STATUS_COLUMNS = (
+    "host", "ok", "error", "current_profile", "device_time", "white", "blue", "green", "red",
+    "manual_color_simulation", "manual_daytime_simulation", "lamp",
+)
+PROFILES_COLUMNS = ("host", "ok", "error", "current_profile", "available_profiles")
+INFO_COLUMNS = (
+    "host", "ok", "error", "device_type", "hardware_version", "firmware_version",
+    "ip_address", "mac_address", "light_channels",
+)
+SET_PROFILE_COLUMNS = ("host", "ok", "error", "profile")
+SET_COLOR_COLUMNS = ("host", "ok", "error", "white", "blue", "green", "red", "duration")
+SCAN_COLUMNS = ("host", "device_type", "hardware_version", "firmware_version", "mac_address")
+BENCH_COLUMNS = (
+    "host", "endpoint", "count", "errors", "mean_ms", "min_ms", "p50_ms", "p95_ms", "max_ms",
+    "ttfb_p50_ms",
+)
+
+
+class HostError(Exception):
+    """A host could not do what was asked; the message ends up in its record."""
+
+
+# -- output -------------------------------------------------------------------
+
+
+class RecordWriter:
+    """Writes records to a stream as NDJSON or CSV (with a header row)."""
+
+    def __init__(self, stream, output_format, columns):
+        self._stream = stream
+        self._csv = None
+        if output_format == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=columns, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, record):
+        if self._csv is None:
+            self._stream.write(json.dumps(record) + "\n")
+        else:
+            self._csv.writerow({
+                key: "|".join(map(str, value)) if isinstance(value, (list, tuple)) else value
+                for key, value in record.items()
+            })
+        self._stream.flush()
+
+
+# -- per-host actions ----------------------------------------------------------
+
+
+async def _status(controller, args):
+    snapshot = await controller.get_snapshot(timeout=args.timeout, include_profiles=False)
+    if not snapshot.status_ok:
+        raise HostError("statusvars.js could not be fetched")
+    return {
+        "current_profile": snapshot.current_profile,
+        "device_time": snapshot.device_time,
+        "white": snapshot.white,
+        "blue": snapshot.blue,
+        "green": snapshot.green,
+        "red": snapshot.red,
+        "manual_color_simulation": snapshot.manual_color_simulation,
+        "manual_daytime_simulation": snapshot.manual_daytime_simulation,
+        "lamp": snapshot.lamp,
+    }
+
+
+async def _profiles(controller, args):
+    profiles = await controller.get_profiles()
+    if profiles is None:
+        raise HostError("wpvars.js could not be fetched")
+    return {
+        "current_profile": profiles["current_profile"],
+        "available_profiles": profiles["available_profiles"],
+    }
+
+
+async def _info(controller, args):
+    info = await controller.device_info()
+    if not info:
+        raise HostError("devvars.js could not be fetched")
+    return info
+
+
+async def _set_profile(controller, args):
+    profiles = await controller.get_profiles()
+    if profiles is None:
+        raise HostError("wpvars.js could not be fetched")
+    names = profiles["available_profiles"]
+    if args.profile not in names:
+        raise HostError(f"no profile {args.profile!r}, the controller has {', '.join(names)}")
+    full_name = profiles["full_profile_names"][names.index(args.profile)]
+    if not await controller.set_profile(full_name, args.profile):
+        raise HostError("the profile change was not accepted")
+    return {"profile": args.profile}
+
+
+async def _set_color(controller, args):
+    levels = (args.white, args.blue, args.green, args.red)
+    if not await controller.queue_manual_color(*levels, duration=args.duration):
+        raise HostError("the colour was not accepted")
+    return {**dict(zip(("white", "blue", "green", "red"), levels)), "duration": args.duration}
+
+
+# -- commands -------------------------------------------------------------------
+
+
+def _url(host):
+    return host.rstrip("/") if "://" in host else f"http://{host}"
+
+
+def _read_hosts(args):
+    """Return the hosts given on the command line and in the hosts file, in order."""
+    hosts = list(args.hosts)
+    if args.hosts_file:
+        stream = sys.stdin if args.hosts_file == "-" else open(args.hosts_file, encoding="utf-8")
+        with stream:
+            for line in stream:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                hosts.append(json.loads(line)["host"] if line.startswith("{") else line)
+    # Each controller once, however often it is listed
+    return list(dict.fromkeys(hosts))
+
+
+async def _run_fleet(action, args, writer):
+    """Run ``action`` against every host concurrently, writing a record per host."""
+    hosts = _read_hosts(args)
+    if not hosts:
+        raise SystemExit("no hosts given")
+    limiter = RequestLimiter(args.concurrency)
+    pool = SessionPool()
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+
+    async def run(host):
+        controller = Controller(
+            _url(host), pool=pool, limiter=limiter, timeout=timeout, command_debounce=0
+        )
+        try:
+            return {"host": host, "ok": True, **await action(controller, args)}
+        except HostError as e:
+            return {"host": host, "ok": False, "error": str(e)}
+        finally:
+            await controller.close()
+
+    failed = 0
+    for finished in asyncio.as_completed([run(host) for host in hosts]):
+        record = await finished
+        failed += not record["ok"]
+        writer.write(record)
+    return 1 if failed else 0
+
+
+async def _run_scan(args, writer):
+    found = await scan(args.network, concurrency=args.concurrency, port=args.port)
+    for controller in found:
+        writer.write(dataclasses.asdict(controller))
+    return 0 if found else 1
+
+
+async def _run_bench(args, writer):
+    """Time ``--count`` polls of one host, one after another, like the integration polls."""
+    tracer = RequestTracer(labels={"host": args.host})
+    pool = SessionPool()
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with Controller(_url(args.host), pool=pool, tracer=tracer, timeout=timeout) as controller:
+        lamp = None
+        for _ in range(args.count):
+            lamp = (await controller.get_snapshot(timeout=args.timeout)).lamp or lamp
+            if args.interval:
+                await asyncio.sleep(args.interval)
+        await controller.device_info(lamp=lamp)
+
+    endpoints = tracer.summary()["endpoints"]
+    for endpoint, phases in endpoints.items():
+        total = phases.get("total", {})
+        writer.write({
+            "host": args.host,
+            "endpoint": endpoint,
+            "errors": phases["errors"],
+            **{key: value for key, value in total.items() if key != "buckets"},
+            "ttfb_p50_ms": phases.get("ttfb", {}).get("p50_ms"),
+        })
+    return 1 if not endpoints or any(phases["errors"] for phases in endpoints.values()) else 0
+
+
+def _level(value):
+    """argparse type for a channel level on the controller's 0-100 scale."""
+    level = int(value)
+    if not 0 <= level <= 100:
+        raise argparse.ArgumentTypeError(f"{value} is not between 0 and 100")
+    return level
+
+
+def _add_fleet_arguments(parser):
+    parser.add_argument("hosts", nargs="*", help="controller hosts or URLs")
+    parser.add_argument("--hosts-file", help='file with one host per line, or "-" for stdin')
+
+
+def _build_parser():
+    # Options every command takes, accepted after the command name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    common.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help="requests (probes for scan) in flight at once",
+    )
+    common.add_argument(
+        "--timeout", type=float, default=SNAPSHOT_TIMEOUT, help="seconds to wait for each request"
+    )
+    common.add_argument("-v", "--verbose", action="store_true", help="log every request")
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pyhelialux", description="Talk to HeliaLux controllers from the shell"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, action, columns, description in (
+        ("status", _status, STATUS_COLUMNS, "current profile, light levels and simulations"),
+        ("profiles", _profiles, PROFILES_COLUMNS, "available profiles and the active one"),
+        ("info", _info, INFO_COLUMNS, "device type, versions and addresses"),
+    ):
+        command = commands.add_parser(name, help=description, parents=[common])
+        _add_fleet_arguments(command)
+        command.set_defaults(action=action, columns=columns)
+
+    command = commands.add_parser(
+        "set-profile", help="switch every host to a profile", parents=[common]
+    )
+    command.add_argument("profile", help="profile name as shown by the profiles command")
+    _add_fleet_arguments(command)
+    command.set_defaults(action=_set_profile, columns=SET_PROFILE_COLUMNS)
+
+    command = commands.add_parser(
+        "set-color", help="set a manual colour on every host", parents=[common]
+    )
+    for channel in ("white", "blue", "green", "red"):
+        command.add_argument(channel, type=_level, help=f"{channel} level, 0-100")
+    _add_fleet_arguments(command)
+    command.add_argument(
+        "--duration", type=int, default=60, help="minutes the colour simulation runs"
+    )
+    command.set_defaults(action=_set_color, columns=SET_COLOR_COLUMNS)
+
+    command = commands.add_parser(
+        "scan", help="find controllers in an address range", parents=[common]
+    )
+    command.add_argument("network", help='CIDR range, e.g. "192.168.1.0/24"')
+    command.add_argument("--port", type=int, help="only for controllers on a non-standard port")
+    command.set_defaults(run=_run_scan, columns=SCAN_COLUMNS)
+
+    command = commands.add_parser(
+        "bench", help="time requests to one host, per endpoint", parents=[common]
+    )
+    command.add_argument("host")
+    command.add_argument(
+        "--count", type=int, default=DEFAULT_BENCH_COUNT, help="polls (statusvars.js + wpvars.js)"
+    )
+    command.add_argument("--interval", type=float, default=0.0, help="seconds between polls")
+    command.set_defaults(run=_run_bench, columns=BENCH_COLUMNS)
+    return parser
+
+
+def main(argv=None):
+    args = _build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+    writer = RecordWriter(sys.stdout, args.format, args.columns)
+    run = getattr(args, "run", None)
+    coroutine = run(args, writer) if run else _run_fleet(args.action, args, writer)
+    try:
+        sys.exit(asyncio.run(coroutine))
+    except KeyboardInterrupt:
+        sys.exit(130)
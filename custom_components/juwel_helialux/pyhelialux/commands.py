@@ -0,0 +1,120 @@
+"""Debounced, last-write-wins command queue for a HeliaLux controller."""
+
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE = 0.3  # seconds without new commands before sending
+DEFAULT_MAX_DELAY = 1.5  # seconds a command may be held back while new ones keep arriving
+
+
+class CommandQueue:
+    """Serialize writes to one controller, keeping only the latest per kind.
+
+    Commands are queued under a kind such as ``"manual_color"``. Submitting a
+    command while an older one of the same kind is still waiting replaces it,
+    and both callers get the result of the one that is actually sent. A single
+    worker sends commands one at a time, in the order they were last
+    submitted, so an older write can never land after a newer one.
+    """
+
+    def __init__(self, debounce=DEFAULT_DEBOUNCE, max_delay=DEFAULT_MAX_DELAY):
+        self.debounce = debounce
+        self.max_delay = max(debounce, max_delay)
+        self._pending = {}  # kind -> (send, future), in submission order
+        self._first_submit = None
+        self._last_submit = None
+        self._worker = None
+        self.sent = 0
+        self.coalesced = 0
+
+    @property
+    def pending(self):
+        """Return the number of commands waiting to be sent."""
+        return len(self._pending)
+
+    def submit(self, kind, send):
+        """Queue ``send`` (a coroutine function) under ``kind``.
+
+        Returns a future that resolves to the return value of whichever command
+        of this kind ends up being sent.
+        """
+        loop = asyncio.get_running_loop()
+        previous = self._pending.pop(kind, None)
+        if previous is not None:
+            future = previous[1]
+            self.coalesced += 1
+            _LOGGER.debug("Replacing queued %s command", kind)
+        else:
+            future = loop.create_future()
+        # Re-inserting moves the kind to the back: it is now the newest command
+        self._pending[kind] = (send, future)
+
+        now = loop.time()
+        if self._first_submit is None:
+            self._first_submit = now
+        self._last_submit = now
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return future
+
+    def discard(self, kind, result=False):
+        """Drop the queued command of ``kind``, if any, resolving its future with ``result``.
+
+        Returns True if a command was dropped.
+        """
+        entry = self._pending.pop(kind, None)
+        if entry is None:
+            return False
+        if not self._pending:
+            self._first_submit = None
+        if not entry[1].done():
+            entry[1].set_result(result)
+        _LOGGER.debug("Dropped queued %s command", kind)
+        return True
+
+    def _send_at(self):
+        """Return the loop time at which the queue should flush."""
+        return min(self._last_submit + self.debounce, self._first_submit + self.max_delay)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            delay = self._send_at() - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            kind = next(iter(self._pending))
+            send, future = self._pending.pop(kind)
+            if not self._pending:
+                self._first_submit = None
+            try:
+                result = await send()
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as err:  # Handed to whoever awaits the command
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                self.sent += 1
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self):
+        """Drop queued commands and stop the worker."""
+        for _send, future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        self._first_submit = None
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
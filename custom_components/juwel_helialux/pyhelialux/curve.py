@@ -0,0 +1,164 @@
+"""Learned model of the controller's daily light programs.
+
+Each profile is a daily curve: channel levels at a few time points, with the
+controller interpolating linearly in between. statusvars.js reports the
+active profile's time points (``times``) but not the levels at them, and no
+endpoint returns the curve itself, so the levels are learned from polls
+instead. Every poll stores the levels seen at that device minute in a fixed
+table of 1440 slots per profile; levels for minutes that haven't been
+polled are interpolated between the nearest samples, as long as no time
+point (where the curve bends) lies between them.
+
+Comparing each poll with what the model predicted for it gives the
+prediction error, which callers use to decide whether polls can be spread
+out and whether the model can be trusted between them.
+"""
+
+import logging
+from array import array
+from bisect import bisect_left, insort
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 1440
+CHANNEL_COUNT = 4
+# Largest prediction error (in 0-100 channel points) that still counts as a hit;
+# the controller rounds interpolated levels, so exact matches can't be expected
+PREDICTION_TOLERANCE = 2
+# Without time points, how far apart two samples may be and still be interpolated
+MAX_SAMPLE_GAP = 30  # minutes
+# Weight of the newest error in the running mean
+ERROR_SMOOTHING = 0.1
+
+
+class ProfileCurve:
+    """Channel levels of one profile, learned per device minute."""
+
+    __slots__ = ("name", "times", "_levels", "_minutes")
+
+    def __init__(self, name, times=()):
+        self.name = name
+        self.times = tuple(sorted({minute % MINUTES_PER_DAY for minute in times}))
+        self._levels = array("B", bytes(MINUTES_PER_DAY * CHANNEL_COUNT))
+        self._minutes = []  # sorted minutes that have a sample
+
+    def __len__(self):
+        return len(self._minutes)
+
+    def sample(self, minute):
+        """Return the levels polled at ``minute``, or None if never polled."""
+        minute %= MINUTES_PER_DAY
+        index = bisect_left(self._minutes, minute)
+        if index == len(self._minutes) or self._minutes[index] != minute:
+            return None
+        offset = minute * CHANNEL_COUNT
+        return tuple(self._levels[offset:offset + CHANNEL_COUNT])
+
+    def learn(self, minute, levels):
+        """Store the levels polled at ``minute``."""
+        minute %= MINUTES_PER_DAY
+        index = bisect_left(self._minutes, minute)
+        if index == len(self._minutes) or self._minutes[index] != minute:
+            insort(self._minutes, minute)
+        offset = minute * CHANNEL_COUNT
+        self._levels[offset:offset + CHANNEL_COUNT] = array("B", levels)
+
+    def _bends_between(self, start, span):
+        """Return True if a time point lies strictly inside the span after ``start``."""
+        return any(0 < (point - start) % MINUTES_PER_DAY < span for point in self.times)
+
+    def predict(self, minute):
+        """Return the expected (white, blue, green, red) at ``minute``, or None if unknown."""
+        minute %= MINUTES_PER_DAY
+        known = self.sample(minute)
+        if known is not None or not self._minutes:
+            return known
+
+        index = bisect_left(self._minutes, minute)
+        before = self._minutes[index - 1]  # wraps to the last sample before midnight
+        after = self._minutes[index % len(self._minutes)]
+        since = (minute - before) % MINUTES_PER_DAY
+        span = since + (after - minute) % MINUTES_PER_DAY
+        if self.times:
+            if self._bends_between(before, span):
+                return None
+        elif span > MAX_SAMPLE_GAP:
+            return None
+
+        low, high = self.sample(before), self.sample(after)
+        return tuple(round(a + (b - a) * since / span) for a, b in zip(low, high))
+
+
+class CurveModel:
+    """Learned curves for every profile of one controller, plus error statistics.
+
+    ``observe`` is called with each poll taken while the controller runs its
+    program (not during a manual simulation). ``last_error`` is the largest
+    channel difference between the last checked prediction and the poll,
+    ``mean_error`` a running mean of those, and ``hits``/``misses`` count
+    predictions within and outside ``tolerance``.
+    """
+
+    def __init__(self, tolerance=PREDICTION_TOLERANCE):
+        self.tolerance = tolerance
+        self._curves = {}
+        self.hits = 0
+        self.misses = 0
+        self.last_error = None
+        self.mean_error = None
+
+    def predict(self, profile, minute):
+        """Return the expected levels for a profile at a device minute, or None."""
+        curve = self._curves.get(profile)
+        return None if curve is None else curve.predict(minute)
+
+    def observe(self, profile, minute, levels, times=()):
+        """Check the prediction for a polled sample, then learn it.
+
+        Returns the prediction error, or None if there was no prediction to
+        check (a new profile, or a part of the curve not learned yet).
+        """
+        times = tuple(sorted({point % MINUTES_PER_DAY for point in times}))
+        curve = self._curves.get(profile)
+        if curve is None or (times and times != curve.times):
+            if curve is not None:
+                _LOGGER.debug("Time points of profile %s changed, relearning it", profile)
+            curve = self._curves[profile] = ProfileCurve(profile, times)
+
+        levels = tuple(levels)
+        predicted = curve.predict(minute)
+        if predicted is None:
+            curve.learn(minute, levels)
+            return None
+
+        error = max(abs(a - b) for a, b in zip(predicted, levels))
+        self.last_error = error
+        self.mean_error = (
+            error if self.mean_error is None
+            else self.mean_error + ERROR_SMOOTHING * (error - self.mean_error)
+        )
+        if error <= self.tolerance:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if curve.sample(minute) is not None:
+                # The same minute of the program now gives different levels,
+                # so the profile was edited on the controller
+                _LOGGER.debug("Profile %s no longer matches what was learned, relearning it", profile)
+                curve = self._curves[profile] = ProfileCurve(profile, curve.times)
+        curve.learn(minute, levels)
+        return error
+
+    def as_dict(self):
+        """Return the statistics and learned coverage as plain values."""
+        return {
+            "tolerance": self.tolerance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "last_error": self.last_error,
+            "mean_error": None if self.mean_error is None else round(self.mean_error, 2),
+            "profiles": {
+                name: {"samples": len(curve), "times": list(curve.times)}
+                for name, curve in self._curves.items()
+            },
+        }
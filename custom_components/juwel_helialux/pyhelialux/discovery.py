@@ -0,0 +1,155 @@
+"""Find HeliaLux controllers on the local network.
+
+``scan`` probes every host of an address range for ``devvars.js``, with a
+bounded number of probes in flight and a short deadline per host, so a /24
+takes a few seconds even though most addresses never answer. A host counts
+as a controller when its devvars.js has the ``info`` array the integration
+reads device information from (``Controller.parse_devvars``): type,
+hardware and firmware version, IP address and MAC address.
+
+Probes are quiet on purpose: almost every address in the range is something
+else or nothing at all, so failures are not logged.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import re
+import time
+from dataclasses import dataclass
+
+import aiohttp
+
+from .jsvars import parse_js_vars
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 64  # probes in flight at once
+# Per-host deadline; controllers answer within milliseconds on a LAN
+DEFAULT_HOST_TIMEOUT = aiohttp.ClientTimeout(total=1.5, connect=0.75)
+MAX_HOSTS = 4096  # refuse ranges larger than a /20
+MAX_BODY = 4096  # bytes read from each devvars.js
+MAC_ADDRESS = re.compile(r"^[0-9A-Fa-f]{2}([:-][0-9A-Fa-f]{2}){5}$")
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredController:
+    """A controller found by ``scan``."""
+
+    host: str  # address, with ":port" if scanned on a non-standard port
+    device_type: str
+    hardware_version: str
+    firmware_version: str
+    mac_address: str  # lower case, colon separated
+
+    @property
+    def name(self):
+        """Return a default tank name for the controller."""
+        return f"{self.device_type} {self.host}"
+
+
+def normalize_mac(mac):
+    """Return a MAC address in lower case with colons."""
+    return mac.replace("-", ":").lower()
+
+
+def identify(host, text):
+    """Return a DiscoveredController if ``text`` is a HeliaLux devvars.js, else None."""
+    info = parse_js_vars(text, []).get("info")
+    if not isinstance(info, list) or len(info) < 5:
+        return None
+    info = [str(item).strip() for item in info]
+    if not MAC_ADDRESS.match(info[4]):
+        return None
+    return DiscoveredController(
+        host=host,
+        device_type=info[0],
+        hardware_version=info[1].lstrip("V"),
+        firmware_version=info[2].lstrip("V"),
+        mac_address=normalize_mac(info[4]),
+    )
+
+
+def hosts_in(network):
+    """Return the host addresses of a CIDR range such as "192.168.1.0/24".
+
+    Raises ValueError for an invalid range or one with more than MAX_HOSTS hosts.
+    """
+    network = ipaddress.ip_network(network, strict=False)
+    if network.num_addresses > MAX_HOSTS + 2:
+        raise ValueError(f"{network} has more than {MAX_HOSTS} hosts")
+    if network.num_addresses == 1:
+        return [str(network.network_address)]
+    return [str(address) for address in network.hosts()]
+
+
+async def _probe(session, host, port, protocol, timeout):
+    authority = f"{host}:{port}" if port else host
+    try:
+        async with session.get(
+            f"{protocol}://{authority}/devvars.js", timeout=timeout, allow_redirects=False
+        ) as response:
+            if response.status != 200:
+                return None
+            body = await response.content.read(MAX_BODY)
+    except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError):
+        return None
+    return identify(authority, body.decode("utf-8", "replace"))
+
+
+async def scan(
+    network,
+    session=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    timeout=DEFAULT_HOST_TIMEOUT,
+    port=None,
+    protocol="http",
+):
+    """Probe every host of ``network`` and return the controllers found.
+
+    ``network`` is a CIDR range or a list of hosts. ``port`` is only needed
+    for controllers on a non-standard port. A controller answering on more
+    than one address is returned once, under the first address probed.
+    """
+    hosts = hosts_in(network) if isinstance(network, str) else list(network)
+    own_session = session is None
+    if own_session:
+        # One connection per probe, never reused: each host is asked only once
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency, force_close=True)
+        )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host):
+        async with semaphore:
+            return await _probe(session, host, port, protocol, timeout)
+
+    started = time.monotonic()
+    try:
+        results = await asyncio.gather(*(probe(host) for host in hosts))
+    finally:
+        if own_session:
+            await session.close()
+
+    found = {}
+    # gather keeps the order of hosts, so the first address of each controller wins
+    for controller in results:
+        if controller is not None and controller.mac_address not in found:
+            found[controller.mac_address] = controller
+    _LOGGER.debug(
+        "Scanned %s hosts in %.1fs, found %s controller(s)",
+        len(hosts), time.monotonic() - started, len(found),
+    )
+    return list(found.values())
+
+
+async def identify_host(host, protocol="http", session=None, timeout=DEFAULT_HOST_TIMEOUT):
+    """Probe a single ``host`` (with ":port" if needed); return a DiscoveredController or None."""
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(force_close=True))
+    try:
+        return await _probe(session, host, None, protocol, timeout)
+    finally:
+        if own_session:
+            await session.close()
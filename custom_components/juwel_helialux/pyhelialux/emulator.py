@@ -0,0 +1,390 @@
+"""Local stand-in for a HeliaLux SmartControl, for tests and benchmarks.
+
+The emulator serves the same JavaScript variable files as the controller's
+embedded web server and accepts the same commands, keeping enough state for
+the integration to behave as it would against real hardware: profiles with
+day curves, manual colour and daytime simulations that run for a duration,
+and a device clock. Latency, jitter, error responses and dropped connections
+can be injected to measure and exercise the client under bad conditions.
+
+In tests, use it as an async context manager and point a Controller at
+``emulator.url``. It can also be run on its own with::
+
+    python -m pyhelialux.emulator --port 8080 --latency 0.05 --drop-rate 0.1
+
+with pyhelialux importable (custom_components/juwel_helialux appended to the
+Python path, so the integration's select.py doesn't shadow the standard
+library module).
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+from .models import format_minutes
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 1440
+
+
+@dataclass
+class EmulatedProfile:
+    """A light program: channel levels (white, blue, green, red) at minutes of the day.
+
+    Levels between two points are interpolated linearly, wrapping around
+    midnight like the controller does.
+    """
+
+    name: str
+    points: list = field(default_factory=list)  # [(minute, (w, b, g, r)), ...]
+
+    def levels_at(self, minute):
+        """Return the channel levels at a minute of the day."""
+        if not self.points:
+            return (0, 0, 0, 0)
+        points = sorted(self.points)
+        minute %= MINUTES_PER_DAY
+        before = points[-1]
+        for point in points:
+            if point[0] > minute:
+                after = point
+                break
+            before = point
+        else:
+            after = points[0]
+        start, low = before
+        end, high = after
+        span = (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+        progress = ((minute - start) % MINUTES_PER_DAY) / span
+        return tuple(round(a + (b - a) * progress) for a, b in zip(low, high))
+
+
+def default_profiles():
+    """Return a set of realistic profiles."""
+    return [
+        EmulatedProfile("Standard", [
+            (0, (0, 5, 0, 0)),
+            (540, (0, 5, 0, 0)),
+            (600, (80, 70, 60, 50)),
+            (1140, (80, 70, 60, 50)),
+            (1200, (0, 5, 0, 0)),
+        ]),
+        EmulatedProfile("Plants", [
+            (0, (0, 0, 0, 0)),
+            (480, (0, 0, 0, 0)),
+            (540, (100, 60, 80, 90)),
+            (1200, (100, 60, 80, 90)),
+            (1260, (0, 0, 0, 0)),
+        ]),
+        EmulatedProfile("Night", [(0, (0, 10, 0, 0))]),
+        EmulatedProfile("Holiday", [
+            (0, (0, 0, 0, 0)),
+            (600, (0, 0, 0, 0)),
+            (660, (50, 40, 30, 30)),
+            (1080, (50, 40, 30, 30)),
+            (1140, (0, 0, 0, 0)),
+        ]),
+    ]
+
+
+def _parse_duration(value, default=60):
+    """Parse an HH:MM duration into minutes."""
+    try:
+        hours, _, minutes = str(value).partition(":")
+        return int(hours) * 60 + int(minutes or 0)
+    except ValueError:
+        return default
+
+
+def _js_value(value):
+    if isinstance(value, str):
+        return "'%s'" % value.replace("\\", "\\\\").replace("'", "\\'")
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], str):
+            return "[%s]" % ",".join('"%s"' % item.replace('"', '\\"') for item in value)
+        return "[%s]" % ",".join(str(int(item)) for item in value)
+    return str(int(value))
+
+
+def _js_vars(**values):
+    return "".join(f"{name}={_js_value(value)};" for name, value in values.items())
+
+
+class HelialuxEmulator:
+    """aiohttp server that behaves like a HeliaLux SmartControl.
+
+    Fault injection (all can be changed while running):
+
+    * ``latency`` seconds added to every response, plus up to ``jitter`` more;
+    * ``error_rate``: fraction of requests answered with HTTP 500;
+    * ``drop_rate``: fraction of connections closed without a response;
+    * ``offline``: drop every connection, like a controller that is switched off.
+
+    ``time_scale`` speeds up the device clock, e.g. 60 runs a device minute
+    per real second. Simulation durations are measured on the device clock.
+    """
+
+    def __init__(
+        self,
+        profiles=None,
+        lamp="4Ch",
+        info=("HeliaLux SmartControl", "V2.0", "V2.2.2", "192.168.1.50", "A0:B1:C2:D3:E4:F5"),
+        start_minutes=None,
+        time_scale=1.0,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        drop_rate=0.0,
+        seed=None,
+        clock=time.monotonic,
+    ):
+        self.profiles = list(profiles) if profiles is not None else default_profiles()
+        self.lamp = lamp
+        self.info = list(info)
+        self.time_scale = time_scale
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.offline = False
+        self._random = random.Random(seed)
+        self._clock = clock
+        self._epoch = clock()
+        if start_minutes is None:
+            now = time.localtime()
+            start_minutes = now.tm_hour * 60 + now.tm_min
+        self._start_minutes = start_minutes
+
+        self.profile_index = 0
+        # Simulations end at a device clock reading, in minutes since start
+        self._color_until = None
+        self._color_levels = (0, 0, 0, 0)
+        self._daytime_until = None
+        self._daytime_position = 0
+
+        self.requests = {}  # path -> count
+        self.errors = 0
+        self.drops = 0
+
+        self._runner = None
+        self.url = None
+
+    # -- device state ---------------------------------------------------------
+
+    def _elapsed_minutes(self):
+        return (self._clock() - self._epoch) * self.time_scale / 60
+
+    @property
+    def device_minutes(self):
+        """Return the device clock as minutes since midnight."""
+        return int(self._start_minutes + self._elapsed_minutes()) % MINUTES_PER_DAY
+
+    @property
+    def color_simulation(self):
+        """Return True while a manual colour simulation is running."""
+        if self._color_until is not None and self._elapsed_minutes() >= self._color_until:
+            self._color_until = None
+        return self._color_until is not None
+
+    @property
+    def daytime_simulation(self):
+        """Return True while a manual daytime simulation is running."""
+        if self._daytime_until is not None and self._elapsed_minutes() >= self._daytime_until:
+            self._daytime_until = None
+        return self._daytime_until is not None
+
+    @property
+    def profile(self):
+        return self.profiles[self.profile_index]
+
+    @property
+    def channels(self):
+        """Return the current (white, blue, green, red) levels."""
+        if self.color_simulation:
+            return self._color_levels
+        if self.daytime_simulation:
+            return self.profile.levels_at(self._daytime_position)
+        return self.profile.levels_at(self.device_minutes)
+
+    def statusvars(self):
+        daytime = self.daytime_simulation
+        return _js_vars(
+            lang=0,
+            lamp=self.lamp,
+            profNum=self.profile_index + 1,
+            profile=self.profile.name,
+            tsimtime=self._daytime_position if daytime else self.device_minutes,
+            tsimact=int(daytime),
+            csimact=int(self.color_simulation),
+            brightness=self.channels,
+            times=[minute for minute, _ in sorted(self.profile.points)],
+        )
+
+    def wpvars(self):
+        return _js_vars(
+            profnum=len(self.profiles),
+            profnames=[profile.name for profile in self.profiles],
+            profsel=[int(i == self.profile_index) for i in range(len(self.profiles))],
+            weekprof=[self.profile_index] * 7,
+        )
+
+    def devvars(self):
+        return _js_vars(info=self.info)
+
+    def _find_profile(self, value):
+        """Resolve "P2 | Plants", "Plants" or "2" to a profile index."""
+        value = str(value).strip()
+        prefix, sep, name = value.partition(" | ")
+        if sep and prefix[:1] == "P" and prefix[1:].isdigit():
+            value = name
+        for index, profile in enumerate(self.profiles):
+            if profile.name == value:
+                return index
+        if value.isdigit() and 0 < int(value) <= len(self.profiles):
+            return int(value) - 1
+        return None
+
+    def _stat(self, form):
+        action = form.get("action")
+        now = self._elapsed_minutes()
+        if action == "14":
+            if form.get("cswi") == "true":
+                if not self.color_simulation:
+                    self._color_levels = self.channels
+                self._color_until = now + _parse_duration(form.get("ctime"))
+                self._daytime_until = None
+            else:
+                self._color_until = None
+        elif action == "10":
+            levels = [form.get(f"ch{i}") for i in range(1, 5)]
+            if all(level is not None for level in levels):
+                if not self.color_simulation:
+                    return False  # Colours only apply while colour simulation runs
+                self._color_levels = tuple(min(100, max(0, int(level))) for level in levels)
+        elif action == "12":
+            if form.get("tswi") == "true":
+                self._daytime_position = int(form.get("ch5", self.device_minutes)) % MINUTES_PER_DAY
+                self._daytime_until = now + _parse_duration(form.get("ttime"))
+                self._color_until = None
+            else:
+                self._daytime_until = None
+            if form.get("cswi") == "false":
+                self._color_until = None
+        else:
+            return False
+        return True
+
+    # -- HTTP -----------------------------------------------------------------
+
+    @web.middleware
+    async def _faults(self, request, handler):
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        delay = self.latency + self._random.uniform(0, self.jitter) if self.jitter else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+        if self.offline or (self.drop_rate and self._random.random() < self.drop_rate):
+            self.drops += 1
+            request.transport.close()
+            return web.Response()
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=500, text="Internal Server Error")
+        return await handler(request)
+
+    async def _handle_js(self, request):
+        body = {
+            "statusvars.js": self.statusvars,
+            "wpvars.js": self.wpvars,
+            "devvars.js": self.devvars,
+        }[request.match_info["name"]]()
+        return web.Response(text=body, content_type="application/javascript")
+
+    async def _handle_stat(self, request):
+        form = await request.post()
+        if not self._stat(form):
+            return web.Response(status=400, text="Bad Request")
+        return web.Response(text="OK")
+
+    async def _handle_week(self, request):
+        form = await request.post()
+        index = self._find_profile(form.get("s0", ""))
+        if form.get("key") != "BU" or index is None:
+            return web.Response(status=400, text="Bad Request")
+        self.profile_index = index
+        return web.Response(text="OK")
+
+    def make_app(self):
+        """Return the aiohttp application serving the controller's endpoints."""
+        app = web.Application(middlewares=[self._faults])
+        app.router.add_get("/{name:(statusvars|wpvars|devvars)\\.js}", self._handle_js)
+        app.router.add_post("/stat", self._handle_stat)
+        app.router.add_post("/week.html", self._handle_week)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start serving and return the base URL; port 0 picks a free port."""
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}"
+        _LOGGER.debug("HeliaLux emulator listening on %s", self.url)
+        return self.url
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+
+async def _serve(args):
+    emulator = HelialuxEmulator(
+        time_scale=args.time_scale,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    url = await emulator.start(args.host, args.port)
+    print(f"Emulating a HeliaLux controller on {url} (device time {format_minutes(emulator.device_minutes)})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await emulator.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local HeliaLux controller emulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="device clock speed-up")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered with HTTP 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of connections dropped")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
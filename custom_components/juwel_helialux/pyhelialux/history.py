@@ -0,0 +1,174 @@
+"""Channel levels of the last 24 hours and the daily figures derived from them.
+
+The levels are kept one slot per minute in a ring of 1440 slots, four bytes
+each (white, blue, green, red on the 0-100 scale), so a whole day takes
+under 6 KiB however often the controller is polled. A minute with no poll
+takes the levels of the last one, which is what the controller showed until
+the next poll told otherwise; minutes while the controller was unreachable
+or Home Assistant wasn't running are marked as having no data.
+
+The rolling figures are updated as each minute enters and leaves the ring
+rather than recomputed over it, so recording a sample costs the same
+whatever the window holds:
+
+* photoperiod - minutes in which any channel was above ``moonlight_level``;
+* light integral - per channel, the sum of the levels, reported in %·h
+  (80% for ten hours is 800 %·h);
+* peak intensity - per channel, the highest level, kept with a count of
+  minutes per level so the peak can drop when its last minute leaves the
+  window without rescanning the day.
+"""
+
+import base64
+from array import array
+
+from .curve import CHANNEL_COUNT, MINUTES_PER_DAY
+
+NO_DATA = 255  # level stored in every channel of a minute without data
+MAX_LEVEL = 100
+# Highest level that still counts as lights off (moonlight)
+MOONLIGHT_LEVEL = 10
+LEVELS = MAX_LEVEL + 1
+_EMPTY_SLOT = array("B", [NO_DATA] * CHANNEL_COUNT)
+
+
+class ChannelHistory:
+    """Ring of per-minute channel levels over the last day, with rolling figures.
+
+    Minutes are absolute (minutes since the Unix epoch), so the ring stays
+    right across restarts. Call ``record`` with every new state; samples
+    within the same minute replace each other.
+    """
+
+    def __init__(self, moonlight_level=MOONLIGHT_LEVEL):
+        self.moonlight_level = moonlight_level
+        self._levels = array("B", [NO_DATA] * (MINUTES_PER_DAY * CHANNEL_COUNT))
+        # Minutes at each level per channel, channel-major, for the peaks
+        self._counts = array("H", bytes(2 * LEVELS * CHANNEL_COUNT))
+        self._sums = array("L", [0] * CHANNEL_COUNT)
+        self._peaks = array("B", [0] * CHANNEL_COUNT)
+        self.lit_minutes = 0
+        self.covered_minutes = 0
+        self.minute = None  # newest minute recorded
+        self._held = None  # levels assumed until the next sample, None if unknown
+
+    def clear(self):
+        """Forget all recorded minutes."""
+        self._levels[:] = array("B", [NO_DATA] * len(self._levels))
+        self._counts[:] = array("H", bytes(len(self._counts) * 2))
+        self._sums[:] = array("L", [0] * CHANNEL_COUNT)
+        self._peaks[:] = array("B", [0] * CHANNEL_COUNT)
+        self.lit_minutes = 0
+        self.covered_minutes = 0
+
+    def _remove(self, slot):
+        """Take a minute out of the window."""
+        offset = slot * CHANNEL_COUNT
+        if self._levels[offset] == NO_DATA:
+            return
+        levels = self._levels[offset:offset + CHANNEL_COUNT]
+        self.covered_minutes -= 1
+        self.lit_minutes -= max(levels) > self.moonlight_level
+        for channel, level in enumerate(levels):
+            self._sums[channel] -= level
+            index = channel * LEVELS + level
+            self._counts[index] -= 1
+            if level == self._peaks[channel] and not self._counts[index]:
+                # At most LEVELS steps down, whatever the size of the window
+                while level and not self._counts[channel * LEVELS + level]:
+                    level -= 1
+                self._peaks[channel] = level
+        self._levels[offset:offset + CHANNEL_COUNT] = _EMPTY_SLOT
+
+    def _add(self, slot, levels):
+        """Put a minute into the (emptied) slot."""
+        if levels is None:
+            return
+        self._levels[slot * CHANNEL_COUNT:(slot + 1) * CHANNEL_COUNT] = array("B", levels)
+        self.covered_minutes += 1
+        self.lit_minutes += max(levels) > self.moonlight_level
+        for channel, level in enumerate(levels):
+            self._sums[channel] += level
+            self._counts[channel * LEVELS + level] += 1
+            if level > self._peaks[channel]:
+                self._peaks[channel] = level
+
+    def record(self, minute, levels):
+        """Record the levels at ``minute``; ``levels`` is None while they are unknown.
+
+        The minutes since the previous sample take that sample's levels.
+        Samples older than the newest minute are ignored.
+        """
+        if levels is not None:
+            levels = tuple(min(MAX_LEVEL, max(0, int(level))) for level in levels)
+        if self.minute is not None and minute < self.minute:
+            return
+        if self.minute is None or minute - self.minute >= MINUTES_PER_DAY:
+            # Nothing in the window is recent enough to keep
+            if self.covered_minutes:
+                self.clear()
+        else:
+            for passed in range(self.minute + 1, minute):
+                slot = passed % MINUTES_PER_DAY
+                self._remove(slot)
+                self._add(slot, self._held)
+        slot = minute % MINUTES_PER_DAY
+        self._remove(slot)
+        self._add(slot, levels)
+        self.minute = minute
+        self._held = levels
+
+    @property
+    def photoperiod(self):
+        """Return the hours with the lights on over the last day."""
+        return self.lit_minutes / 60
+
+    @property
+    def covered(self):
+        """Return the hours of the last day there is data for."""
+        return self.covered_minutes / 60
+
+    def light_integral(self, channel):
+        """Return a channel's light integral over the last day, in %·h."""
+        return self._sums[channel] / 60
+
+    def peak(self, channel):
+        """Return a channel's highest level over the last day."""
+        return self._peaks[channel]
+
+    @property
+    def figures(self):
+        """Return all rolling figures as one tuple, cheap to compare for changes."""
+        return (self.lit_minutes, self.covered_minutes, *self._sums, *self._peaks)
+
+    def dump(self):
+        """Return the ring as JSON-friendly data for storage."""
+        return {
+            "minute": self.minute,
+            "levels": base64.b64encode(self._levels.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def restore(cls, data, moonlight_level=MOONLIGHT_LEVEL):
+        """Rebuild a history from ``dump()`` output; the rolling figures are recounted."""
+        history = cls(moonlight_level)
+        levels = array("B", base64.b64decode(data["levels"]))
+        if data.get("minute") is None or len(levels) != len(history._levels):
+            return history
+        for slot in range(MINUTES_PER_DAY):
+            sample = levels[slot * CHANNEL_COUNT:(slot + 1) * CHANNEL_COUNT]
+            if sample[0] != NO_DATA:
+                history._add(slot, tuple(sample))
+        # What the lights did while nobody was watching is unknown
+        history.minute = data["minute"]
+        return history
+
+    def as_dict(self):
+        """Return the rolling figures as plain values."""
+        return {
+            "minute": self.minute,
+            "covered_hours": round(self.covered, 2),
+            "photoperiod_hours": round(self.photoperiod, 2),
+            "light_integral": [round(self.light_integral(channel), 1) for channel in range(CHANNEL_COUNT)],
+            "peak": list(self._peaks),
+        }
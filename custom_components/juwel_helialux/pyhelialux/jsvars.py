@@ -0,0 +1,324 @@
+"""Single-pass tokenizer for the controller's JavaScript variable files.
+
+statusvars.js, wpvars.js and devvars.js are flat lists of assignments such as
+``lamp='4Ch';brightness=[10,20,30,40];profnames=["Day","Night"];``. Values are
+integers, single or double quoted strings, or lists of either. The tokenizer
+walks the raw bytes once, front to back, without regular expressions or
+backtracking. Scanning leans on bytes.find/split/translate so most of the
+per-character work happens in C; positions are only used to report errors.
+
+Almost every statement the controller sends is plain: an unsigned integer, a
+string without escapes, or a list of only one or the other, with no
+whitespace and no ``;`` inside. The decoded file is split on ``;`` and those
+are read straight from their piece by ``_plain``, with a few str methods
+each. Any other statement goes to the tokenizer proper, starting at the
+statement, so ``;`` in strings, escapes and whitespace are read correctly and
+errors keep their byte positions; pieces it has read past are skipped.
+Files that aren't valid UTF-8 are tokenized throughout, since their strings
+are decoded one at a time.
+"""
+
+_WHITESPACE = b" \t\r\n"
+_NAME_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$"
+_ESCAPES = {ord("n"): "\n", ord("t"): "\t", ord("r"): "\r"}
+
+_SEMICOLON = ord(";")
+_COMMA = ord(",")
+_OPEN_BRACKET = ord("[")
+_CLOSE_BRACKET = ord("]")
+_BACKSLASH = ord("\\")
+_SINGLE_QUOTE = ord("'")
+_DOUBLE_QUOTE = ord('"')
+
+
+class JSVarsError(ValueError):
+    """Raised for malformed input; ``position`` is the byte offset of the problem."""
+
+    def __init__(self, message, position):
+        super().__init__(f"{message} at position {position}")
+        self.message = message
+        self.position = position
+
+
+def _decode(raw):
+    """Decode a string value; the controller isn't consistent about UTF-8."""
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def _skip_whitespace(data, pos, end):
+    while pos < end and data[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _name(data, pos, equals):
+    """Return the name in ``data[pos:equals]``, allowing whitespace and a ``var`` prefix."""
+    name = data[pos:equals].strip()
+    if name.translate(None, _NAME_CHARS):
+        words = name.split()
+        if len(words) == 2 and words[0] == b"var" and not words[1].translate(None, _NAME_CHARS):
+            name = words[1]
+        elif len(words) > 1:
+            raise JSVarsError(
+                f"Expected '=' after {words[0].decode('ascii', 'replace')!r}", pos + len(words[0])
+            )
+        else:
+            raise JSVarsError(f"Invalid variable name {name.decode('ascii', 'replace')!r}", pos)
+    elif not name:
+        raise JSVarsError("Expected a variable name", pos)
+    return name.decode("ascii")
+
+
+def _string(data, pos, end):
+    """Read a quoted string starting at the opening quote."""
+    quote = data[pos]
+    start = pos + 1
+    close = data.find(quote, start)
+    if close == -1:
+        raise JSVarsError("Unterminated string", pos)
+    if data.find(_BACKSLASH, start, close) == -1:
+        # Fast path: no escapes, so the value is a plain slice
+        return _decode(data[start:close]), close + 1
+
+    out = bytearray()
+    i = start
+    while i < end:
+        char = data[i]
+        if char == quote:
+            return _decode(bytes(out)), i + 1
+        if char == _BACKSLASH:
+            i += 1
+            if i >= end:
+                break
+            escaped = _ESCAPES.get(data[i])
+            if escaped is None:
+                out.append(data[i])
+            else:
+                out += escaped.encode("ascii")
+        else:
+            out.append(char)
+        i += 1
+    raise JSVarsError("Unterminated string", pos)
+
+
+def _integer(data, pos, stop):
+    """Read an integer occupying data[pos:stop]."""
+    try:
+        return int(data[pos:stop])
+    except ValueError:
+        raise JSVarsError("Expected an integer", pos) from None
+
+
+def _list(data, pos, end):
+    """Read a list of ints and/or strings starting at the opening bracket."""
+    close = data.find(b"]", pos)
+    if close != -1:
+        inner = data[pos + 1:close]
+        if b"'" not in inner and b'"' not in inner:
+            # No strings inside, so this is an int list and can be split in one go
+            if not inner.strip():
+                return [], close + 1
+            try:
+                return [int(item) for item in inner.split(b",")], close + 1
+            except ValueError:
+                pass  # The item-by-item walk below reports the exact position
+
+    items = []
+    pos += 1
+    while True:
+        if pos < end and data[pos] in _WHITESPACE:
+            pos = _skip_whitespace(data, pos, end)
+        if pos >= end:
+            raise JSVarsError("Unterminated list", pos)
+        char = data[pos]
+        if char == _SINGLE_QUOTE or char == _DOUBLE_QUOTE:
+            close = data.find(char, pos + 1)
+            if close != -1 and data.find(_BACKSLASH, pos + 1, close) == -1:
+                items.append(_decode(data[pos + 1:close]))
+                pos = close + 1
+            else:
+                item, pos = _string(data, pos, end)
+                items.append(item)
+        elif char == _CLOSE_BRACKET and not items:
+            return items, pos + 1
+        elif char == _COMMA or char == _CLOSE_BRACKET:
+            raise JSVarsError("Expected a list item", pos)
+        else:
+            item_end = data.find(b",", pos)
+            close = data.find(b"]", pos)
+            if item_end == -1 or (close != -1 and close < item_end):
+                item_end = end if close == -1 else close
+            items.append(_integer(data, pos, item_end))
+            pos = item_end
+
+        if pos < end and data[pos] in _WHITESPACE:
+            pos = _skip_whitespace(data, pos, end)
+        if pos >= end:
+            raise JSVarsError("Unterminated list", pos)
+        char = data[pos]
+        if char == _COMMA:
+            pos += 1
+        elif char == _CLOSE_BRACKET:
+            return items, pos + 1
+        else:
+            raise JSVarsError("Expected ',' or ']' in list", pos)
+
+
+def _assignment(data, pos, end):
+    """Read one ``name=value;`` and return name, value and the next position."""
+    equals = data.find(b"=", pos)
+    if equals == -1:
+        raise JSVarsError("Expected '='", end)
+    name = data[pos:equals]
+    if name.isalnum():
+        name = name.decode("ascii")
+    else:
+        # Names with '_' or '$', surrounding whitespace or a "var " prefix
+        name = _name(data, pos, equals)
+    pos = equals + 1
+    if pos < end and data[pos] in _WHITESPACE:
+        pos = _skip_whitespace(data, pos, end)
+    if pos >= end:
+        raise JSVarsError("Expected a value", pos)
+
+    char = data[pos]
+    if char == _OPEN_BRACKET:
+        value, pos = _list(data, pos, end)
+    elif char == _SINGLE_QUOTE or char == _DOUBLE_QUOTE:
+        value, pos = _string(data, pos, end)
+    elif char == _SEMICOLON:
+        raise JSVarsError("Expected a value", pos)
+    else:
+        # Integers run up to the terminating ';' (or the end of the file)
+        stop = data.find(b";", pos)
+        if stop == -1:
+            stop = end
+        try:
+            return name, int(data[pos:stop]), stop + 1
+        except ValueError:
+            raise JSVarsError("Expected an integer", pos) from None
+
+    if pos < end:
+        char = data[pos]
+        if char == _SEMICOLON:
+            return name, value, pos + 1
+        if char in _WHITESPACE:
+            pos = _skip_whitespace(data, pos, end)
+            if pos < end:
+                if data[pos] != _SEMICOLON:
+                    raise JSVarsError(f"Expected ';' after {name!r}", pos)
+                pos += 1
+        else:
+            raise JSVarsError(f"Expected ';' after {name!r}", pos)
+    return name, value, pos
+
+
+def _plain(value):
+    """Return the value of a plain statement from its ``value`` text, or raise ValueError.
+
+    Plain values are unsigned integers, strings without escapes, and lists of
+    only one or the other with no whitespace. ValueError only means the
+    statement needs the tokenizer; it may well be valid.
+    """
+    first = value[0]
+    last = value[-1]
+    if first == "[" and last == "]":
+        inner = value[1:-1]
+        if not inner:
+            return []
+        quote = inner[0]
+        if quote == "'" or quote == '"':
+            items = inner[1:-1].split(quote + "," + quote)
+            if (
+                inner[-1] != quote
+                or len(inner) < 2
+                or inner.count(quote) != 2 * len(items)
+                or "\\" in inner
+            ):
+                raise ValueError
+            return items
+        if "'" in inner or '"' in inner or not inner.isascii():
+            raise ValueError
+        return [int(item) for item in inner.split(",")]
+    if (
+        (first == "'" or first == '"')
+        and last == first
+        and value.count(first) == 2
+        and "\\" not in value
+    ):
+        return value[1:-1]
+    raise ValueError
+
+
+def _statement(data, pos, end, output, errors):
+    """Tokenize the statement at ``pos`` into ``output``; return where the next one starts."""
+    pos = _skip_whitespace(data, pos, end)
+    if pos >= end:
+        return end
+    try:
+        name, value, pos = _assignment(data, pos, end)
+    except JSVarsError as err:
+        if errors is None:
+            raise
+        errors.append(err)
+        pos = data.find(b";", err.position)
+        return end if pos == -1 else pos + 1
+    output[name] = value
+    return pos
+
+
+def parse_js_vars(data, errors=None):
+    """Parse a JavaScript variable file into a dict of name -> value.
+
+    ``data`` may be bytes or str. Malformed input raises JSVarsError, unless an
+    ``errors`` list is passed, in which case each bad assignment is recorded
+    there and skipped up to the next ``;``.
+    """
+    output = {}
+    if isinstance(data, str):
+        text = data
+        data = None
+    else:
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            # Strings need decoding one by one (some as latin-1), so no fast path
+            pos, end = 0, len(data)
+            while pos < end:
+                pos = _statement(data, pos, end, output, errors)
+            return output
+
+    start = 0  # of the current statement, in characters
+    resume = 0  # where the tokenizer stopped; statements before it are done
+    mark = (0, 0)  # a known (character, byte) offset pair, for non-ASCII files
+    for statement in text.split(";"):
+        pos = start
+        start += len(statement) + 1
+        if pos < resume:
+            continue  # inside a string the tokenizer read past this ';'
+        name, _, value = statement.partition("=")
+        if value and name.isalnum() and name.isascii():
+            if value.isdigit() and value.isascii():
+                output[name] = int(value)
+                continue
+            try:
+                output[name] = _plain(value)
+                continue
+            except ValueError:
+                pass
+
+        # Not plain: tokenize this statement, which works on the bytes
+        if data is None:
+            data = text.encode("utf-8")
+        if len(data) == len(text):
+            resume = _statement(data, pos, len(data), output, errors)
+        else:
+            # Convert from the last known offset, so the file is still only walked once
+            offset = mark[1] + len(text[mark[0]:pos].encode("utf-8"))
+            stop = _statement(data, offset, len(data), output, errors)
+            resume = pos + len(data[offset:stop].decode("utf-8"))
+            mark = (resume, stop)
+    return output
@@ -0,0 +1,44 @@
+"""Cap on concurrent requests shared by several HeliaLux controllers."""
+
+import asyncio
+import time
+
+DEFAULT_MAX_CONCURRENT = 4
+
+
+class RequestLimiter:
+    """Async context manager allowing at most ``limit`` requests in flight.
+
+    Pass one instance to every Controller that should share the cap. Besides
+    limiting, it keeps the numbers needed to see whether the cap is too tight:
+    how many requests are waiting right now, the most that ever waited or
+    ran at once, and the longest any request had to wait for its turn.
+    """
+
+    def __init__(self, limit=DEFAULT_MAX_CONCURRENT):
+        self.limit = max(1, limit)
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_waiting = 0
+        self.max_in_flight = 0
+        self.max_wait = 0.0
+        self.requests = 0
+
+    async def __aenter__(self):
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        start = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.max_wait = max(self.max_wait, time.monotonic() - start)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.requests += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._semaphore.release()
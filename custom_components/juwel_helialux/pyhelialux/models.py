@@ -0,0 +1,171 @@
+"""Typed results returned by the HeliaLux controller API."""
+
+from dataclasses import dataclass, field
+
+# Order of the channels in statusvars.js' brightness list and in HelialuxState.channels
+CHANNELS = ("white", "blue", "green", "red")
+WHITE, BLUE, GREEN, RED = range(4)
+
+
+def format_minutes(minutes):
+    """Return minutes since midnight as an HH:MM string."""
+    return "%02d:%02d" % divmod(int(minutes), 60)
+
+
+def to_ha_scale(value):
+    """Convert a 0-100 channel value to Home Assistant's 0-255 scale."""
+    return int(value * 2.55)
+
+
+@dataclass(frozen=True, slots=True)
+class HelialuxSnapshot:
+    """A single poll of statusvars.js and wpvars.js merged into one result.
+
+    ``status_ok`` and ``profiles_ok`` say which of the two files were fetched
+    and parsed successfully; fields belonging to a failed file keep their
+    defaults so callers can fall back to previously known values.
+    """
+
+    status_ok: bool = False
+    profiles_ok: bool = False
+    current_profile: str = "offline"
+    device_minutes: int = 0
+    white: int = 0
+    blue: int = 0
+    green: int = 0
+    red: int = 0
+    manual_color_simulation: bool = False
+    manual_daytime_simulation: bool = False
+    available_profiles: tuple = ()
+    full_profile_names: tuple = ()
+    profile_times: tuple = ()  # minutes where the active profile's curve bends
+    lamp: str = None  # lamp type, e.g. "4Ch"; None until statusvars.js was read
+
+    @property
+    def device_time(self):
+        """Return the device clock as HH:MM."""
+        return format_minutes(self.device_minutes)
+
+
+@dataclass(frozen=True, slots=True)
+class HelialuxState:
+    """Immutable view of one tank, built once per poll and shared by all entities.
+
+    Channel levels are kept in 4 bytes (white, blue, green, red on the
+    device's 0-100 scale), immutable like the rest of the state so no entity
+    can change what the others see. The values entities need on Home
+    Assistant's 0-255 scale are computed once here instead of in every
+    property call. ``online`` is True only if the latest statusvars.js poll
+    succeeded; the other fields may then still hold the last good values.
+    """
+
+    channels: bytes = bytes(4)
+    device_minutes: int = 0
+    current_profile: str = "offline"
+    color_simulation: bool = False
+    daytime_simulation: bool = False
+    available_profiles: tuple = ()
+    full_profile_names: tuple = ()
+    online: bool = False
+    # Derived values, filled in by __post_init__
+    is_on: bool = field(init=False, default=False)
+    rgbw_color: tuple = field(init=False, default=(0, 0, 0, 0))
+    brightness: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        white, blue, green, red = self.channels
+        is_on = any(self.channels)
+        object.__setattr__(self, "is_on", is_on)
+        # Home Assistant orders RGBW as red, green, blue, white
+        object.__setattr__(
+            self,
+            "rgbw_color",
+            (to_ha_scale(red), to_ha_scale(green), to_ha_scale(blue), to_ha_scale(white))
+            if is_on else (0, 0, 0, 0),
+        )
+        object.__setattr__(self, "brightness", to_ha_scale(max(self.channels)))
+
+    @classmethod
+    def from_snapshots(cls, status, profiles, online=True):
+        """Build the state from the last good status and profile snapshots.
+
+        ``online`` says whether the latest status poll succeeded.
+        """
+        fields = {"online": online and status is not None}
+        if status is not None:
+            levels = (status.white, status.blue, status.green, status.red)
+            fields.update(
+                channels=bytes(min(100, max(0, value)) for value in levels),
+                device_minutes=status.device_minutes,
+                current_profile=status.current_profile,
+                color_simulation=status.manual_color_simulation,
+                daytime_simulation=status.manual_daytime_simulation,
+            )
+        if profiles is not None:
+            fields.update(
+                available_profiles=profiles.available_profiles,
+                full_profile_names=profiles.full_profile_names,
+            )
+        return cls(**fields)
+
+    def changed_fields(self, previous):
+        """Return the names of the fields that differ from ``previous``.
+
+        Derived fields are left out, they change with ``channels``. When the
+        channels differ, the names of the individual channels that changed
+        ("white", "blue", ...) are included as well. With no previous state
+        every field counts as changed.
+        """
+        if previous is None:
+            return STATE_FIELDS | frozenset(CHANNELS)
+        changed = {name for name in STATE_FIELDS if getattr(self, name) != getattr(previous, name)}
+        if "channels" in changed:
+            changed.update(
+                name
+                for name, new, old in zip(CHANNELS, self.channels, previous.channels)
+                if new != old
+            )
+        return frozenset(changed)
+
+    @property
+    def white(self):
+        return self.channels[WHITE]
+
+    @property
+    def blue(self):
+        return self.channels[BLUE]
+
+    @property
+    def green(self):
+        return self.channels[GREEN]
+
+    @property
+    def red(self):
+        return self.channels[RED]
+
+    @property
+    def device_time(self):
+        """Return the device clock as HH:MM."""
+        return format_minutes(self.device_minutes)
+
+    def as_dict(self):
+        """Return the state using the attribute names exposed to Home Assistant."""
+        return {
+            "current_profile": self.current_profile,
+            "device_time": self.device_time,
+            "white": self.white,
+            "blue": self.blue,
+            "green": self.green,
+            "red": self.red,
+            "manualColorSimulationEnabled": "On" if self.color_simulation else "Off",
+            "manualDaytimeSimulationEnabled": "On" if self.daytime_simulation else "Off",
+            "available_profiles": list(self.available_profiles),
+            "full_profile_names": list(self.full_profile_names),
+        }
+
+
+# Fields compared by HelialuxState.changed_fields
+STATE_FIELDS = frozenset(
+    name for name in HelialuxState.__dataclass_fields__
+    if HelialuxState.__dataclass_fields__[name].init
+)
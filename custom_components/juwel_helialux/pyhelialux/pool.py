@@ -0,0 +1,101 @@
+"""Shared aiohttp session pool for HeliaLux controllers."""
+
+import asyncio
+import logging
+
+import aiohttp
+
+from .tracing import trace_config
+
+_LOGGER = logging.getLogger(__name__)
+
+# The controller's embedded web server copes badly with parallel connections,
+# so only a couple of keep-alive connections are opened per tank.
+LIMIT_TOTAL = 100
+LIMIT_PER_HOST = 2
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 30  # seconds
+
+
+class SessionPool:
+    """Reference-counted aiohttp session shared by all Controller instances.
+
+    The first controller to need a session creates it, every other controller
+    reuses the same keep-alive connector, and the session is closed again when
+    the last controller releases it.
+    """
+
+    def __init__(
+        self,
+        limit=LIMIT_TOTAL,
+        limit_per_host=LIMIT_PER_HOST,
+        dns_cache_ttl=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    ):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._dns_cache_ttl = dns_cache_ttl
+        self._keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._loop = None
+        self._users = 0
+
+    @property
+    def users(self):
+        """Return the number of controllers currently holding the session."""
+        return self._users
+
+    @property
+    def session(self):
+        """Return the current shared session, or None if it is not open."""
+        return self._session
+
+    def _create_session(self):
+        """Create the shared session and its connector."""
+        connector = aiohttp.TCPConnector(
+            limit=self._limit,
+            limit_per_host=self._limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self._dns_cache_ttl,
+            keepalive_timeout=self._keepalive_timeout,
+        )
+        _LOGGER.debug(
+            "Creating shared HeliaLux session (limit=%s, per host=%s)",
+            self._limit,
+            self._limit_per_host,
+        )
+        # Requests without a RequestTrace in trace_request_ctx pass through untouched
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config()])
+
+    def acquire(self):
+        """Take a reference to the shared session, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is not loop:
+            # A session is bound to the loop it was created on and can only be
+            # closed from there. Replacing it would leak its connections, so
+            # the controllers holding it have to be closed first.
+            raise RuntimeError(
+                f"Shared HeliaLux session is still held by {self._users} controller(s) "
+                "on another event loop"
+            )
+        if self._session is None or self._session.closed:
+            # Nobody holds the session, or it was closed behind our back
+            self._session = self._create_session()
+            self._loop = loop
+            self._users = 0
+        self._users += 1
+        return self._session
+
+    async def release(self):
+        """Drop a reference, closing the session when nobody uses it any more."""
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users == 0 and self._session is not None:
+            session, self._session = self._session, None
+            self._loop = None
+            _LOGGER.debug("Closing shared HeliaLux session")
+            await session.close()
+
+
+DEFAULT_POOL = SessionPool()
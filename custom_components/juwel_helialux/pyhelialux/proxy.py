@@ -0,0 +1,275 @@
+"""Caching proxy in front of one HeliaLux controller.
+
+The controller's embedded web server copes badly with several clients
+polling it, so when Home Assistant, Node-RED and Grafana all want the same
+tank they can share one proxy instead:
+
+* statusvars.js, wpvars.js and devvars.js are served from a cache, each
+  kept for its own time to live (the status changes every minute, the
+  device information practically never);
+* a request for a file that has expired joins the refresh already in
+  flight instead of starting another one, so any number of clients cause
+  at most one upstream request per file at a time;
+* POSTs to /stat and /week.html are forwarded one at a time, in the order
+  they arrived, and every write drops the cached status and profiles so
+  the next read shows its effect;
+* ``/proxy/metrics`` returns the hit ratio and upstream request rate as
+  JSON.
+
+The proxy serves the same paths as the controller, so a Controller (or the
+integration, with "host:port" of the proxy as the tank's host) uses it
+without any change. Run it with::
+
+    python -m pyhelialux.proxy --upstream http://192.168.1.50 --port 8081
+
+with pyhelialux importable (custom_components/juwel_helialux appended to the
+Python path, so the integration's select.py doesn't shadow the standard
+library module).
+"""
+
+import argparse
+import asyncio
+import collections
+import logging
+import time
+
+import aiohttp
+from aiohttp import web
+
+from .pool import LIMIT_PER_HOST
+from .pyHelialux import REQUEST_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds each file is served from the cache
+DEFAULT_TTLS = {
+    "statusvars.js": 5,
+    "wpvars.js": 60,
+    "devvars.js": 3600,
+}
+# Files whose content a write to /stat or /week.html can change
+INVALIDATED_BY_WRITES = ("statusvars.js", "wpvars.js")
+WRITE_PATHS = ("stat", "week.html")
+RATE_WINDOW = 60  # seconds; the upstream rate is the requests sent in the last minute
+METRICS_PATH = "/proxy/metrics"
+
+
+class _CachedFile:
+    __slots__ = ("body", "content_type", "expires")
+
+    def __init__(self, body, content_type, expires):
+        self.body = body
+        self.content_type = content_type
+        self.expires = expires
+
+
+class HelialuxProxy:
+    """aiohttp server caching one controller's variable files.
+
+    ``upstream`` is the controller's base URL, e.g. "http://192.168.1.50".
+    ``ttls`` overrides the seconds a file is cached for, by file name.
+    Counters are plain attributes; ``as_dict()`` returns them together with
+    the derived hit ratio and request rate.
+    """
+
+    def __init__(self, upstream, ttls=None, timeout=REQUEST_TIMEOUT, clock=time.monotonic):
+        self.upstream = upstream.rstrip("/")
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._timeout = timeout
+        self._clock = clock
+        self._cache = {}  # file name -> _CachedFile
+        self._refreshing = {}  # file name -> task fetching it upstream
+        self._write_lock = asyncio.Lock()
+        self._session = None
+        self._runner = None
+        self._upstream_times = collections.deque()
+        self.url = None
+
+        self.hits = 0
+        self.misses = 0  # requests that waited for an upstream fetch
+        self.coalesced = 0  # misses that joined a fetch already in flight
+        self.upstream_requests = 0
+        self.upstream_errors = 0
+        self.writes = 0
+        self.invalidations = 0
+
+    # -- upstream -------------------------------------------------------------
+
+    async def _forward(self, method, name, **kwargs):
+        """Send one request to the controller, returning (status, body, content type)."""
+        self.upstream_requests += 1
+        self._upstream_times.append(self._clock())
+        self._expire_upstream_times()
+        try:
+            async with self._session.request(
+                method, f"{self.upstream}/{name}", timeout=self._timeout, **kwargs
+            ) as response:
+                return response.status, await response.read(), response.content_type
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.upstream_errors += 1
+            _LOGGER.debug("Error forwarding %s /%s: %s", method, name, str(e) or type(e).__name__)
+            return None
+
+    async def _refresh(self, name):
+        """Fetch a file upstream and cache it if the controller answered."""
+        result = await self._forward("GET", name)
+        # Dropped by a write while in flight: the answer may predate the write
+        if self._refreshing.get(name) is asyncio.current_task():
+            del self._refreshing[name]
+            if result is not None and result[0] == 200:
+                self._cache[name] = _CachedFile(
+                    result[1], result[2], self._clock() + self.ttls[name]
+                )
+        return result
+
+    async def _read(self, name):
+        """Return (status, body, content type) for a file, from the cache if fresh."""
+        cached = self._cache.get(name)
+        if cached is not None and cached.expires > self._clock():
+            self.hits += 1
+            return 200, cached.body, cached.content_type
+
+        self.misses += 1
+        task = self._refreshing.get(name)
+        if task is None:
+            task = self._refreshing[name] = asyncio.ensure_future(self._refresh(name))
+        else:
+            self.coalesced += 1
+        # Shielded: a client hanging up mustn't cancel the fetch the others wait for
+        return await asyncio.shield(task)
+
+    def _expire_upstream_times(self):
+        cutoff = self._clock() - RATE_WINDOW
+        while self._upstream_times and self._upstream_times[0] < cutoff:
+            self._upstream_times.popleft()
+
+    def invalidate(self, names=INVALIDATED_BY_WRITES):
+        """Drop cached files, and forget fetches in flight so they aren't cached either."""
+        self.invalidations += 1
+        for name in names:
+            self._cache.pop(name, None)
+            self._refreshing.pop(name, None)
+
+    # -- HTTP -----------------------------------------------------------------
+
+    def _reply(self, result):
+        if result is None:
+            return web.Response(status=502, text="Bad Gateway")
+        status, body, content_type = result
+        return web.Response(status=status, body=body, content_type=content_type)
+
+    async def _handle_read(self, request):
+        return self._reply(await self._read(request.match_info["name"]))
+
+    async def _handle_write(self, request):
+        body = await request.read()
+        headers = {}
+        if "Content-Type" in request.headers:
+            headers["Content-Type"] = request.headers["Content-Type"]
+        async with self._write_lock:
+            self.writes += 1
+            result = await self._forward(
+                "POST", request.match_info["name"], data=body, headers=headers
+            )
+            # Also after a failed write: it may have reached the device anyway
+            self.invalidate()
+        return self._reply(result)
+
+    async def _handle_metrics(self, request):
+        return web.json_response(self.as_dict())
+
+    def as_dict(self):
+        """Return the proxy's counters, hit ratio and upstream request rate."""
+        reads = self.hits + self.misses
+        self._expire_upstream_times()
+        return {
+            "upstream": self.upstream,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hits / reads, 3) if reads else None,
+            "upstream_requests": self.upstream_requests,
+            "upstream_errors": self.upstream_errors,
+            "upstream_last_min": len(self._upstream_times),
+            "writes": self.writes,
+            "invalidations": self.invalidations,
+            "cached": sorted(name for name, cached in self._cache.items() if cached.expires > self._clock()),
+        }
+
+    def make_app(self):
+        """Return the aiohttp application serving the controller's paths."""
+        names = "|".join(name.replace(".", "\\.") for name in self.ttls)
+        writes = "|".join(name.replace(".", "\\.") for name in WRITE_PATHS)
+        app = web.Application()
+        app.router.add_get(METRICS_PATH, self._handle_metrics)
+        app.router.add_get(f"/{{name:({names})}}", self._handle_read)
+        app.router.add_post(f"/{{name:({writes})}}", self._handle_write)
+        return app
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start serving and return the base URL; port 0 picks a free port."""
+        # Never more connections to the controller than a Controller would open
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=LIMIT_PER_HOST)
+        )
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}"
+        _LOGGER.debug("HeliaLux proxy for %s listening on %s", self.upstream, self.url)
+        return self.url
+
+    async def stop(self):
+        """Stop serving and close the connections to the controller."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+
+async def _serve(args):
+    ttls = {"statusvars.js": args.status_ttl, "wpvars.js": args.profiles_ttl}
+    proxy = HelialuxProxy(args.upstream, ttls=ttls)
+    url = await proxy.start(args.host, args.port)
+    print(f"Proxying {proxy.upstream} on {url} (metrics on {url}{METRICS_PATH})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await proxy.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a caching proxy in front of a HeliaLux controller")
+    parser.add_argument("--upstream", required=True, help="controller URL, e.g. http://192.168.1.50")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument(
+        "--status-ttl", type=float, default=DEFAULT_TTLS["statusvars.js"],
+        help="seconds statusvars.js is cached",
+    )
+    parser.add_argument(
+        "--profiles-ttl", type=float, default=DEFAULT_TTLS["wpvars.js"],
+        help="seconds wpvars.js is cached",
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,89 @@
 
 import aiohttp
 import asyncio
+import contextlib
 import logging
-import re
+import time
+
+from .breaker import CLOSED, CircuitBreaker
+from .commands import DEFAULT_DEBOUNCE, CommandQueue
+from .jsvars import parse_js_vars
+from .models import HelialuxSnapshot
+from .pool import DEFAULT_POOL
+from .ramp import RampEngine
 
 _LOGGER = logging.getLogger(__name__)
 
-STATUS_VARS_REGEX = re.compile(
-    r"(?P<name>[a-zA-Z0-9]+)=((?P<number>\d+)|'(?P<string>[^']+)'|\[(?P<digit_list>(\d+,?)+)\]|\[(?P<string_list>(\"([^\"]+)\",?)+)\]);"
-)
+# Per-endpoint deadline used by get_snapshot so one slow file can't hold up the other
+SNAPSHOT_TIMEOUT = 10  # seconds
+# Deadline for a single request, shorter than SNAPSHOT_TIMEOUT so it fires first.
+# aiohttp's default of five minutes is far too long for a controller on the LAN
+# that is simply switched off.
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=4)
 
 class Controller:
     """Base Representation of a HeliaLux SmartController"""
 
-    def __init__(self, url):
+    def __init__(
+        self,
+        url,
+        session=None,
+        pool=None,
+        command_debounce=DEFAULT_DEBOUNCE,
+        breaker=None,
+        timeout=REQUEST_TIMEOUT,
+        limiter=None,
+        tracer=None,
+        recorder=None,
+        ramp=None,
+    ):
         self._url = url
-        self._session = None  # Initialize the session as None
+        self._timeout = timeout
+        # Optional RequestLimiter shared with other controllers to cap the
+        # number of requests in flight across all of them
+        self._limiter = limiter
+        # Optional RequestTracer timing every request per endpoint
+        self.tracer = tracer
+        # Optional ResponseRecorder keeping the last raw responses for diagnostics
+        self.recorder = recorder
+        # Every request goes through the breaker, so an unreachable controller
+        # fails fast instead of tying up polls and commands until they time out
+        self.breaker = breaker or CircuitBreaker()
+        # A session passed in by the caller is used as-is and never closed here,
+        # otherwise a reference to the shared pooled session is taken lazily.
+        self._external_session = session
+        self._pool = pool or DEFAULT_POOL
+        self._session = None
+        self.commands = CommandQueue(debounce=command_debounce)
+        # Fades are played frame by frame, each frame queued as a manual colour
+        self.ramp = ramp or RampEngine()
+        # Last known manual colour simulation state, None until known
+        self.color_simulation_active = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
     async def _get_session(self):
-        """Create or reuse an aiohttp session."""
+        """Return the caller's session or a reference to the shared pooled one."""
+        if self._external_session is not None:
+            return self._external_session
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = self._pool.acquire()
         return self._session
 
+    async def close(self):
+        """Drop queued commands and release the pooled session held by this controller."""
+        self.ramp.stop()
+        await self.commands.close()
+        if self._session is None:
+            return
+        self._session = None
+        await self._pool.release()
+
     def nr_mins_to_formatted(self,duration):
         """Take a duration in minutes, and return an HH:MM formatted string."""
         hours = int(duration / 60)
@@ -39,85 +100,154 @@ class Controller:
         return min(100, max(0, round(val)))  # If value is already in 0-100 range
 
     def parse_devvars(self,string):
-        try:
-            # Extract the 'info' array using regex
-            match = re.search(r"info\s*=\s*\[([^\]]+)\];", string)
-            if match:
-                # Extract and clean values inside brackets
-                info_str = match.group(1)
-                info = [item.strip().strip("'") for item in info_str.split(",")]
-                return {"info": info}
-            else:
-                _LOGGER.error("info array not found in devvars.js")
-                return {}
-        except Exception as e:
-            _LOGGER.error(f"Error parsing devvars.js: {e}")
+        """Extract the 'info' array from devvars.js."""
+        info = self.parse_status_vars(string, "devvars.js").get("info")
+        if not isinstance(info, list):
+            _LOGGER.error("info array not found in devvars.js")
             return {}
-        
-    def parse_status_vars(self,status_vars):
-        """Extract the variables and their values from a minimal javascript file."""
-        output = {}
-        for match in STATUS_VARS_REGEX.finditer(status_vars):
-            if match["number"] is not None:
-                value = int(match["number"])
-            elif match["string"] is not None:
-                value = match["string"]
-            elif match["digit_list"] is not None:
-                value = [int(x) for x in match["digit_list"].split(",")]
-            elif match["string_list"] is not None:
-                value = [x[1:-1] for x in match["string_list"].split(",")]  # strip the quotes
-            else:
-                assert False
+        return {"info": [str(item).strip() for item in info]}
 
-            output[match["name"]] = value
-        return output    
+    def parse_status_vars(self,status_vars, source="variables"):
+        """Extract the variables and their values from a minimal javascript file."""
+        errors = []
+        output = parse_js_vars(status_vars, errors)
+        for error in errors:
+            # Malformed assignments are skipped, the rest of the file is still used
+            _LOGGER.warning("Skipping malformed variable: %s", error)
+            if self.recorder is not None:
+                self.recorder.parse_error(source, error)
+        return output
+
+    async def _request(self, method, path, action, **kwargs):
+        """Send one request to the controller through the circuit breaker.
+
+        Returns the response body as bytes, or None if the request failed, was
+        answered with an error status or wasn't sent because the breaker is open.
+        """
+        if not self.breaker.allow():
+            _LOGGER.debug(
+                "Not trying to %s, controller unreachable (retry in %.0fs)",
+                action,
+                self.breaker.retry_in,
+            )
+            return None
 
-    async def _statusvars(self):
-        """Fetch statusvars.js asynchronously."""
         session = await self._get_session()
-        url = f"{self._url}/statusvars.js"
+        url = f"{self._url}/{path}"
+        sent = False
+        trace = None
         try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    _LOGGER.error(f"Failed to fetch statusvars.js: {response.status}")
-                    return None
+            async with self._limiter or contextlib.nullcontext():
+                sent = True
+                started = time.monotonic()
+                # Timed from here, so waiting for the limiter isn't blamed on the device
+                if self.tracer is not None:
+                    trace = self.tracer.start(f"/{path}", method)
+                    kwargs["trace_request_ctx"] = trace
+                async with session.request(method, url, timeout=self._timeout, **kwargs) as response:
+                    body = await response.read()
+                    status = response.status
+        except asyncio.CancelledError:
+            # Abandoned mid-flight, e.g. by get_snapshot's deadline; don't leave
+            # a half-open breaker waiting for a trial that will never finish.
+            # Time spent queued behind the limiter says nothing about the device.
+            if sent:
+                self.breaker.record_failure()
+                if trace is not None:
+                    self.tracer.finish(trace, error="cancelled")
+            else:
+                self.breaker.abandon()
+            raise
         except Exception as e:
-            _LOGGER.error(f"Error fetching statusvars.js: {e}")
+            self.breaker.record_failure()
+            if trace is not None:
+                self.tracer.finish(trace, error=type(e).__name__)
+            if self.recorder is not None and sent:
+                self.recorder.response(f"/{path}", time.monotonic() - started, error=type(e).__name__)
+            # Once the breaker has opened it reports the outage itself
+            _LOGGER.log(
+                logging.ERROR if self.breaker.state == CLOSED else logging.DEBUG,
+                "Error trying to %s: %s",
+                action,
+                str(e) or type(e).__name__,
+            )
+            return None
+
+        # Any answer, even an error status, shows the controller is reachable
+        self.breaker.record_success()
+        if trace is not None:
+            self.tracer.finish(trace, status=status)
+        if self.recorder is not None:
+            self.recorder.response(f"/{path}", time.monotonic() - started, status, body)
+        _LOGGER.debug("Response to %s: %s %s", action, status, body)
+        if status != 200:
+            _LOGGER.error("Failed to %s: %s", action, status)
             return None
+        return body
+
+    async def _post(self, path, data, action, headers=None):
+        """POST form data to the controller, returning True if it was accepted."""
+        return await self._request("POST", path, action, data=data, headers=headers) is not None
+
+    async def _statusvars(self):
+        """Fetch statusvars.js asynchronously."""
+        return await self._fetch_vars("statusvars.js")
 
     async def _wpvars(self):
         """Fetch wpvars.js asynchronously."""
-        session = await self._get_session()
-        url = f"{self._url}/wpvars.js"
-        try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    _LOGGER.error(f"Failed to fetch wpvars.js: {response.status}")
-                    return None
-        except Exception as e:
-            _LOGGER.error(f"Error fetching wpvars.js: {e}")
-            return None
+        return await self._fetch_vars("wpvars.js")
 
     async def _fetch_vars(self, filename):
-        """Generic function to fetch and parse a JavaScript-based variable file."""
-        session = await self._get_session()
-        url = f"{self._url}/{filename}"
-        try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    _LOGGER.debug(f"Raw {filename} content: {content}")  # Log raw file contents
-                    return content  # Do not parse, just return raw text
-                else:
-                    _LOGGER.error(f"Failed to fetch {filename}: {response.status}")
-                    return None
-        except Exception as e:
-            _LOGGER.error(f"Error fetching {filename}: {e}")
-            return None
+        """Fetch a JavaScript-based variable file and return its raw bytes."""
+        return await self._request("GET", filename, f"fetch {filename}")
+
+    def _status_from_text(self, statusvars_text):
+        """Turn the raw statusvars.js text into the status dict."""
+        statusvars = self.parse_status_vars(statusvars_text, "statusvars.js")
+        _LOGGER.debug("Parsed statusvars: %s", statusvars)
+        self.color_simulation_active = statusvars.get("csimact") == 1
+
+        return {
+            "currentProfile": statusvars.get("profile", "offline"),  # Use .get() to avoid KeyError
+            "currentWhite": statusvars["brightness"][0],
+            "currentBlue": statusvars["brightness"][1],
+            "currentGreen": statusvars["brightness"][2],
+            "currentRed": statusvars["brightness"][3],
+            "manualColorSimulationEnabled": "On" if statusvars["csimact"] == 1 else "Off",
+            "manualDaytimeSimulationEnabled": "On" if statusvars["tsimact"] == 1 else "Off",
+            "deviceTime": self.nr_mins_to_formatted(statusvars["tsimtime"]),
+            "deviceMinutes": statusvars["tsimtime"],
+            "profileTimes": statusvars.get("times", []),
+            "lamp": statusvars.get("lamp", "Unknown"),
+        }
+
+    def _profiles_from_text(self, wpvars_text):
+        """Turn the raw wpvars.js text into the profiles dict."""
+        wpvars = self.parse_status_vars(wpvars_text, "wpvars.js")
+        _LOGGER.debug("Parsed wpvars: %s", wpvars)
+
+        # Clean profile names (without prefixes) for display
+        clean_profile_names = wpvars.get("profnames", [])
+        # Full profile names (with prefixes) for device communication
+        full_profile_names = [f"P{i+1} | {name}" for i, name in enumerate(clean_profile_names)]
+        profile_selection = wpvars.get("profsel", [])
+
+        # Debug the profile names
+        _LOGGER.debug("Clean profile names: %s", clean_profile_names)
+        _LOGGER.debug("Full profile names: %s", full_profile_names)
+        _LOGGER.debug("Profile selection: %s", profile_selection)
+
+        # Map clean profile names to their selection status
+        profiles = {name: bool(selection) for name, selection in zip(clean_profile_names, profile_selection)}
+        _LOGGER.debug("Profile names with selection status: %s", profiles)
+
+        return {
+            "available_profiles": clean_profile_names,  # Clean names for display
+            "full_profile_names": full_profile_names,   # Full names for device communication
+            "current_profile": next(
+                (name for name, selected in profiles.items() if selected), "offline"
+            ),  # Return the current active profile, default to 'offline'
+        }
 
     async def get_status(self):
         """Fetch the current status from the controller."""
@@ -125,19 +255,7 @@ class Controller:
         _LOGGER.debug("Raw statusvars.js text: %s", statusvars_text)
 
         if statusvars_text:
-            statusvars = self.parse_status_vars(statusvars_text)
-            _LOGGER.debug("Parsed statusvars: %s", statusvars)
-
-            return {
-                "currentProfile": statusvars.get("profile", "offline"),  # Use .get() to avoid KeyError
-                "currentWhite": statusvars["brightness"][0],
-                "currentBlue": statusvars["brightness"][1],
-                "currentGreen": statusvars["brightness"][2],
-                "currentRed": statusvars["brightness"][3],
-                "manualColorSimulationEnabled": "On" if statusvars["csimact"] == 1 else "Off",
-                "manualDaytimeSimulationEnabled": "On" if statusvars["tsimact"] == 1 else "Off",
-                "deviceTime": self.nr_mins_to_formatted(statusvars["tsimtime"]),
-            }
+            return self._status_from_text(statusvars_text)
         else:
             return None
 
@@ -147,74 +265,118 @@ class Controller:
         _LOGGER.debug("Raw wpvars.js text: %s", wpvars_text)
 
         if wpvars_text:
-            wpvars = self.parse_status_vars(wpvars_text)
-            _LOGGER.debug("Parsed wpvars: %s", wpvars)
-
-            # Clean profile names (without prefixes) for display
-            clean_profile_names = wpvars.get("profnames", [])
-            # Full profile names (with prefixes) for device communication
-            full_profile_names = [f"P{i+1} | {name}" for i, name in enumerate(clean_profile_names)]
-            profile_selection = wpvars.get("profsel", [])
-
-            # Debug the profile names
-            _LOGGER.debug("Clean profile names: %s", clean_profile_names)
-            _LOGGER.debug("Full profile names: %s", full_profile_names)
-            _LOGGER.debug("Profile selection: %s", profile_selection)
-
-            # Map clean profile names to their selection status
-            profiles = {name: bool(selection) for name, selection in zip(clean_profile_names, profile_selection)}
-            _LOGGER.debug(f"Profile names with selection status: {profiles}")
-
-            return {
-                "available_profiles": clean_profile_names,  # Clean names for display
-                "full_profile_names": full_profile_names,   # Full names for device communication
-                "current_profile": next(
-                    (name for name, selected in profiles.items() if selected), "offline"
-                ),  # Return the current active profile, default to 'offline'
-            }
+            return self._profiles_from_text(wpvars_text)
         else:
             return None
 
-    async def device_info(self):
-        """Fetch and return device hardware information."""
+    async def _fetch_with_deadline(self, fetch, filename, timeout):
+        """Await a fetch coroutine, giving up on it after timeout seconds."""
+        try:
+            return await asyncio.wait_for(fetch, timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.error("Timed out fetching %s after %ss", filename, timeout)
+            return None
+
+    def _parse_endpoint(self, parser, text, filename):
+        """Parse one endpoint's text, isolating failures from the other endpoints."""
+        if not text:
+            return None
+        try:
+            return parser(text)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            _LOGGER.error("Error parsing %s: %s", filename, e)
+            if self.recorder is not None:
+                self.recorder.parse_error(filename, e)
+            return None
+
+    async def _no_fetch(self):
+        """Placeholder for an endpoint that is skipped this round."""
+        return None
+
+    async def get_snapshot(self, timeout=SNAPSHOT_TIMEOUT, include_profiles=True):
+        """Fetch statusvars.js and wpvars.js concurrently and merge them.
+
+        Both files are requested at the same time and each is parsed once. A
+        failure or timeout on one file doesn't affect the other; check
+        ``status_ok`` and ``profiles_ok`` on the result. Pass
+        ``include_profiles=False`` to only fetch statusvars.js.
+        """
+        statusvars_text, wpvars_text = await asyncio.gather(
+            self._fetch_with_deadline(self._statusvars(), "statusvars.js", timeout),
+            self._fetch_with_deadline(
+                self._wpvars() if include_profiles else self._no_fetch(), "wpvars.js", timeout
+            ),
+        )
+        status = self._parse_endpoint(self._status_from_text, statusvars_text, "statusvars.js")
+        profiles = self._parse_endpoint(self._profiles_from_text, wpvars_text, "wpvars.js")
+
+        fields = {}
+        if status is not None:
+            fields.update(
+                status_ok=True,
+                current_profile=status["currentProfile"],
+                device_minutes=status["deviceMinutes"],
+                white=status["currentWhite"],
+                blue=status["currentBlue"],
+                green=status["currentGreen"],
+                red=status["currentRed"],
+                manual_color_simulation=status["manualColorSimulationEnabled"] == "On",
+                manual_daytime_simulation=status["manualDaytimeSimulationEnabled"] == "On",
+                profile_times=tuple(status["profileTimes"]),
+                lamp=status["lamp"],
+            )
+        if profiles is not None:
+            fields.update(
+                profiles_ok=True,
+                available_profiles=tuple(profiles["available_profiles"]),
+                full_profile_names=tuple(profiles["full_profile_names"]),
+            )
+        return HelialuxSnapshot(**fields)
+
+    async def device_info(self, lamp=None):
+        """Fetch and return device hardware information.
+
+        ``lamp`` is the lamp type from a statusvars.js that was already
+        fetched (see HelialuxSnapshot.lamp); without it statusvars.js is
+        fetched again just for that.
+        """
         devvars_text = await self._fetch_vars("devvars.js")
-        _LOGGER.debug(f"Raw devvars.js content: {devvars_text}")  # Debug log
-        statusvars_text = await self._statusvars()
-        _LOGGER.debug(f"Raw statusvars.js content: {statusvars_text}")  # Debug log
+        _LOGGER.debug("Raw devvars.js content: %s", devvars_text)
+        if lamp is None:
+            statusvars_text = await self._statusvars()
+            _LOGGER.debug("Raw statusvars.js content: %s", statusvars_text)
+            parsed_statusvars = self.parse_status_vars(statusvars_text, "statusvars.js") if statusvars_text else {}
+            lamp = parsed_statusvars.get("lamp", "Unknown")
 
         if not devvars_text:
             _LOGGER.error("Failed to retrieve devvars.js content.")
             return {}
 
         parsed_devvars = self.parse_devvars(devvars_text)
-        parsed_statusvars = self.parse_status_vars(statusvars_text) if statusvars_text else {}
-        _LOGGER.debug(f"Parsed devvars.js: {parsed_devvars}")  # Debug log
+        _LOGGER.debug("Parsed devvars.js: %s", parsed_devvars)
 
         if "info" not in parsed_devvars:
             _LOGGER.error("Missing key in parsed data: 'info'")
             return {}
 
         try:
-            device_type = f"{parsed_devvars['info'][0]} {parsed_statusvars.get('lamp', 'Unknown')}"
+            device_type = f"{parsed_devvars['info'][0]} {lamp}"
             device_info = {
                 "device_type": device_type if len(parsed_devvars["info"]) > 0 else "Unknown",
                 "hardware_version": parsed_devvars["info"][1].lstrip('V') if len(parsed_devvars["info"]) > 1 else "Unknown",
                 "firmware_version": parsed_devvars["info"][2].lstrip('V') if len(parsed_devvars["info"]) > 2 else "Unknown",
                 "ip_address": parsed_devvars["info"][3] if len(parsed_devvars["info"]) > 3 else "Unknown",
                 "mac_address": parsed_devvars["info"][4] if len(parsed_devvars["info"]) > 4 else "Unknown",
-                "light_channels": parsed_statusvars.get("lamp", "Unknown"),
+                "light_channels": lamp,
             }
-            _LOGGER.debug(f"Device info: {device_info}")  # Debug log
+            _LOGGER.debug("Device info: %s", device_info)
             return device_info
         except KeyError as e:
-            _LOGGER.error(f"Missing key in parsed data: {e}")
+            _LOGGER.error("Missing key in parsed data: %s", e)
             return {}
 
     async def set_manual_color(self, white, blue, green, red):
         """Set manual color asynchronously."""
-        session = await self._get_session()
-        url = f"{self._url}/stat"
-        
         # Ensure values are in correct range (0-100) without double normalization
         params = {
             "action": 10,
@@ -225,51 +387,29 @@ class Controller:
         }
 
         _LOGGER.debug("Sending color update to Juwel: %s", params)
-
-        try:
-            async with session.post(url, data=params) as response:
-                response_text = await response.text()
-                _LOGGER.debug("Juwel Response: %s", response_text)
-                if response.status != 200:
-                    _LOGGER.error("Failed to set manual color: %d", response.status)
-        except Exception as e:
-            _LOGGER.error("Error setting manual color: %s", e)
+        return await self._post("stat", params, "set manual color")
 
     async def start_manual_color_simulation(self, duration=60):
         """Start manual color simulation asynchronously."""
-        session = await self._get_session()
-        url = f"{self._url}/stat"
         stimTime = self.nr_mins_to_formatted(duration)
         data = {"action": 14, "cswi": "true", "ctime": stimTime}
-        try:
-            _LOGGER.debug(data)
-            async with session.post(url, data=data) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"Failed to start manual color simulation: {response.status}")
-        except Exception as e:
-            _LOGGER.error(f"Error starting manual color simulation: {e}")
+        _LOGGER.debug("Starting manual color simulation with data: %s", data)
+        if not await self._post("stat", data, "start manual color simulation"):
+            return False
+        self.color_simulation_active = True
+        return True
 
     async def stop_manual_color_simulation(self):
         """Stop manual color simulation asynchronously."""
-        session = await self._get_session()
-        url = f"{self._url}/stat"
-        try:
-            async with session.post(url, data={"action": 14, "cswi": "false"}) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"Failed to stop manual color simulation: {response.status}")
-            async with session.post(url, data={"action": 10}) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"Failed to reset manual color: {response.status}")
-        except Exception as e:
-            _LOGGER.error(f"Error stopping manual color simulation: {e}")
+        if not await self._post("stat", {"action": 14, "cswi": "false"}, "stop manual color simulation"):
+            return False
+        self.color_simulation_active = False
+        return await self._post("stat", {"action": 10}, "reset manual color")
 
     async def set_profile(self, profile_name, friendly_profile_name):
         """Set the active profile on the Helialux device."""
-        session = await self._get_session()
-        url = f"{self._url}/week.html"
         profile_name_two = profile_name
-        _LOGGER.debug(f"Posting profile change to: {profile_name}")
-        _LOGGER.debug(f"Posting url: {url}")
+        _LOGGER.debug("Posting profile change to: %s", profile_name)
 
         # Prepare the data to send to the Helialux device
         data = {
@@ -283,23 +423,13 @@ class Controller:
             "s6": profile_name_two,
         }
 
-        try:
-            # Set the Content-Type header to application/x-www-form-urlencoded
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
-            async with session.post(url, data=data, headers=headers) as response:
-                response_text = await response.text()
-                _LOGGER.debug(f"Response status: {response.status}")
-                _LOGGER.debug(f"Response text: {response_text}")
-                if response.status == 200:
-                    _LOGGER.debug(f"Successfully set profile to: {profile_name}")
-                    return True
-                else:
-                    _LOGGER.error(f"Failed to set profile: {response.status}")
-                    return False
-        except Exception as e:
-            _LOGGER.error(f"Error setting profile: {e}")
+        # Set the Content-Type header to application/x-www-form-urlencoded
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        if not await self._post("week.html", data, "set profile", headers=headers):
             return False
-        
+        _LOGGER.debug("Successfully set profile to: %s", profile_name)
+        return True
+
     async def start_manual_daytime_simulation(self, target_minutes, duration="01:00"):
         """Start manual daytime simulation asynchronously.
         
@@ -307,9 +437,6 @@ class Controller:
             target_minutes: Time position in minutes since midnight (0-1440)
             duration: How long to run the simulation in HH:MM format
         """
-        session = await self._get_session()
-        url = f"{self._url}/stat"
-        
         data = {
             "action": 12,  # Action for daytime simulation
             "ch5": target_minutes,  # Target time position in minutes since midnight
@@ -320,15 +447,11 @@ class Controller:
             "pwdWarn": 0  # Password warning (if applicable)
         }
         
-        try:
-            _LOGGER.debug(f"Starting manual daytime simulation with data: {data}")
-            async with session.post(url, data=data) as response:
-                response_text = await response.text()
-                _LOGGER.debug(f"Response: {response_text}")
-                if response.status != 200:
-                    _LOGGER.error(f"Failed to start manual daytime simulation: {response.status}")
-        except Exception as e:
-            _LOGGER.error(f"Error starting manual daytime simulation: {e}")
+        _LOGGER.debug("Starting manual daytime simulation with data: %s", data)
+        if not await self._post("stat", data, "start manual daytime simulation"):
+            return False
+        self.color_simulation_active = False
+        return True
 
     async def update_daytime_simulation_position(self, target_minutes, duration="01:00"):
         """Update the position of an active manual daytime simulation.
@@ -337,9 +460,6 @@ class Controller:
             target_minutes: New time position in minutes since midnight (0-1440)
             duration: Duration in HH:MM format
         """
-        session = await self._get_session()
-        url = f"{self._url}/stat"
-        
         data = {
             "action": 12,  # Action for daytime simulation
             "ch5": target_minutes,  # New target time position
@@ -350,21 +470,14 @@ class Controller:
             "pwdWarn": 0  # Password warning (if applicable)
         }
         
-        try:
-            _LOGGER.debug(f"Updating daytime simulation position with data: {data}")
-            async with session.post(url, data=data) as response:
-                response_text = await response.text()
-                _LOGGER.debug(f"Response: {response_text}")
-                if response.status != 200:
-                    _LOGGER.error(f"Failed to update daytime simulation position: {response.status}")
-        except Exception as e:
-            _LOGGER.error(f"Error updating daytime simulation position: {e}")
+        _LOGGER.debug("Updating daytime simulation position with data: %s", data)
+        if not await self._post("stat", data, "update daytime simulation position"):
+            return False
+        self.color_simulation_active = False
+        return True
 
     async def stop_manual_daytime_simulation(self):
         """Stop manual daytime simulation asynchronously."""
-        session = await self._get_session()
-        url = f"{self._url}/stat"
-        
         data = {
             "action": 12,  # Action for daytime simulation
             "tswi": "false",  # Disable daytime simulation
@@ -374,10 +487,90 @@ class Controller:
             "pwdWarn": 0  # Password warning (if applicable)
         }
         
-        try:
-            _LOGGER.debug(f"Stopping manual daytime simulation with data: {data}")
-            async with session.post(url, data=data) as response:
-                if response.status != 200:
-                    _LOGGER.error(f"Failed to stop manual daytime simulation: {response.status}")
-        except Exception as e:
-            _LOGGER.error(f"Error stopping manual daytime simulation: {e}")
\ No newline at end of file
+        _LOGGER.debug("Stopping manual daytime simulation with data: %s", data)
+        if not await self._post("stat", data, "stop manual daytime simulation"):
+            return False
+        # cswi=false above stops colour simulation too
+        self.color_simulation_active = False
+        return True
+
+    async def _apply_manual_color(self, white, blue, green, red, duration):
+        """Set a manual colour, starting colour simulation only if it isn't running."""
+        if not self.color_simulation_active:
+            if not await self.start_manual_color_simulation(duration):
+                return False
+        else:
+            _LOGGER.debug("Manual color simulation already active, not restarting it")
+        return await self.set_manual_color(white, blue, green, red)
+
+    async def queue_manual_color(self, white, blue, green, red, duration=60):
+        """Queue a manual colour; only the newest queued colour is sent.
+
+        Returns True once the colour that was finally sent is accepted.
+        """
+        # A new colour supersedes a fade that is still playing
+        self.ramp.stop()
+        return await self.commands.submit(
+            "manual_color",
+            lambda: self._apply_manual_color(white, blue, green, red, duration),
+        )
+
+    async def queue_manual_color_ramp(self, start, target, transition, duration=60, on_frame=None):
+        """Fade from ``start`` to ``target`` (white, blue, green, red) over ``transition`` seconds.
+
+        The fade is played in the caller's task and each frame is queued as a
+        manual colour, so other commands are sent between frames instead of
+        waiting for the fade to end. A fade that is playing is stopped, and
+        so is this one by any later colour or simulation command. Only the
+        first frame may need to start colour simulation; every later frame is
+        a single write. ``on_frame`` is called with the levels of every frame
+        the device accepted. Returns True once the target colour is accepted,
+        False if the fade failed or was superseded.
+        """
+
+        def send_frame(levels):
+            return self.commands.submit(
+                "manual_color", lambda: self._apply_manual_color(*levels, duration)
+            )
+
+        return await self.ramp.run(start, target, transition, send_frame, on_frame)
+
+    async def queue_color_simulation(self, active, duration=60):
+        """Queue starting or stopping manual colour simulation."""
+        # A fade's next frame would start colour simulation again
+        self.ramp.stop()
+        if active:
+            send = lambda: self.start_manual_color_simulation(duration)  # noqa: E731
+        else:
+            send = self.stop_manual_color_simulation
+        return await self.commands.submit("color_simulation", send)
+
+    async def queue_daytime_simulation(self, active, target_minutes=None, duration="01:00"):
+        """Queue starting or stopping manual daytime simulation.
+
+        Starts and stops share one kind, so only the newest of them is sent.
+        ``target_minutes`` and ``duration`` are only used when starting.
+        Stopping also drops a queued position change, which would otherwise
+        start the simulation again.
+        """
+        # Daytime simulation commands switch colour simulation off, which a
+        # fade's next frame would undo
+        self.ramp.stop()
+        if active:
+            send = lambda: self.start_manual_daytime_simulation(target_minutes, duration)  # noqa: E731
+        else:
+            self.commands.discard("daytime_position")
+            send = self.stop_manual_daytime_simulation
+        return await self.commands.submit("daytime_simulation", send)
+
+    async def queue_daytime_simulation_position(self, target_minutes, duration="01:00"):
+        """Queue moving an active daytime simulation; only the newest position is sent.
+
+        Positions are queued apart from starts and stops, so moving the slider
+        never replaces a queued start or stop.
+        """
+        self.ramp.stop()
+        return await self.commands.submit(
+            "daytime_position",
+            lambda: self.update_daytime_simulation_position(target_minutes, duration),
+        )
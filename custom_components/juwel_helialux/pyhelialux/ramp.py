@@ -0,0 +1,117 @@
+"""Rate-limited fades between two sets of channel levels.
+
+The controller has no fade command, so a transition is played as a series of
+manual colour writes ("frames"). Each frame's levels are worked out from the
+clock rather than a frame counter, which keeps the fade on time whatever the
+device does:
+
+* at most one frame is written per ``min_interval`` seconds;
+* when the device answers slower than that, the frames that fell due in the
+  meantime are skipped instead of queued, and the next frame jumps to where
+  the fade should be by now;
+* frames that would repeat the previous levels (slow fades on the 0-100
+  scale) aren't written at all;
+* ``stop()`` ends the fade once the frame in flight has been answered, so a
+  newer command never races an older frame. A frame that was superseded
+  while waiting to be sent doesn't count as shown.
+"""
+
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 1.0  # seconds between frame writes
+
+
+class RampEngine:
+    """Plays one fade at a time for a controller."""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._stop = None
+        self.ramps = 0
+        self.ramps_stopped = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+    @property
+    def running(self):
+        """Return True while a fade is being played."""
+        return self._stop is not None
+
+    def stop(self):
+        """Ask the running fade, if any, to end after its current frame."""
+        if self._stop is not None:
+            self._stop.set()
+
+    async def run(self, start, target, transition, send, on_frame=None):
+        """Fade from ``start`` to ``target`` (white, blue, green, red) over ``transition`` seconds.
+
+        ``send`` is a coroutine function taking the levels of one frame and
+        returning True if the device accepted them. ``on_frame`` is called
+        with the levels of every frame that was accepted while the fade was
+        still running. A fade already running is stopped first. Returns True
+        once the target levels were written, and False if a frame failed or
+        the fade was stopped.
+        """
+        self.stop()
+        stop = self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self.ramps += 1
+        began = loop.time()
+        written = None
+        last_slot = 0
+        try:
+            while True:
+                if stop.is_set():
+                    self.ramps_stopped += 1
+                    _LOGGER.debug("Fade to %s stopped by a newer command", target)
+                    return False
+
+                now = loop.time()
+                progress = 1.0 if transition <= 0 else min(1.0, (now - began) / transition)
+                slot = int((now - began) / self.min_interval)
+                if slot > last_slot + 1:
+                    # The device took longer than a frame; jump ahead instead of catching up
+                    self.frames_skipped += slot - last_slot - 1
+                last_slot = slot
+
+                levels = tuple(round(a + (b - a) * progress) for a, b in zip(start, target))
+                if levels != written:
+                    accepted = await send(levels)
+                    if stop.is_set():
+                        # A newer command took the frame's place or followed it
+                        self.ramps_stopped += 1
+                        _LOGGER.debug("Fade to %s stopped by a newer command", target)
+                        return False
+                    if not accepted:
+                        _LOGGER.debug("Fade to %s aborted, the device rejected %s", target, levels)
+                        return False
+                    self.frames_sent += 1
+                    written = levels
+                    if on_frame is not None:
+                        on_frame(levels)
+                if progress >= 1.0:
+                    return True
+
+                # Sleep until the next frame is due, waking early if stopped
+                next_frame = began + (slot + 1) * self.min_interval
+                try:
+                    await asyncio.wait_for(stop.wait(), max(0.0, next_frame - loop.time()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._stop is stop:
+                self._stop = None
+
+    def as_dict(self):
+        """Return the fade counters as plain values."""
+        return {
+            "min_interval": self.min_interval,
+            "running": self.running,
+            "ramps": self.ramps,
+            "ramps_stopped": self.ramps_stopped,
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+        }
@@ -0,0 +1,75 @@
+"""Bounded record of recent controller responses and parse errors.
+
+Meant to stay switched on permanently: recording only appends a tuple with
+the raw bytes to a fixed-length deque, and bodies are truncated, so memory
+has a hard ceiling of roughly ``endpoints * responses * max_body`` bytes.
+Decoding and formatting happen in ``as_dict``, only when someone asks.
+"""
+
+import time
+from collections import deque
+
+DEFAULT_RESPONSES = 10  # kept per endpoint
+DEFAULT_PARSE_ERRORS = 20
+DEFAULT_MAX_BODY = 4096  # bytes kept of each response
+
+
+class ResponseRecorder:
+    """Ring buffers of the last responses per endpoint and the last parse errors."""
+
+    def __init__(
+        self,
+        responses=DEFAULT_RESPONSES,
+        parse_errors=DEFAULT_PARSE_ERRORS,
+        max_body=DEFAULT_MAX_BODY,
+    ):
+        self._responses_per_endpoint = responses
+        self._max_body = max_body
+        self._responses = {}  # endpoint -> deque of (time, seconds, status, body, error)
+        self._parse_errors = deque(maxlen=parse_errors)  # (time, source, exception)
+
+    def response(self, endpoint, seconds, status=None, body=None, error=None):
+        """Record a response (or a failed request) to ``endpoint``."""
+        buffer = self._responses.get(endpoint)
+        if buffer is None:
+            buffer = self._responses[endpoint] = deque(maxlen=self._responses_per_endpoint)
+        if body is not None and len(body) > self._max_body:
+            body = body[:self._max_body]
+        buffer.append((time.time(), seconds, status, body, error))
+
+    def parse_error(self, source, error):
+        """Record an exception raised, or a problem skipped, while parsing ``source``."""
+        self._parse_errors.append((time.time(), source, error))
+
+    def as_dict(self, redact=None):
+        """Return the recorded data as plain values.
+
+        ``redact`` is an optional function applied to every decoded body, e.g.
+        to blank out addresses before the data leaves the machine.
+        """
+
+        def body_text(body):
+            if body is None:
+                return None
+            text = body.decode("utf-8", "replace")
+            return redact(text) if redact is not None else text
+
+        return {
+            "responses": {
+                endpoint: [
+                    {
+                        "time": when,
+                        "latency_ms": round(seconds * 1000, 3),
+                        "status": status,
+                        "error": error,
+                        "body": body_text(body),
+                    }
+                    for when, seconds, status, body, error in buffer
+                ]
+                for endpoint, buffer in self._responses.items()
+            },
+            "parse_errors": [
+                {"time": when, "source": source, "error": str(error)}
+                for when, source, error in self._parse_errors
+            ],
+        }
@@ -0,0 +1,232 @@
+"""Request tracing for HeliaLux controllers.
+
+A Controller given a RequestTracer times every request it makes. The timings
+are split into phases and kept per endpoint in fixed-size histograms, so they
+can be queried at any time without memory growing with the number of
+requests:
+
+* ``queued``: waiting for a free connection (the pool allows two per host);
+* ``dns``: resolving the host name;
+* ``connect``: opening a new connection (absent when one is reused);
+* ``ttfb``: from sending the request headers to receiving the response headers;
+* ``total``: from start to the last byte of the body, or to the failure.
+
+The phase timings come from aiohttp's tracing signals. The pooled session is
+created with ``trace_config()``, which forwards the signals to the trace
+object each request carries in ``trace_request_ctx``; sessions passed in by
+the caller only get the ``total`` phase.
+"""
+
+import time
+from array import array
+from bisect import bisect_left
+
+import aiohttp
+
+# Histogram bucket upper bounds in seconds, plus an overflow bucket
+BUCKET_BOUNDS = (
+    0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0,
+)
+PHASES = ("queued", "dns", "connect", "ttfb", "total")
+
+
+class LatencyHistogram:
+    """Fixed-memory latency histogram with log-spaced buckets."""
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts = array("L", bytes(array("L").itemsize * (len(BUCKET_BOUNDS) + 1)))
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        """Add one sample."""
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Return an upper estimate of the given percentile (0-1) in seconds.
+
+        The result is the upper bound of the bucket the percentile falls in,
+        capped at the largest sample seen.
+        """
+        if not self.count:
+            return None
+        wanted = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted and count:
+                if index < len(BUCKET_BOUNDS):
+                    return min(BUCKET_BOUNDS[index], self.max)
+                break
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def as_dict(self):
+        """Return the histogram as plain values, times in milliseconds."""
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.mean),
+            "min_ms": ms(self.min),
+            "p50_ms": ms(self.percentile(0.5)),
+            "p95_ms": ms(self.percentile(0.95)),
+            "max_ms": ms(self.max),
+            "buckets": {
+                ("+Inf" if index == len(BUCKET_BOUNDS) else f"{BUCKET_BOUNDS[index] * 1000:g}ms"): count
+                for index, count in enumerate(self.counts)
+                if count
+            },
+        }
+
+
+class RequestTrace:
+    """Timings of one request, filled in as it progresses."""
+
+    __slots__ = (
+        "endpoint", "method", "started", "status", "error",
+        "queued", "dns", "connect", "ttfb", "total",
+        "_sent", "_marks",
+    )
+
+    def __init__(self, endpoint, method):
+        self.endpoint = endpoint
+        self.method = method
+        self.started = time.perf_counter()
+        self.status = None
+        self.error = None
+        self.queued = self.dns = self.connect = self.ttfb = self.total = None
+        self._sent = self.started
+        self._marks = {}
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in ("endpoint", "method", "status", "error") + PHASES}
+
+
+class RequestTracer:
+    """Collects per-endpoint timing histograms for one controller.
+
+    ``on_request_start`` and ``on_request_end`` are optional callbacks that
+    receive the RequestTrace when a request starts and once it has finished,
+    e.g. to export timings elsewhere. ``labels`` are free-form values such as
+    the firmware version, included in ``summary()`` so timings from different
+    devices can be told apart.
+    """
+
+    def __init__(self, on_request_start=None, on_request_end=None, labels=None):
+        self.on_request_start = on_request_start
+        self.on_request_end = on_request_end
+        self.labels = dict(labels or {})
+        self._histograms = {}  # endpoint -> {phase: LatencyHistogram}
+        self.errors = {}  # endpoint -> count
+
+    def start(self, endpoint, method):
+        """Begin tracing a request; pass the result as trace_request_ctx."""
+        trace = RequestTrace(endpoint, method)
+        if self.on_request_start is not None:
+            self.on_request_start(trace)
+        return trace
+
+    def finish(self, trace, status=None, error=None):
+        """Record a finished (or failed) request."""
+        trace.total = time.perf_counter() - trace.started
+        trace.status = status
+        trace.error = error
+        phases = self._histograms.get(trace.endpoint)
+        if phases is None:
+            phases = self._histograms[trace.endpoint] = {phase: LatencyHistogram() for phase in PHASES}
+        for phase in PHASES:
+            value = getattr(trace, phase)
+            if value is not None:
+                phases[phase].record(value)
+        if error is not None or (status is not None and status != 200):
+            self.errors[trace.endpoint] = self.errors.get(trace.endpoint, 0) + 1
+        if self.on_request_end is not None:
+            self.on_request_end(trace)
+
+    def histogram(self, endpoint, phase="total"):
+        """Return the histogram for an endpoint and phase, or None if never seen."""
+        phases = self._histograms.get(endpoint)
+        return None if phases is None else phases[phase]
+
+    @property
+    def endpoints(self):
+        return list(self._histograms)
+
+    def summary(self):
+        """Return all histograms as plain values, grouped by endpoint and phase."""
+        return {
+            "labels": dict(self.labels),
+            "endpoints": {
+                endpoint: {
+                    "errors": self.errors.get(endpoint, 0),
+                    **{phase: histogram.as_dict() for phase, histogram in phases.items() if histogram.count},
+                }
+                for endpoint, phases in self._histograms.items()
+            },
+        }
+
+
+def _trace(trace_config_ctx):
+    ctx = trace_config_ctx.trace_request_ctx
+    return ctx if isinstance(ctx, RequestTrace) else None
+
+
+async def _on_request_headers_sent(session, trace_config_ctx, params):
+    trace = _trace(trace_config_ctx)
+    if trace is not None:
+        trace._sent = time.perf_counter()
+
+
+def _on_phase_start(phase):
+    # Phases nest (DNS happens while connecting), so each keeps its own mark
+    async def handler(session, trace_config_ctx, params):
+        trace = _trace(trace_config_ctx)
+        if trace is not None:
+            trace._marks[phase] = time.perf_counter()
+
+    return handler
+
+
+def _on_phase_end(phase):
+    async def handler(session, trace_config_ctx, params):
+        trace = _trace(trace_config_ctx)
+        if trace is not None and phase in trace._marks:
+            setattr(trace, phase, time.perf_counter() - trace._marks.pop(phase))
+
+    return handler
+
+
+async def _on_request_end(session, trace_config_ctx, params):
+    # Sent once the response headers are in, before the body is read
+    trace = _trace(trace_config_ctx)
+    if trace is not None:
+        trace.ttfb = time.perf_counter() - trace._sent
+
+
+def trace_config():
+    """Return an aiohttp TraceConfig that feeds RequestTrace objects."""
+    config = aiohttp.TraceConfig()
+    for phase, start, end in (
+        ("queued", config.on_connection_queued_start, config.on_connection_queued_end),
+        ("dns", config.on_dns_resolvehost_start, config.on_dns_resolvehost_end),
+        ("connect", config.on_connection_create_start, config.on_connection_create_end),
+    ):
+        start.append(_on_phase_start(phase))
+        end.append(_on_phase_end(phase))
+    config.on_request_headers_sent.append(_on_request_headers_sent)
+    config.on_request_end.append(_on_request_end)
+    return config
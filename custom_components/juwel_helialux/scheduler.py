@@ -0,0 +1,97 @@
+"""Fleet-wide poll scheduling shared by all Juwel Helialux config entries."""
+
+import logging
+from collections import deque
+
+from .const import MAX_CONCURRENT_REQUESTS, MAX_POLL_SPACING
+from .pyhelialux.limiter import RequestLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Key of the shared scheduler in hass.data[DOMAIN], next to the per-entry coordinators
+SCHEDULER = "scheduler"
+
+
+class FleetScheduler:
+    """Spread the polls of all tanks out in time and cap requests in flight.
+
+    Every coordinator asks ``reserve`` when its next poll should run. If that
+    moment is too close to a poll another tank already has planned, it is
+    pushed back until there is a gap. Tanks polling at the same interval thus
+    settle into evenly spaced phases instead of all firing at once, and keep
+    them because each next poll is planned one interval after the last.
+
+    The shared ``limiter`` is handed to every tank's Controller, so at most
+    MAX_CONCURRENT_REQUESTS requests are in flight across the whole fleet,
+    polls and commands alike.
+    """
+
+    def __init__(self, hass, max_concurrent=MAX_CONCURRENT_REQUESTS, max_spacing=MAX_POLL_SPACING):
+        self._hass = hass
+        self.limiter = RequestLimiter(max_concurrent)
+        self.max_spacing = max_spacing
+        self._members = set()
+        self._planned = {}  # coordinator -> loop time of its next poll
+        self._polls = deque()  # loop times of polls in the last minute
+        self.worst_lag = 0.0
+
+    def register(self, coordinator):
+        """Add a tank to the fleet."""
+        self._members.add(coordinator)
+
+    def unregister(self, coordinator):
+        """Remove a tank, e.g. when its config entry is unloaded."""
+        self._members.discard(coordinator)
+        self._planned.pop(coordinator, None)
+
+    def reserve(self, coordinator, delay):
+        """Plan the tank's next poll ``delay`` seconds from now.
+
+        Returns the delay to actually use, which may be a little longer so the
+        poll doesn't land on top of another tank's.
+        """
+        now = self._hass.loop.time()
+        when = now + delay
+        # Spread the fleet evenly over the interval, but never further apart
+        # than needed to keep the polls from overlapping
+        spacing = min(self.max_spacing, delay / max(1, len(self._members)))
+        for other in sorted(
+            planned for member, planned in self._planned.items()
+            if member is not coordinator and planned > now
+        ):
+            if other > when - spacing and other < when + spacing:
+                when = other + spacing
+        self._planned[coordinator] = when
+        if when - now > delay:
+            _LOGGER.debug(
+                "Staggering %s: next poll in %.1fs instead of %.1fs",
+                coordinator.tank_name,
+                when - now,
+                delay,
+            )
+        return when - now
+
+    def poll_started(self, coordinator):
+        """Record that the tank started fetching, measuring how late it is."""
+        now = self._hass.loop.time()
+        self._polls.append(now)
+        planned = self._planned.pop(coordinator, None)
+        # Refreshes requested early (e.g. after a command) aren't late
+        if planned is not None and now > planned:
+            self.worst_lag = max(self.worst_lag, now - planned)
+
+    def stats(self):
+        """Return fleet-level statistics for diagnostics."""
+        now = self._hass.loop.time()
+        while self._polls and now - self._polls[0] > 60:
+            self._polls.popleft()
+        return {
+            "tanks": len(self._members),
+            "polls_per_minute": len(self._polls),
+            "queue_depth": self.limiter.waiting,
+            "max_queue_depth": self.limiter.max_waiting,
+            "requests_in_flight": self.limiter.in_flight,
+            "max_concurrent_requests": self.limiter.limit,
+            "worst_lag": round(self.worst_lag, 3),
+            "worst_request_wait": round(self.limiter.max_wait, 3),
+        }
@@ -1,9 +1,9 @@
 import logging
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import slugify
 from .const import DOMAIN, CONF_TANK_NAME
+from .entity import HelialuxEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -13,11 +13,13 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     tank_name = config_entry.data[CONF_TANK_NAME]
     profile_select = JuwelHelialuxProfileSelect(coordinator, tank_name)
     _LOGGER.debug("Created Profile Select entity: %s", profile_select)
-    async_add_entities([profile_select], True)
+    async_add_entities([profile_select])
 
-class JuwelHelialuxProfileSelect(CoordinatorEntity, SelectEntity):
+class JuwelHelialuxProfileSelect(HelialuxEntity, SelectEntity):
     """Select entity to allow choosing a profile from the Helialux controller."""
 
+    _watched_fields = {"current_profile", "available_profiles"}
+
     def __init__(self, coordinator, tank_name):
         """Initialize the select entity."""
         super().__init__(coordinator)
@@ -35,12 +37,12 @@ class JuwelHelialuxProfileSelect(CoordinatorEntity, SelectEntity):
     @property
     def options(self):
         """Return available profile options (clean names for display)."""
-        return self.coordinator.data.get("available_profiles", [])
+        return list(self.coordinator.data.available_profiles)
 
     @property
     def current_option(self):
         """Return the currently selected profile (clean name)."""
-        return self.coordinator.data.get("current_profile", "offline")
+        return self.coordinator.data.current_profile
 
     async def async_select_option(self, option: str):
         """Change the profile when selected in Home Assistant."""
@@ -48,8 +50,8 @@ class JuwelHelialuxProfileSelect(CoordinatorEntity, SelectEntity):
         if not option or option not in self.options:
             _LOGGER.error(f"Invalid profile selected: {option}. Valid options are: {self.options}")
             return
-        clean_profile_names = self.coordinator.data.get("available_profiles", [])
-        full_profile_names = self.coordinator.data.get("full_profile_names", [])
+        clean_profile_names = list(self.coordinator.data.available_profiles)
+        full_profile_names = list(self.coordinator.data.full_profile_names)
         if not clean_profile_names or not full_profile_names:
             _LOGGER.error("Profile names are not available in coordinator data.")
             return
@@ -65,34 +67,19 @@ class JuwelHelialuxProfileSelect(CoordinatorEntity, SelectEntity):
         if not success:
             _LOGGER.error(f"Profile change failed for: {option} (Full Name: {full_profile_name})")
         if success:
-            self.coordinator.data["current_profile"] = option
-            self.async_write_ha_state()
             _LOGGER.debug(f"Profile changed successfully to {option}")
-            await self.coordinator.async_request_refresh()            
+            self.coordinator.async_invalidate_profiles()
+            self.coordinator.async_apply_optimistic(current_profile=option)
         else:
             _LOGGER.error(f"Failed to change profile to: {option}")
 
     async def async_added_to_hass(self):
         """Ensure options are updated when the entity is added."""
         await super().async_added_to_hass()
-        self._update_options()
+        self._update_state()
         self.async_write_ha_state()
 
-    def _handle_coordinator_update(self):
-        """Ensure Home Assistant doesn't reset the profile."""
-        new_profile = self.coordinator.data.get("current_profile", "offline")
-        
-        if new_profile != self.current_option:
-            _LOGGER.debug(f"Fixing HA state: {self.current_option} -> {new_profile}")
-            self._attr_current_option = new_profile
-            self.async_write_ha_state()
-
-        self._update_options()
-        super()._handle_coordinator_update()
-
-    def _update_options(self):
-        """Update the available profile options."""
-        new_options = self.coordinator.data.get("available_profiles", [])
-        if new_options != self._attr_options:
-            self._attr_options = new_options
-            self.async_write_ha_state()
\ No newline at end of file
+    def _update_state(self):
+        """Keep the cached options and profile in line with the coordinator."""
+        self._attr_options = list(self.coordinator.data.available_profiles)
+        self._attr_current_option = self.coordinator.data.current_profile
\ No newline at end of file
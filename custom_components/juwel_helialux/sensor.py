@@ -1,16 +1,19 @@
 import logging
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
     SensorEntityDescription,
 )
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.const import UnitOfTime
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.util import slugify
 from .const import DOMAIN, CONF_TANK_HOST, CONF_TANK_NAME, CONF_TANK_PROTOCOL, CONF_UPDATE_INTERVAL
 from .coordinator import JuwelHelialuxCoordinator
+from .entity import HelialuxEntity
+from .pyhelialux.models import CHANNELS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,8 +28,34 @@ ENTITY_DESCRIPTIONS = {
     "device_time": SensorEntityDescription(key="device_time"),
 }
 
-class JuwelHelialuxSensor(CoordinatorEntity, SensorEntity):
-    """Main sensor containing all data as attributes."""
+# State fields each attribute sensor is built from
+ATTRIBUTE_FIELDS = {
+    "white": {"white"},
+    "blue": {"blue"},
+    "green": {"green"},
+    "red": {"red"},
+    "current_profile": {"current_profile"},
+    "manualColorSimulationEnabled": {"color_simulation"},
+    "manualDaytimeSimulationEnabled": {"daytime_simulation"},
+    "device_time": {"device_minutes"},
+}
+
+# Attributes of the combined sensor. They are kept out of the recorder: the
+# per-channel sensors, the profiles sensor and the number entities already
+# record the same values, so storing them again here only bloats the database.
+COMBINED_ATTRIBUTES = (
+    "current_profile",
+    "manualColorSimulationEnabled",
+    "manualDaytimeSimulationEnabled",
+)
+
+class JuwelHelialuxSensor(HelialuxEntity, SensorEntity):
+    """Main sensor: online/offline, with the active profile and simulations as attributes."""
+
+    _unrecorded_attributes = frozenset(COMBINED_ATTRIBUTES)
+    _watched_fields = {"online", "current_profile", "color_simulation", "daytime_simulation"}
+    # Shows "offline" itself when the tank doesn't answer
+    _live_state = False
 
     def __init__(self, coordinator, tank_name):
         super().__init__(coordinator)
@@ -38,13 +67,15 @@ class JuwelHelialuxSensor(CoordinatorEntity, SensorEntity):
         self.tank_name = tank_name
         self._attr_device_info = coordinator.device_info
         self._attr_has_entity_name = True
+        self._attributes = {}
+        self._update_state()
 
     async def async_added_to_hass(self):
         """Called when the entity is added to Home Assistant."""
         try:
-            self.async_write_ha_state()
-            await self.coordinator.async_request_refresh()
-            
+            # Registers with the coordinator; its data is already fresh from entry setup
+            await super().async_added_to_hass()
+
             _LOGGER.debug("Entity initialization complete for %s", self.name)
             _LOGGER.debug("Coordinator data: %s", self.coordinator.data)
             _LOGGER.debug("Device info from coordinator: %s", self._attr_device_info)
@@ -54,34 +85,24 @@ class JuwelHelialuxSensor(CoordinatorEntity, SensorEntity):
     @property
     def state(self):
         """Return 'online' if data is available, otherwise 'offline'."""
-        return "online" if self.coordinator.data else "offline"    
+        return "online" if self.coordinator.data.online else "offline"
+
+    def _update_state(self):
+        """Rebuild the cached attributes from the latest state."""
+        data = self.coordinator.data.as_dict()
+        self._attributes = {name: data[name] for name in COMBINED_ATTRIBUTES}
 
     @property
     def extra_state_attributes(self):
-        """Return all available attributes including colors and profile."""
-        color_data = {
-            "red": self.coordinator.data.get("red", 0),
-            "green": self.coordinator.data.get("green", 0),
-            "blue": self.coordinator.data.get("blue", 0),
-            "white": self.coordinator.data.get("white", 0),
-        }
-
-        profile_data = {
-            "current_profile": self.coordinator.data.get("current_profile", "offline")
-        }
-        
-        time_data = {
-            "device_time": self.coordinator.data.get("device_time", "00:00")
-        }        
-
-        return {**self.coordinator.data, **color_data, **profile_data, **time_data}
+        """Return the active profile and the manual simulation flags."""
+        return self._attributes
 
     async def async_remove(self):
         """Cleanup resources when the entity is removed."""
         _LOGGER.debug(f"Removing entity: {self.entity_id}")
         await super().async_remove()
 
-class JuwelHelialuxAttributeSensor(CoordinatorEntity, SensorEntity):
+class JuwelHelialuxAttributeSensor(HelialuxEntity, SensorEntity):
     """Creates a sensor for each individual attribute."""
 
     SENSOR_ICONS = {
@@ -126,14 +147,15 @@ class JuwelHelialuxAttributeSensor(CoordinatorEntity, SensorEntity):
 
         self._attribute = attribute
         self._default_value = default_value
+        self._watched_fields = ATTRIBUTE_FIELDS.get(attribute)
 
         _LOGGER.debug("Device info for %s: %s", self._attr_unique_id, self._attr_device_info)        
 
     @property
     def state(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data or {}
-        return data.get(self._attribute, self._default_value if data.get(self._attribute) is None else data.get(self._attribute))
+        value = getattr(self.coordinator.data, self._attribute, None)
+        return self._default_value if value is None else value
 
     @property
     def icon(self):
@@ -145,9 +167,11 @@ class JuwelHelialuxAttributeSensor(CoordinatorEntity, SensorEntity):
         _LOGGER.debug(f"Removing entity: {self.entity_id}")
         await super().async_remove()
 
-class JuwelHelialuxProfilesSensor(CoordinatorEntity, SensorEntity):
+class JuwelHelialuxProfilesSensor(HelialuxEntity, SensorEntity):
     """Sensor to display available profiles from the Helialux controller."""
 
+    _watched_fields = {"available_profiles"}
+
     def __init__(self, coordinator, tank_name, attribute):
         super().__init__(coordinator)
         tank_slug = slugify(tank_name)
@@ -167,23 +191,137 @@ class JuwelHelialuxProfilesSensor(CoordinatorEntity, SensorEntity):
     @property
     def state(self):
         """Return the number of available profiles."""
-        if not self.coordinator.data:
-            _LOGGER.warning("Coordinator data is None, returning 0 profiles")
-            return 0
-
-        profiles = self.coordinator.data.get("available_profiles", [])
-        return len(profiles)
+        return len(self.coordinator.data.available_profiles)
 
     @property
     def extra_state_attributes(self):
         """Return the list of available profiles as attributes."""
-        profiles = self.coordinator.data.get("available_profiles", [])
-        active_profiles = self.coordinator.data.get("active_profiles", [])
         return {
-            "available_profiles": profiles,
-            "active_profiles": active_profiles
+            "available_profiles": list(self.coordinator.data.available_profiles),
+            "active_profiles": [],
         }
     
+class JuwelHelialuxPredictionErrorSensor(HelialuxEntity, SensorEntity):
+    """Diagnostic sensor: how far the last poll was from the learned profile curve."""
+
+    _watched_fields = {"prediction_error"}
+    _live_state = False
+    _unrecorded_attributes = frozenset({"hits", "misses", "mean_error"})
+
+    def __init__(self, coordinator, tank_name):
+        super().__init__(coordinator)
+        tank_slug = slugify(tank_name)
+
+        self._attr_unique_id = f"{tank_slug}_prediction_error"
+        self.entity_id = f"sensor.{tank_slug}_prediction_error"
+
+        self.entity_description = SensorEntityDescription(
+            key="prediction_error",
+            translation_key="prediction_error",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement="%",
+        )
+
+        self._attr_has_entity_name = True
+        self._attr_translation_placeholders = {"tank_name": tank_name}
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def native_value(self):
+        """Return the largest channel error of the last checked prediction."""
+        return self.coordinator.curve.last_error
+
+    @property
+    def extra_state_attributes(self):
+        """Return the prediction hit and miss counts and the running mean error."""
+        curve = self.coordinator.curve
+        return {
+            "hits": curve.hits,
+            "misses": curve.misses,
+            "mean_error": None if curve.mean_error is None else round(curve.mean_error, 2),
+        }
+
+    @property
+    def icon(self):
+        return "mdi:chart-bell-curve"
+
+class JuwelHelialuxHistorySensor(HelialuxEntity, SensorEntity):
+    """Daily light figure (photoperiod, light integral, peak) over the last 24 hours.
+
+    Computed from the coordinator's channel history, so long-term statistics
+    don't need the recorder's history of the per-channel sensors.
+    """
+
+    _watched_fields = {"history"}
+    # The history records offline minutes as gaps, the figures stay valid
+    _live_state = False
+
+    def __init__(self, coordinator, tank_name, key):
+        super().__init__(coordinator)
+        tank_slug = slugify(tank_name)
+
+        self._attr_unique_id = f"{tank_slug}_{key}"
+        self.entity_id = f"sensor.{tank_slug}_{key}"
+
+        if key == "photoperiod":
+            self.entity_description = SensorEntityDescription(
+                key=key,
+                translation_key=key,
+                device_class=SensorDeviceClass.DURATION,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement=UnitOfTime.HOURS,
+                suggested_display_precision=1,
+                icon="mdi:theme-light-dark",
+            )
+        elif key == "peak_intensity":
+            self.entity_description = SensorEntityDescription(
+                key=key,
+                translation_key=key,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement="%",
+                icon="mdi:white-balance-sunny",
+            )
+        else:
+            self.entity_description = SensorEntityDescription(
+                key=key,
+                translation_key=key,
+                state_class=SensorStateClass.MEASUREMENT,
+                native_unit_of_measurement="%·h",
+                suggested_display_precision=0,
+                icon="mdi:sun-thermometer-outline",
+            )
+
+        self._attr_has_entity_name = True
+        self._attr_translation_placeholders = {"tank_name": tank_name}
+        self._attr_device_info = coordinator.device_info
+        # light_integral_<channel> -> index of the channel
+        self._channel = CHANNELS.index(key.rsplit("_", 1)[1]) if key.startswith("light_integral_") else None
+
+    @property
+    def native_value(self):
+        """Return the figure over the last 24 hours, None until there is any data."""
+        history = self.coordinator.history
+        if not history.covered_minutes:
+            return None
+        key = self.entity_description.key
+        if key == "photoperiod":
+            return round(history.photoperiod, 2)
+        if key == "peak_intensity":
+            return max(history.peak(channel) for channel in range(len(CHANNELS)))
+        return round(history.light_integral(self._channel), 1)
+
+    @property
+    def extra_state_attributes(self):
+        """Return how much of the window has data, and the peak of each channel."""
+        history = self.coordinator.history
+        attributes = {"covered_hours": round(history.covered, 1)}
+        if self.entity_description.key == "peak_intensity":
+            attributes.update(
+                {f"{name}_peak": history.peak(channel) for channel, name in enumerate(CHANNELS)}
+            )
+        return attributes
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up multiple sensor entities from a config entry."""
     tank_name = config_entry.data[CONF_TANK_NAME]
@@ -194,14 +332,12 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     # Get coordinator from hass.data
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
     
-    if coordinator.data is None:
-        coordinator.data = {}
-
-    await coordinator.async_config_entry_first_refresh()
+    # The coordinator already holds the first poll from entry setup
     _LOGGER.debug("Coordinator data before entity creation: %s", coordinator.data)
 
     main_sensor = JuwelHelialuxSensor(coordinator, tank_name)
     profiles_sensor = JuwelHelialuxProfilesSensor(coordinator, tank_name, "available_profiles")
+    prediction_sensor = JuwelHelialuxPredictionErrorSensor(coordinator, tank_name)
 
     attribute_sensors = [
         JuwelHelialuxAttributeSensor(coordinator, tank_name, "current_profile", default_value="offline"),
@@ -212,4 +348,9 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         JuwelHelialuxAttributeSensor(coordinator, tank_name, "device_time", default_value="00:00"),
     ]
 
-    async_add_entities([main_sensor, profiles_sensor] + attribute_sensors, True)
\ No newline at end of file
+    history_sensors = [
+        JuwelHelialuxHistorySensor(coordinator, tank_name, key)
+        for key in ("photoperiod", "peak_intensity", *(f"light_integral_{name}" for name in CHANNELS))
+    ]
+
+    async_add_entities([main_sensor, profiles_sensor, prediction_sensor] + attribute_sensors + history_sensors)
\ No newline at end of file
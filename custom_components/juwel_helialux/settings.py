@@ -0,0 +1,89 @@
+"""Runtime settings of one config entry, kept in a single store."""
+
+import asyncio
+import logging
+from collections.abc import MutableMapping
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SETTINGS_SAVE_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+SETTINGS_VERSION = 1
+# Settings that up to 2.0.7 each had their own store file, named after the number entity
+LEGACY_SETTINGS = (
+    "manual_color_simulation_duration",
+    "manual_daytime_simulation_duration",
+    "daytime_simulation_position",
+)
+
+
+class EntrySettings(MutableMapping):
+    """Dict of a config entry's settings, persisted in one store file.
+
+    Load it once with ``async_load`` when the entry is set up. Every change
+    schedules a delayed save, so a burst of changes (dragging a slider) ends
+    up as one write ``save_delay`` seconds after the last one. Home Assistant
+    writes pending delayed saves when it stops.
+    """
+
+    def __init__(self, hass, entry_id, save_delay=SETTINGS_SAVE_DELAY):
+        self._hass = hass
+        self._entry_id = entry_id
+        self._store = Store(hass, SETTINGS_VERSION, f"{DOMAIN}.{entry_id}.settings")
+        self._save_delay = save_delay
+        self._values = {}
+
+    async def async_load(self):
+        """Load the settings, migrating the old per-entity files on first run."""
+        data = await self._store.async_load()
+        if data is None:
+            data = await self._async_migrate_legacy()
+        self._values = dict(data or {})
+        _LOGGER.debug("Loaded settings for %s: %s", self._entry_id, self._values)
+
+    async def _async_migrate_legacy(self):
+        """Merge the old one-file-per-entity stores into this one and remove them."""
+        legacy = {
+            key: Store(self._hass, 1, f"{DOMAIN}_{self._entry_id}_{key}.json")
+            for key in LEGACY_SETTINGS
+        }
+        loaded = await asyncio.gather(*(store.async_load() for store in legacy.values()))
+        data = {
+            key: float(old["value"])
+            for key, old in zip(legacy, loaded)
+            if old and "value" in old
+        }
+        if not data:
+            return None
+
+        await self._store.async_save(data)
+        await asyncio.gather(
+            *(store.async_remove() for store, old in zip(legacy.values(), loaded) if old)
+        )
+        _LOGGER.info("Moved %s saved setting(s) of %s into one store", len(data), self._entry_id)
+        return data
+
+    async def async_remove(self):
+        """Delete the store, e.g. when the config entry is removed."""
+        await self._store.async_remove()
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        if key in self._values and self._values[key] == value:
+            return
+        self._values[key] = value
+        self._store.async_delay_save(lambda: dict(self._values), self._save_delay)
+
+    def __delitem__(self, key):
+        del self._values[key]
+        self._store.async_delay_save(lambda: dict(self._values), self._save_delay)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
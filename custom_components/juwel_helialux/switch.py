@@ -2,10 +2,14 @@ import logging
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.util import slugify
 from .const import DOMAIN
+from .entity import HelialuxEntity
 import asyncio
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds between stopping a running daytime simulation and starting it again
+RESTART_DELAY = 2
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up switches for Helialux via config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
@@ -17,14 +21,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
         HelialuxManualDaytimeSimulationSwitch(coordinator, tank_name, tank_id)
     ]
 
-    async_add_entities(switches, update_before_add=True)
+    async_add_entities(switches)
 
 
-class HelialuxSwitch(SwitchEntity):
+class HelialuxSwitch(HelialuxEntity, SwitchEntity):
     """Base class for Helialux switches."""
 
     def __init__(self, coordinator, tank_name, tank_id, attribute):
-        self.coordinator = coordinator
+        super().__init__(coordinator)
         self.tank_name = tank_name
         self.tank_id = tank_id
         self._state = False
@@ -48,10 +52,10 @@ class HelialuxSwitch(SwitchEntity):
         """Return True if switch is on."""
         return self._state
 
-    async def async_update(self):
-        """Update switch state from coordinator."""
-        await self.coordinator.async_refresh()
-        self._update_state()
+    def _apply_optimistic(self, success, **changes):
+        """Show the result of an accepted command until the next poll confirms it."""
+        if success:
+            self.coordinator.async_apply_optimistic(**changes)
 
     def _update_state(self):
         """Update internal state from coordinator data."""
@@ -61,6 +65,8 @@ class HelialuxSwitch(SwitchEntity):
 class HelialuxManualColorSimulationSwitch(HelialuxSwitch):
     """Switch for manual color simulation."""
 
+    _watched_fields = {"color_simulation"}
+
     def __init__(self, coordinator, tank_name, tank_id):
         super().__init__(coordinator, tank_name, tank_id, "manual_color_simulation")
 
@@ -84,34 +90,32 @@ class HelialuxManualColorSimulationSwitch(HelialuxSwitch):
                     duration_minutes = 720
 
             _LOGGER.debug(f"Starting manual color simulation for {duration_minutes} minutes")
-            await self.coordinator.helialux.start_manual_color_simulation(duration_minutes)
-            
-            # Set manual override to prevent updates during simulation
-            await self.coordinator.set_manual_override(True, duration_minutes * 60)  # Convert to seconds
-            await self.coordinator.async_refresh()
-            self._update_state()
-            
+            success = await self.coordinator.helialux.queue_color_simulation(True, duration_minutes)
+            self._apply_optimistic(success, color_simulation=True)
+
         except Exception as e:
             _LOGGER.error(f"Error starting manual color simulation: {e}")
             raise
 
     async def async_turn_off(self, **kwargs):
         """Turn off manual color simulation."""
-        await self.coordinator.helialux.stop_manual_color_simulation()
-        await self.coordinator.set_manual_override(False)
-        await self.coordinator.async_refresh()
-        self._update_state()
+        success = await self.coordinator.helialux.queue_color_simulation(False)
+        self._apply_optimistic(success, color_simulation=False)
 
     def _update_state(self):
         """Update the switch state based on coordinator data."""
-        self._state = self.coordinator.data.get("manualColorSimulationEnabled") == "On"
+        self._state = self.coordinator.data.color_simulation
 
 
 class HelialuxManualDaytimeSimulationSwitch(HelialuxSwitch):
     """Switch for manual daytime simulation (simulates time of day in fast motion)."""
 
+    _watched_fields = {"daytime_simulation"}
+
     def __init__(self, coordinator, tank_name, tank_id):
         super().__init__(coordinator, tank_name, tank_id, "manual_daytime_simulation")
+        # Counts turn on/off calls, so a pending restart can tell it was superseded
+        self._commands = 0
 
     async def async_turn_on(self, **kwargs):
         """Turn on manual daytime simulation."""
@@ -163,27 +167,29 @@ class HelialuxManualDaytimeSimulationSwitch(HelialuxSwitch):
 
             _LOGGER.debug(f"Starting manual daytime simulation at position {target_time_minutes} for duration {duration_formatted}")
             
+            helialux = self.coordinator.helialux
+            self._commands += 1
+            command = self._commands
+
             # First, ensure any existing simulation is completely stopped
             if self._state:
                 _LOGGER.debug("Daytime simulation already active, stopping first")
-                await self.coordinator.helialux.stop_manual_daytime_simulation()
-                await asyncio.sleep(2)
-            
+                await helialux.queue_daytime_simulation(False)
+                # Waited out here rather than in the command queue, so other
+                # commands to the controller aren't held up meanwhile
+                await asyncio.sleep(RESTART_DELAY)
+                if command != self._commands:
+                    _LOGGER.debug("Newer daytime simulation command arrived, not restarting")
+                    return
+
             # Start the simulation with both parameters
-            await self.coordinator.helialux.start_manual_daytime_simulation(
+            success = await helialux.queue_daytime_simulation(
+                True,
                 target_minutes=target_time_minutes,
                 duration=duration_formatted
             )
-            
-            # Force refreshes
-            await asyncio.sleep(1)
-            await self.coordinator.async_refresh()
-            self._update_state()
-            
-            await asyncio.sleep(0.5)
-            await self.coordinator.async_refresh()
-            self._update_state()
-            
+            self._apply_optimistic(success, daytime_simulation=True)
+
             _LOGGER.debug(f"State after turning ON: {self._state}")
             
         except Exception as e:
@@ -195,17 +201,10 @@ class HelialuxManualDaytimeSimulationSwitch(HelialuxSwitch):
         try:
             _LOGGER.debug("Attempting to turn OFF manual daytime simulation")
             
-            await self.coordinator.helialux.stop_manual_daytime_simulation()
-            
-            # Force multiple refreshes
-            await asyncio.sleep(1)
-            await self.coordinator.async_refresh()
-            self._update_state()
-            
-            await asyncio.sleep(0.5)
-            await self.coordinator.async_refresh()
-            self._update_state()
-            
+            self._commands += 1
+            success = await self.coordinator.helialux.queue_daytime_simulation(False)
+            self._apply_optimistic(success, daytime_simulation=False)
+
             _LOGGER.debug(f"State after turning OFF: {self._state}")
             
         except Exception as e:
@@ -215,8 +214,7 @@ class HelialuxManualDaytimeSimulationSwitch(HelialuxSwitch):
     def _update_state(self):
         """Update the switch state based on coordinator data."""
         old_state = self._state
-        raw_value = self.coordinator.data.get("manualDaytimeSimulationEnabled")
-        self._state = raw_value == "On"
-        
+        self._state = self.coordinator.data.daytime_simulation
+
         if old_state != self._state:
-            _LOGGER.debug(f"Daytime simulation state changed: {old_state} -> {self._state} (raw value: {raw_value})")
\ No newline at end of file
+            _LOGGER.debug(f"Daytime simulation state changed: {old_state} -> {self._state}")
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""Make pyhelialux and the integration importable for the tests.
+
+Most tests exercise the pyhelialux client library on its own, against the
+local emulator. Those of the integration's own modules run on the stand-ins
+in fixtures/hass_stub.py, so Home Assistant doesn't need to be installed.
+"""
+
+import os
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+COMPONENT = os.path.join(REPO_ROOT, "custom_components", "juwel_helialux")
+# Appended, not inserted: the integration's select.py would shadow the stdlib module
+sys.path.append(COMPONENT)
+sys.path.append(REPO_ROOT)
@@ -0,0 +1 @@
+"""Shared test data and stand-ins, also used by the benchmarks."""
@@ -0,0 +1,615 @@
+"""Stand-in for the parts of Home Assistant the tests and benchmarks drive.
+
+The integration's own modules (settings, coordinator, platforms) need Home
+Assistant. When it isn't installed, ``install()`` registers these small
+replacements under the ``homeassistant`` module names instead, so the tests
+of those modules and the Home Assistant scenarios of bench_polling.py and
+bench_settings.py still run.
+
+What they stand in for, and only as far as the integration uses it:
+
+* HomeAssistant - the running loop, hass.data, a config directory, tracked
+  tasks and a states dict written by async_write_ha_state
+* ConfigEntry / config_entries - entry setup forwarded to the platform
+  modules, which add their entities as Home Assistant would
+* Store - JSON files under <config>/.storage, with delayed saves flushed
+  when hass stops; every write goes through ``_write_data``
+* DataUpdateCoordinator / CoordinatorEntity - refresh, listeners, the
+  update_interval schedule and availability, as in Home Assistant
+* the entity base classes, enums and constants the platforms import
+
+What the scenarios measure is the integration's own behaviour: requests to
+the emulator, refreshes, state writes and store writes. None of that depends
+on Home Assistant's internals, but timings are without its state machine,
+event bus and recorder. Benchmark results record which one ran in
+"homeassistant" ("stub" or the installed version).
+"""
+
+import asyncio
+import enum
+import importlib
+import json
+import os
+import re
+import sys
+import types
+from datetime import datetime
+
+STUB = "stub"
+PACKAGES = ("homeassistant", "homeassistant.helpers", "homeassistant.components")
+
+
+def install(prefer_installed=True):
+    """Use the installed Home Assistant if there is one, else these stand-ins.
+
+    The tests pass ``prefer_installed=False`` to always run on the
+    stand-ins. Returns the Home Assistant version in use, or "stub".
+    """
+    if prefer_installed or sys.modules.get("homeassistant.const") is not None:
+        try:
+            from homeassistant.const import __version__
+        except ImportError:
+            pass
+        else:
+            return __version__
+    modules = _modules()
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        if name in PACKAGES:
+            module.__path__ = []  # so that its submodules can be imported
+        sys.modules[name] = module
+    for name in modules:
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, sys.modules[name])
+    return STUB
+
+
+# -- core ----------------------------------------------------------------------
+
+
+def callback(func):
+    """Mark a function as safe to run in the event loop."""
+    func._hass_callback = True
+    return func
+
+
+class State:
+    def __init__(self, entity_id, state, attributes):
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes
+
+
+class StateMachine(dict):
+    def async_set(self, entity_id, state, attributes=None):
+        self[entity_id] = State(entity_id, str(state), dict(attributes or {}))
+
+    def get(self, entity_id, default=None):
+        return super().get(entity_id, default)
+
+
+class Config:
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+
+    def path(self, *parts):
+        return os.path.join(self.config_dir, *parts)
+
+
+class HomeAssistant:
+    def __init__(self, config_dir):
+        self.config = Config(config_dir)
+        self.data = {}
+        self.states = StateMachine()
+        self.config_entries = ConfigEntries(self)
+        self._tasks = set()
+        self._stores = set()  # stores with a delayed save pending
+
+    @property
+    def loop(self):
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, target, name=None):
+        task = self.loop.create_task(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def async_block_till_done(self):
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def async_stop(self, force=False):
+        """Write pending delayed saves, like Home Assistant's final write."""
+        await self.async_block_till_done()
+        for store in list(self._stores):
+            await store._async_flush()
+
+
+class ConfigEntry:
+    def __init__(self, domain, entry_id, title, data, options=None, version=2, minor_version=2):
+        self.domain = domain
+        self.entry_id = entry_id
+        self.title = title
+        self.data = dict(data)
+        self.options = dict(options or {})
+        self.version = version
+        self.minor_version = minor_version
+        self._on_unload = []
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+
+class ConfigEntries:
+    """Forwards entry setup to the integration's platform modules."""
+
+    def __init__(self, hass):
+        self._hass = hass
+        self.entities = {}  # entry_id -> entities added by its platforms
+
+    def async_update_entry(self, entry, **changes):
+        for name, value in changes.items():
+            setattr(entry, name, value)
+        return True
+
+    async def async_forward_entry_setups(self, entry, platforms):
+        added = self.entities.setdefault(entry.entry_id, [])
+        for platform in platforms:
+            module = importlib.import_module(f"custom_components.{entry.domain}.{platform}")
+            new = []
+            refresh = []
+
+            def add_entities(entities, update_before_add=False):
+                new.extend(entities)
+                if update_before_add:
+                    refresh.extend(entities)
+
+            await module.async_setup_entry(self._hass, entry, add_entities)
+            for entity in new:
+                entity.hass = self._hass
+                if entity.entity_id is None:
+                    # Home Assistant makes one up from the name; the unique ID will do here
+                    entity.entity_id = f"{platform}.{slugify(entity.unique_id)}"
+                if entity in refresh:
+                    await entity.async_update()
+                await entity.async_added_to_hass()
+                entity.async_write_ha_state()
+            added.extend(new)
+
+    async def async_unload_platforms(self, entry, platforms):
+        for entity in self.entities.pop(entry.entry_id, []):
+            await entity.async_remove()
+        for func in entry._on_unload:
+            func()
+        return True
+
+
+# -- helpers.storage -----------------------------------------------------------
+
+
+class Store:
+    def __init__(self, hass, version, key, private=False, minor_version=1):
+        self.hass = hass
+        self.version = version
+        self.minor_version = minor_version
+        self.key = key
+        self._data_func = None
+        self._unsub_delay = None
+
+    @property
+    def path(self):
+        return self.hass.config.path(".storage", self.key)
+
+    async def async_load(self):
+        if self._data_func is not None:
+            return self._data_func()
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as file:
+            return json.load(file)["data"]
+
+    async def async_save(self, data):
+        self._cancel_delay()
+        self._write(data)
+
+    def async_delay_save(self, data_func, delay=0):
+        self._cancel_delay()
+        self._data_func = data_func
+        self._unsub_delay = self.hass.loop.call_later(
+            delay, lambda: self.hass.async_create_task(self._async_flush())
+        )
+        self.hass._stores.add(self)
+
+    async def async_remove(self):
+        self._cancel_delay()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _async_flush(self):
+        if self._data_func is not None:
+            data_func = self._data_func
+            self._cancel_delay()
+            self._write(data_func())
+
+    def _cancel_delay(self):
+        if self._unsub_delay is not None:
+            self._unsub_delay.cancel()
+            self._unsub_delay = None
+        self._data_func = None
+        self.hass._stores.discard(self)
+
+    def _write(self, data):
+        self._write_data(self.path, {
+            "version": self.version,
+            "minor_version": self.minor_version,
+            "key": self.key,
+            "data": data,
+        })
+
+    def _write_data(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+
+
+# -- helpers.event -------------------------------------------------------------
+
+
+def _run_action(hass, action):
+    result = action(datetime.now())
+    if asyncio.iscoroutine(result):
+        hass.async_create_task(result)
+
+
+def async_call_later(hass, delay, action):
+    handle = hass.loop.call_later(delay, _run_action, hass, action)
+    return handle.cancel
+
+
+def async_track_time_interval(hass, action, interval):
+    handle = None
+
+    def tick():
+        nonlocal handle
+        handle = hass.loop.call_later(interval.total_seconds(), tick)
+        _run_action(hass, action)
+
+    handle = hass.loop.call_later(interval.total_seconds(), tick)
+    return lambda: handle.cancel()
+
+
+# -- helpers.update_coordinator ------------------------------------------------
+
+
+class UpdateFailed(Exception):
+    """Raised by _async_update_data when the update failed."""
+
+
+class DataUpdateCoordinator:
+    def __init__(self, hass, logger, *, name, update_interval=None, update_method=None):
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.update_method = update_method
+        self.data = None
+        self.last_update_success = True
+        self.last_exception = None
+        self._listeners = {}
+        self._unsub_refresh = None
+        self._shutdown_requested = False
+
+    def async_add_listener(self, update_callback, context=None):
+        schedule = not self._listeners
+
+        def remove_listener():
+            self._listeners.pop(remove_listener, None)
+            if not self._listeners:
+                self._unschedule_refresh()
+
+        self._listeners[remove_listener] = (update_callback, context)
+        if schedule:
+            self._schedule_refresh()
+        return remove_listener
+
+    def async_update_listeners(self):
+        for update_callback, _ in list(self._listeners.values()):
+            update_callback()
+
+    def _schedule_refresh(self):
+        if self.update_interval is None or self._shutdown_requested:
+            return
+        self._unschedule_refresh()
+        self._unsub_refresh = self.hass.loop.call_later(
+            self.update_interval.total_seconds(),
+            lambda: self.hass.async_create_task(self.async_refresh()),
+        )
+
+    def _unschedule_refresh(self):
+        if self._unsub_refresh is not None:
+            self._unsub_refresh.cancel()
+            self._unsub_refresh = None
+
+    async def _async_update_data(self):
+        return await self.update_method()
+
+    async def async_config_entry_first_refresh(self):
+        await self.async_refresh()
+
+    async def async_request_refresh(self):
+        await self.async_refresh()
+
+    async def async_refresh(self):
+        self._unschedule_refresh()
+        try:
+            self.data = await self._async_update_data()
+        except UpdateFailed as err:
+            self.last_exception = err
+            if self.last_update_success:
+                self.logger.error("Error fetching %s data: %s", self.name, err)
+            self.last_update_success = False
+        else:
+            self.last_update_success = True
+        if self._listeners:
+            self._schedule_refresh()
+        self.async_update_listeners()
+
+    def async_set_updated_data(self, data):
+        self._unschedule_refresh()
+        self.data = data
+        self.last_update_success = True
+        if self._listeners:
+            self._schedule_refresh()
+        self.async_update_listeners()
+
+    async def async_shutdown(self):
+        self._shutdown_requested = True
+        self._unschedule_refresh()
+
+
+# -- entities ------------------------------------------------------------------
+
+
+class EntityCategory(enum.StrEnum):
+    CONFIG = "config"
+    DIAGNOSTIC = "diagnostic"
+
+
+class Entity:
+    hass = None
+    entity_id = None
+    entity_description = None
+    _attr_name = None
+    _attr_unique_id = None
+    _attr_available = True
+    _attr_icon = None
+    _attr_device_info = None
+    _attr_should_poll = True
+    _attr_extra_state_attributes = None
+
+    @property
+    def name(self):
+        return self._attr_name
+
+    @property
+    def unique_id(self):
+        return self._attr_unique_id
+
+    @property
+    def available(self):
+        return self._attr_available
+
+    @property
+    def icon(self):
+        return self._attr_icon
+
+    @property
+    def device_info(self):
+        return self._attr_device_info
+
+    @property
+    def should_poll(self):
+        return self._attr_should_poll
+
+    @property
+    def state(self):
+        return None
+
+    @property
+    def extra_state_attributes(self):
+        return self._attr_extra_state_attributes
+
+    async def async_added_to_hass(self):
+        pass
+
+    def async_on_remove(self, func):
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    async def async_remove(self):
+        for func in self.__dict__.pop("_on_remove", []):
+            func()
+
+    def async_write_ha_state(self):
+        """Build the state and attributes and store them, as Home Assistant does."""
+        state = self.state if self.available else "unavailable"
+        attributes = dict(self.extra_state_attributes or {})
+        self.hass.states.async_set(self.entity_id, "unknown" if state is None else state, attributes)
+
+
+class ToggleEntity(Entity):
+    _attr_is_on = None
+
+    @property
+    def is_on(self):
+        return self._attr_is_on
+
+    @property
+    def state(self):
+        is_on = self.is_on
+        return None if is_on is None else ("on" if is_on else "off")
+
+
+class CoordinatorEntity(Entity):
+    _attr_should_poll = False
+
+    def __init__(self, coordinator, context=None):
+        self.coordinator = coordinator
+        self.coordinator_context = context
+
+    @property
+    def available(self):
+        return self.coordinator.last_update_success
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update, self.coordinator_context)
+        )
+
+    @callback
+    def _handle_coordinator_update(self):
+        self.async_write_ha_state()
+
+    async def async_update(self):
+        await self.coordinator.async_request_refresh()
+
+
+class EntityDescription:
+    def __init__(self, key, **fields):
+        self.key = key
+        self.__dict__.update(fields)
+
+
+class SensorDeviceClass(enum.StrEnum):
+    DURATION = "duration"
+
+
+class SensorStateClass(enum.StrEnum):
+    MEASUREMENT = "measurement"
+
+
+class SensorEntity(Entity):
+    _attr_native_value = None
+
+    @property
+    def native_value(self):
+        return self._attr_native_value
+
+    @property
+    def state(self):
+        return self.native_value
+
+
+class ColorMode(enum.StrEnum):
+    RGBW = "rgbw"
+
+
+class LightEntityFeature(enum.IntFlag):
+    TRANSITION = 32
+
+
+class LightEntity(ToggleEntity):
+    _attr_brightness = None
+    _attr_rgbw_color = None
+
+    @property
+    def brightness(self):
+        return self._attr_brightness
+
+    @property
+    def rgbw_color(self):
+        return self._attr_rgbw_color
+
+
+class SelectEntity(Entity):
+    _attr_current_option = None
+    _attr_options = []
+
+    @property
+    def current_option(self):
+        return self._attr_current_option
+
+    @property
+    def options(self):
+        return self._attr_options
+
+    @property
+    def state(self):
+        return self.current_option
+
+
+class NumberEntity(Entity):
+    _attr_native_value = None
+
+    @property
+    def native_value(self):
+        return self._attr_native_value
+
+    @property
+    def state(self):
+        return self.native_value
+
+
+class UnitOfTime(enum.StrEnum):
+    MINUTES = "min"
+    HOURS = "h"
+
+
+class DeviceRegistry:
+    def async_get_device(self, identifiers=None, connections=None):
+        return None
+
+
+def slugify(text, *, separator="_"):
+    return re.sub(r"[^a-z0-9]+", separator, text.lower()).strip(separator)
+
+
+def _modules():
+    return {
+        "homeassistant": {},
+        "homeassistant.const": {"__version__": STUB, "UnitOfTime": UnitOfTime},
+        "homeassistant.core": {"HomeAssistant": HomeAssistant, "State": State, "callback": callback},
+        "homeassistant.config_entries": {"ConfigEntry": ConfigEntry},
+        "homeassistant.util": {"slugify": slugify},
+        "homeassistant.helpers": {},
+        "homeassistant.helpers.device_registry": {
+            "DeviceInfo": dict,
+            "async_get": lambda hass: DeviceRegistry(),
+        },
+        "homeassistant.helpers.entity": {"Entity": Entity, "EntityCategory": EntityCategory},
+        "homeassistant.helpers.entity_platform": {"AddEntitiesCallback": object},
+        "homeassistant.helpers.event": {
+            "async_call_later": async_call_later,
+            "async_track_time_interval": async_track_time_interval,
+        },
+        "homeassistant.helpers.issue_registry": {},
+        "homeassistant.helpers.storage": {"Store": Store},
+        "homeassistant.helpers.update_coordinator": {
+            "CoordinatorEntity": CoordinatorEntity,
+            "DataUpdateCoordinator": DataUpdateCoordinator,
+            "UpdateFailed": UpdateFailed,
+        },
+        "homeassistant.components": {},
+        "homeassistant.components.binary_sensor": {"BinarySensorEntity": ToggleEntity},
+        "homeassistant.components.light": {
+            "ATTR_TRANSITION": "transition",
+            "ColorMode": ColorMode,
+            "LightEntity": LightEntity,
+            "LightEntityFeature": LightEntityFeature,
+        },
+        "homeassistant.components.number": {"NumberEntity": NumberEntity},
+        "homeassistant.components.select": {"SelectEntity": SelectEntity},
+        "homeassistant.components.sensor": {
+            "SensorDeviceClass": SensorDeviceClass,
+            "SensorEntity": SensorEntity,
+            "SensorEntityDescription": EntityDescription,
+            "SensorStateClass": SensorStateClass,
+        },
+        "homeassistant.components.switch": {"SwitchEntity": ToggleEntity},
+    }
@@ -0,0 +1,87 @@
+"""Conformance corpus for the JavaScript variable file parser.
+
+Shared by tests/test_jsvars.py and benchmarks/bench_jsvars.py. STATUSVARS,
+WPVARS and DEVVARS are payloads as real controllers send them.
+"""
+
+from pyhelialux.jsvars import JSVarsError
+
+STATUSVARS = (
+    "lang=0;lamp='4Ch';profNum=1;profile='Standard';tsimtime=845;tsimact=0;"
+    "csimact=0;brightness=[52,61,30,20];times=[540,600,1140,1320];"
+)
+WPVARS = (
+    'profnum=4;profnames=["Standard","Plants","Night","Holiday"];'
+    "profsel=[1,0,0,0];weekprof=[0,0,0,0,0,0,0];"
+)
+DEVVARS = "info=['HeliaLux SmartControl','V2.0','V2.2.2','192.168.1.50','A0:B1:C2:D3:E4:F5'];"
+
+# (payload, expected result, or JSVarsError if the payload must be rejected)
+CORPUS = [
+    ("a=1;", {"a": 1}),
+    ("a = 1 ;\n b='x' ;", {"a": 1, "b": "x"}),
+    ("a=-5;", {"a": -5}),
+    ("s='';", {"s": ""}),
+    ('s="double";', {"s": "double"}),
+    ("s='a, b; c';", {"s": "a, b; c"}),
+    ("s='it\\'s';", {"s": "it's"}),
+    ("s='tab\\there';", {"s": "tab\there"}),
+    ("l=[];", {"l": []}),
+    ("l=[ ];", {"l": []}),
+    ("l=[1,2,3];", {"l": [1, 2, 3]}),
+    ("l=[ 1 , 2 ];", {"l": [1, 2]}),
+    ('l=["a,b","c"];', {"l": ["a,b", "c"]}),
+    ('l=["a]b"];', {"l": ["a]b"]}),
+    ("l=['x','y'];", {"l": ["x", "y"]}),
+    ("l=[1,'x'];", {"l": [1, "x"]}),
+    ("var v=3;", {"v": 3}),
+    ("a_b=1;$c=2;", {"a_b": 1, "$c": 2}),
+    ("a=1", {"a": 1}),
+    ("a=1;\r\n", {"a": 1}),
+    ("p='Nuit détente';", {"p": "Nuit détente"}),
+    # Plain statements around ones the tokenizer has to read
+    ("l=['a','b'];s=\"x;y\";n=3;", {"l": ["a", "b"], "s": "x;y", "n": 3}),
+    (
+        "p='Nuit détente';l=[ 1 ];q='é;x';n=2;",
+        {"p": "Nuit détente", "l": [1], "q": "é;x", "n": 2},
+    ),
+    (
+        STATUSVARS,
+        {
+            "lang": 0,
+            "lamp": "4Ch",
+            "profNum": 1,
+            "profile": "Standard",
+            "tsimtime": 845,
+            "tsimact": 0,
+            "csimact": 0,
+            "brightness": [52, 61, 30, 20],
+            "times": [540, 600, 1140, 1320],
+        },
+    ),
+    (
+        WPVARS,
+        {
+            "profnum": 4,
+            "profnames": ["Standard", "Plants", "Night", "Holiday"],
+            "profsel": [1, 0, 0, 0],
+            "weekprof": [0, 0, 0, 0, 0, 0, 0],
+        },
+    ),
+    (
+        DEVVARS,
+        {"info": ["HeliaLux SmartControl", "V2.0", "V2.2.2", "192.168.1.50", "A0:B1:C2:D3:E4:F5"]},
+    ),
+    ("a=;", JSVarsError),
+    ("a=[1,;", JSVarsError),
+    ("a=[1 2];", JSVarsError),
+    ("a='open;", JSVarsError),
+    ("a='x' b;", JSVarsError),
+    ("a=1 b=2;", JSVarsError),
+    ("=1;", JSVarsError),
+    ("a=@;", JSVarsError),
+    ("l=[1,2,x];", JSVarsError),
+    ("s='a'b';", JSVarsError),
+    ("l=['a''b'];", JSVarsError),
+    ("a", JSVarsError),
+]
@@ -0,0 +1,142 @@
+"""Circuit breaker against an emulator that drops connections."""
+
+import asyncio
+
+import pytest
+
+from pyhelialux.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.pool import SessionPool
+from pyhelialux.pyHelialux import Controller
+
+BASE_DELAY = 5
+MAX_DELAY = 60
+JITTER = 0.2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock):
+    return CircuitBreaker(
+        failure_threshold=3, base_delay=BASE_DELAY, max_delay=MAX_DELAY, jitter=JITTER, clock=clock
+    )
+
+
+def _statusvars_requests(emulator):
+    return emulator.requests.get("/statusvars.js", 0)
+
+
+def test_open_half_open_close():
+    async def run():
+        clock = FakeClock()
+        breaker = _breaker(clock)
+        async with HelialuxEmulator(drop_rate=1.0) as emulator:
+            async with Controller(emulator.url, pool=SessionPool(), breaker=breaker) as controller:
+                # Closed: every request reaches the device until the threshold
+                for _ in range(3):
+                    assert breaker.state == CLOSED
+                    assert await controller.get_status() is None
+                assert breaker.state == OPEN
+                # aiohttp may retry a dropped GET once, so only compare counts
+                sent = _statusvars_requests(emulator)
+                assert sent >= 3
+
+                # Open: requests fail without touching the network
+                assert await controller.get_status() is None
+                assert _statusvars_requests(emulator) == sent
+                assert breaker.rejected == 1
+
+                # Half-open: one trial, which fails and reopens for longer
+                first_delay = breaker.retry_in
+                clock.now += first_delay
+                assert breaker.state == HALF_OPEN
+                assert await controller.get_status() is None
+                assert _statusvars_requests(emulator) > sent
+                assert breaker.state == OPEN
+                assert breaker.retry_in > first_delay
+
+                # The controller comes back: the next trial closes the breaker
+                emulator.drop_rate = 0.0
+                clock.now += breaker.retry_in
+                assert breaker.state == HALF_OPEN
+                assert await controller.get_status() is not None
+                assert breaker.state == CLOSED
+                sent = _statusvars_requests(emulator)
+                assert await controller.get_status() is not None
+                assert _statusvars_requests(emulator) == sent + 1
+
+    asyncio.run(run())
+
+
+def test_half_open_lets_one_trial_through():
+    async def run():
+        clock = FakeClock()
+        breaker = _breaker(clock)
+        async with HelialuxEmulator() as emulator:
+            emulator.offline = True
+            async with Controller(emulator.url, pool=SessionPool(), breaker=breaker) as controller:
+                for _ in range(3):
+                    await controller.get_status()
+                assert breaker.state == OPEN
+
+                emulator.offline = False
+                clock.now += breaker.retry_in
+                before = sum(emulator.requests.values())
+                snapshot = await controller.get_snapshot()
+                # statusvars.js and wpvars.js are fetched together; only one may be the trial
+                assert sum(emulator.requests.values()) == before + 1
+                assert snapshot.status_ok != snapshot.profiles_ok
+                assert breaker.state == CLOSED
+
+    asyncio.run(run())
+
+
+def test_open_breaker_fails_writes_fast():
+    async def run():
+        async with HelialuxEmulator(latency=0.5) as emulator:
+            emulator.offline = True
+            breaker = CircuitBreaker(failure_threshold=1, base_delay=BASE_DELAY)
+            async with Controller(emulator.url, pool=SessionPool(), breaker=breaker) as controller:
+                assert await controller.get_status() is None
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                assert not await controller.set_manual_color(10, 10, 10, 10)
+                assert loop.time() - started < 0.1
+                assert "/stat" not in emulator.requests
+
+    asyncio.run(run())
+
+
+def _opened_times(times):
+    """Return a breaker that has just opened ``times`` times in a row."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    for _ in range(times - 1):
+        clock.now += breaker.retry_in
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+@pytest.mark.parametrize("times", range(1, 9))
+def test_backoff_jitter_bounds(times):
+    # Doubles from BASE_DELAY each time, capped at MAX_DELAY, +/- JITTER
+    expected = min(MAX_DELAY, BASE_DELAY * 2 ** (times - 1))
+    for _ in range(50):
+        retry_in = _opened_times(times).retry_in
+        assert expected * (1 - JITTER) <= retry_in <= expected * (1 + JITTER)
+
+
+def test_jitter_spreads_retries():
+    delays = set()
+    for _ in range(20):
+        delays.add(round(_opened_times(1).retry_in, 6))
+    assert len(delays) > 1
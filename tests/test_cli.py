@@ -0,0 +1,67 @@
+"""The command-line tool, run the way the README says, against the emulator."""
+
+import asyncio
+import json
+import sys
+
+from conftest import COMPONENT
+from pyhelialux.emulator import HelialuxEmulator
+
+
+async def _cli(*args):
+    # From the integration's folder, where its select.py sits next to pyhelialux
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "pyhelialux", *args,
+        cwd=COMPONENT,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode(), stderr.decode()
+
+
+def _host(emulator):
+    return emulator.url.split("://", 1)[1]
+
+
+def test_status_and_info_for_two_tanks():
+    async def run():
+        async with HelialuxEmulator() as first, HelialuxEmulator(lamp="2Ch") as second:
+            hosts = [_host(first), _host(second)]
+            returncode, stdout, stderr = await _cli("status", *hosts)
+            assert returncode == 0, stderr
+            records = {record["host"]: record for record in map(json.loads, stdout.splitlines())}
+            assert set(records) == set(hosts)
+            for emulator, host in ((first, hosts[0]), (second, hosts[1])):
+                assert records[host]["ok"]
+                assert records[host]["current_profile"] == emulator.profile.name
+                assert records[host]["lamp"] == emulator.lamp
+
+            returncode, stdout, stderr = await _cli("info", hosts[0], "--format", "csv")
+            assert returncode == 0, stderr
+            header, row = stdout.splitlines()
+            assert dict(zip(header.split(","), row.split(",")))["mac_address"] == first.info[-1]
+
+    asyncio.run(run())
+
+
+def test_set_profile_and_failed_host():
+    async def run():
+        async with HelialuxEmulator() as emulator:
+            target = emulator.profiles[1].name
+            offline = HelialuxEmulator()
+            await offline.start()
+            offline.offline = True
+            try:
+                returncode, stdout, stderr = await _cli(
+                    "set-profile", target, _host(emulator), _host(offline), "--timeout", "2"
+                )
+            finally:
+                await offline.stop()
+            records = {record["host"]: record for record in map(json.loads, stdout.splitlines())}
+            assert returncode == 1
+            assert records[_host(emulator)]["ok"]
+            assert not records[_host(offline)]["ok"]
+            assert emulator.profile.name == target
+
+    asyncio.run(run())
@@ -0,0 +1,81 @@
+"""Command queue: coalescing per kind against the emulator."""
+
+import asyncio
+
+from pyhelialux.commands import CommandQueue
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.pool import SessionPool
+from pyhelialux.pyHelialux import Controller
+
+DEBOUNCE = 0.05
+
+
+def test_same_kind_is_coalesced():
+    async def run():
+        queue = CommandQueue(debounce=DEBOUNCE)
+        sent = []
+
+        def command(value):
+            async def send():
+                sent.append(value)
+                return value
+            return send
+
+        results = await asyncio.gather(*(queue.submit("colour", command(i)) for i in range(5)))
+        assert sent == [4]
+        assert results == [4] * 5
+        assert queue.coalesced == 4
+
+    asyncio.run(run())
+
+
+def test_position_does_not_replace_a_queued_start():
+    async def run():
+        async with HelialuxEmulator(start_minutes=300) as emulator:
+            async with Controller(emulator.url, pool=SessionPool(), command_debounce=DEBOUNCE) as controller:
+                started, moved = await asyncio.gather(
+                    controller.queue_daytime_simulation(True, 600),
+                    controller.queue_daytime_simulation_position(700),
+                )
+                assert started and moved
+                assert emulator.daytime_simulation
+                assert "tsimtime=700;" in emulator.statusvars()
+
+    asyncio.run(run())
+
+
+def test_stop_drops_a_queued_position():
+    async def run():
+        async with HelialuxEmulator(start_minutes=300) as emulator:
+            async with Controller(emulator.url, pool=SessionPool(), command_debounce=DEBOUNCE) as controller:
+                assert await controller.queue_daytime_simulation(True, 600)
+                moved, stopped = await asyncio.gather(
+                    controller.queue_daytime_simulation_position(700),
+                    controller.queue_daytime_simulation(False),
+                )
+                assert moved is False
+                assert stopped
+                assert not emulator.daytime_simulation
+
+    asyncio.run(run())
+
+
+def test_colour_after_daytime_simulation_restarts_colour_simulation():
+    async def run():
+        async with HelialuxEmulator(start_minutes=300) as emulator:
+            async with Controller(emulator.url, pool=SessionPool(), command_debounce=DEBOUNCE) as controller:
+                assert await controller.queue_manual_color(10, 20, 30, 40)
+                assert controller.color_simulation_active
+                # Starting daytime simulation sends cswi=false, ending colour simulation
+                assert await controller.queue_daytime_simulation(True, 600)
+                assert not emulator.color_simulation
+                assert not controller.color_simulation_active
+
+                posts = emulator.requests["/stat"]
+                assert await controller.queue_manual_color(50, 60, 70, 80)
+                # The colour simulation start and then the colour
+                assert emulator.requests["/stat"] == posts + 2
+                assert emulator.color_simulation
+                assert emulator.channels == (50, 60, 70, 80)
+
+    asyncio.run(run())
@@ -0,0 +1,111 @@
+"""Learned profile curves: interpolation, midnight, and the prediction error."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from fixtures import hass_stub
+
+hass_stub.install(prefer_installed=False)
+
+from custom_components.juwel_helialux.sensor import JuwelHelialuxPredictionErrorSensor  # noqa: E402
+from pyhelialux.curve import (  # noqa: E402
+    ERROR_SMOOTHING,
+    MAX_SAMPLE_GAP,
+    PREDICTION_TOLERANCE,
+    CurveModel,
+    ProfileCurve,
+)
+
+PROFILE = "Plants"
+# Sunrise 8:00-9:00, full until 18:00, sunset until 19:00
+TIMES = (8 * 60, 9 * 60, 18 * 60, 19 * 60)
+
+
+def test_levels_between_samples_are_interpolated():
+    curve = ProfileCurve(PROFILE, TIMES)
+    curve.learn(8 * 60, (0, 0, 0, 0))
+    curve.learn(9 * 60, (100, 60, 30, 0))
+    assert curve.predict(8 * 60 + 30) == (50, 30, 15, 0)
+    assert curve.predict(8 * 60 + 15) == (25, 15, 8, 0)
+    # Polled minutes are returned as they were seen
+    assert curve.predict(9 * 60) == (100, 60, 30, 0)
+
+
+def test_no_prediction_across_a_time_point():
+    curve = ProfileCurve(PROFILE, TIMES)
+    curve.learn(8 * 60 + 30, (50, 30, 15, 0))
+    curve.learn(12 * 60, (100, 60, 30, 0))
+    # The curve bends at 9:00, so a straight line from 8:30 would be wrong
+    assert curve.predict(8 * 60 + 45) is None
+    assert curve.predict(10 * 60) is None
+    curve.learn(9 * 60, (100, 60, 30, 0))
+    assert curve.predict(10 * 60) == (100, 60, 30, 0)
+
+
+def test_without_time_points_only_close_samples_are_interpolated():
+    curve = ProfileCurve(PROFILE)
+    curve.learn(600, (0, 0, 0, 0))
+    curve.learn(600 + MAX_SAMPLE_GAP, (30, 0, 0, 0))
+    curve.learn(700, (30, 0, 0, 0))
+    assert curve.predict(600 + 10) == (10, 0, 0, 0)
+    assert curve.predict(650) is None
+    assert ProfileCurve(PROFILE).predict(600) is None
+
+
+def test_curve_wraps_past_midnight():
+    # Moonlight from 23:00 to 1:00, dimming to off at 1:00
+    curve = ProfileCurve(PROFILE, (23 * 60, 60))
+    curve.learn(23 * 60 + 40, (0, 40, 0, 0))
+    curve.learn(20, (0, 20, 0, 0))
+    assert curve.predict(0) == (0, 30, 0, 0)
+    assert curve.predict(1440) == curve.predict(0)
+    assert curve.predict(23 * 60 + 50) == (0, 35, 0, 0)
+    # Time points given past midnight are folded into the day
+    assert ProfileCurve(PROFILE, (1440 + 60, 23 * 60)).times == (60, 23 * 60)
+
+
+def test_prediction_error_statistics():
+    model = CurveModel()
+    assert model.observe(PROFILE, 8 * 60, (0, 0, 0, 0), TIMES) is None
+    assert model.observe(PROFILE, 9 * 60, (100, 60, 30, 0), TIMES) is None
+    assert model.last_error is None and model.hits == model.misses == 0
+
+    # Predicted (50, 30, 15, 0); the controller rounds differently
+    assert model.observe(PROFILE, 8 * 60 + 30, (51, 30, 14, 0), TIMES) == 1
+    assert (model.hits, model.misses, model.last_error, model.mean_error) == (1, 0, 1, 1)
+
+    # Predicted (76, 45, 22, 0) from 8:30 and 9:00, saw a channel 10 points off
+    error = model.observe(PROFILE, 8 * 60 + 45, (66, 45, 22, 0), TIMES)
+    assert error == 10 > PREDICTION_TOLERANCE
+    assert (model.hits, model.misses, model.last_error) == (1, 1, 10)
+    assert model.mean_error == pytest.approx(1 + ERROR_SMOOTHING * (10 - 1))
+    assert model.as_dict()["profiles"][PROFILE] == {"samples": 4, "times": list(TIMES)}
+
+
+def test_edited_profile_is_relearned():
+    model = CurveModel()
+    model.observe(PROFILE, 8 * 60, (0, 0, 0, 0), TIMES)
+    model.observe(PROFILE, 9 * 60, (100, 60, 30, 0), TIMES)
+    # The same minute now shows different levels: start over from this sample
+    assert model.observe(PROFILE, 9 * 60, (80, 60, 30, 0), TIMES) == 20
+    assert model.as_dict()["profiles"][PROFILE]["samples"] == 1
+    assert model.predict(PROFILE, 9 * 60) == (80, 60, 30, 0)
+    # New time points also start over
+    model.observe(PROFILE, 9 * 60, (80, 60, 30, 0), (7 * 60, 9 * 60))
+    assert model.as_dict()["profiles"][PROFILE] == {"samples": 1, "times": [7 * 60, 9 * 60]}
+    assert model.predict("Other", 9 * 60) is None
+
+
+def test_sensor_reports_the_prediction_error():
+    model = CurveModel()
+    coordinator = SimpleNamespace(curve=model, device_info={})
+    sensor = JuwelHelialuxPredictionErrorSensor(coordinator, "Test tank")
+    assert sensor.native_value is None
+
+    model.observe(PROFILE, 8 * 60, (0, 0, 0, 0), TIMES)
+    model.observe(PROFILE, 9 * 60, (100, 60, 30, 0), TIMES)
+    model.observe(PROFILE, 8 * 60 + 45, (65, 45, 23, 0), TIMES)
+    assert sensor.native_value == 10
+    assert sensor.extra_state_attributes == {"hits": 0, "misses": 1, "mean_error": 10}
+    assert sensor.unique_id == "test_tank_prediction_error"
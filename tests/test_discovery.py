@@ -0,0 +1,33 @@
+"""Identifying a controller by its address, as the manual config step does."""
+
+import asyncio
+import socket
+
+from pyhelialux.discovery import identify_host, normalize_mac
+from pyhelialux.emulator import HelialuxEmulator
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_identify_host_reads_the_mac_from_devvars():
+    async def run():
+        async with HelialuxEmulator() as emulator:
+            host = emulator.url.split("://", 1)[1]
+            controller = await identify_host(host)
+            assert controller is not None
+            assert controller.host == host
+            assert controller.mac_address == normalize_mac(emulator.info[-1])
+            assert emulator.requests == {"/devvars.js": 1}
+
+    asyncio.run(run())
+
+
+def test_identify_host_returns_none_when_nothing_answers():
+    async def run():
+        assert await identify_host(f"127.0.0.1:{_free_port()}", timeout=1) is None
+
+    asyncio.run(run())
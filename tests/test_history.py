@@ -0,0 +1,128 @@
+"""ChannelHistory: rolling daily figures over a 24h ring, and keeping it across restarts."""
+
+import asyncio
+
+import pytest
+
+from fixtures import hass_stub
+
+hass_stub.install(prefer_installed=False)
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.juwel_helialux.history import HistoryStore  # noqa: E402
+from pyhelialux.curve import MINUTES_PER_DAY  # noqa: E402
+from pyhelialux.history import ChannelHistory  # noqa: E402
+
+START = 29_000_000  # minutes since the epoch, a little after midnight UTC
+OFF = (0, 0, 0, 0)
+MOON = (0, 5, 0, 0)
+DAY = (80, 60, 40, 20)
+
+
+def _step_day(history, start):
+    """Record one day: lights off until 8:00, on until 18:00, moonlight after."""
+    history.record(start, OFF)
+    history.record(start + 8 * 60, DAY)
+    history.record(start + 18 * 60, MOON)
+    history.record(start + MINUTES_PER_DAY - 1, MOON)
+
+
+def test_empty_history():
+    history = ChannelHistory()
+    assert history.minute is None
+    assert history.covered == 0
+    assert history.photoperiod == 0
+    assert [history.light_integral(channel) for channel in range(4)] == [0, 0, 0, 0]
+    assert [history.peak(channel) for channel in range(4)] == [0, 0, 0, 0]
+    assert ChannelHistory.restore(history.dump()).as_dict() == history.as_dict()
+
+
+def test_integral_of_a_step_profile():
+    history = ChannelHistory()
+    _step_day(history, START)
+    assert history.covered == 24
+    assert history.photoperiod == 10  # moonlight doesn't count
+    # Ten hours at 80% is 800 %·h; the moonlight adds 6h at 5% on blue
+    assert [history.light_integral(channel) for channel in range(4)] == [800, 630, 400, 200]
+    assert [history.peak(channel) for channel in range(4)] == list(DAY)
+
+
+def test_integral_matches_a_recount_after_a_day_of_random_samples():
+    history = ChannelHistory()
+    levels = [(minute * 7 % 101, minute % 50, 0, minute * 3 % 101) for minute in range(3000)]
+    for minute in range(0, 3000, 7):
+        history.record(START + minute, levels[minute])
+    # The last day up to the newest sample, each minute with the levels of
+    # the last sample at or before it
+    newest = history.minute - START
+    window = [levels[minute - minute % 7] for minute in range(newest - MINUTES_PER_DAY + 1, newest + 1)]
+    for channel in range(4):
+        assert history.light_integral(channel) == pytest.approx(
+            sum(sample[channel] for sample in window) / 60
+        )
+        assert history.peak(channel) == max(sample[channel] for sample in window)
+
+
+def test_minutes_leave_the_window_after_24h():
+    history = ChannelHistory()
+    _step_day(history, START)
+    # The next day stays dark: the bright hours leave the ring one by one,
+    # until 12:00 of the first day is the oldest minute left
+    history.record(START + MINUTES_PER_DAY + 12 * 60 - 1, OFF)
+    assert history.covered == 24
+    assert history.photoperiod == pytest.approx(6)
+    assert history.light_integral(0) == pytest.approx(6 * 80)
+    assert history.peak(0) == 80
+
+    history.record(START + MINUTES_PER_DAY + 18 * 60 - 1, OFF)
+    assert history.photoperiod == 0
+    assert history.light_integral(0) == 0
+    assert history.peak(0) == 0  # the peak drops once its last minute has left
+    assert history.peak(1) == 5
+
+
+def test_gap_of_more_than_a_day_starts_over():
+    history = ChannelHistory()
+    _step_day(history, START)
+    history.record(START + 3 * MINUTES_PER_DAY, DAY)
+    assert history.covered_minutes == 1
+    assert history.light_integral(0) == pytest.approx(80 / 60)
+
+
+def test_unknown_levels_and_old_samples():
+    history = ChannelHistory()
+    history.record(START, DAY)
+    history.record(START + 60, None)  # controller unreachable
+    history.record(START + 120, DAY)
+    assert history.covered_minutes == 61
+    history.record(START + 30, OFF)  # older than the newest minute: ignored
+    assert history.covered_minutes == 61
+
+
+def test_store_keeps_the_history_across_restarts(tmp_path):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        store = HistoryStore(hass, "entry", save_delay=0.05)
+        await store.async_load()
+        assert store.history.minute is None
+        _step_day(store.history, START)
+        store.async_schedule_save()
+        store.async_schedule_save()  # already due, not pushed back
+        await asyncio.sleep(0.15)
+        await hass.async_block_till_done()
+
+        reloaded = HistoryStore(hass, "entry")
+        await reloaded.async_load()
+        assert reloaded.history.as_dict() == store.history.as_dict()
+        # Recording goes on where it left off
+        reloaded.history.record(START + MINUTES_PER_DAY + 12 * 60 - 1, OFF)
+        assert reloaded.history.photoperiod == pytest.approx(6)
+
+        await reloaded.async_remove()
+        empty = HistoryStore(hass, "entry")
+        await empty.async_load()
+        assert empty.history.minute is None
+        await hass.async_stop()
+
+    asyncio.run(run())
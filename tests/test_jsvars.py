@@ -0,0 +1,46 @@
+"""The JavaScript variable file parser against its conformance corpus."""
+
+import pytest
+
+from fixtures.jsvars_corpus import CORPUS
+from pyhelialux.jsvars import JSVarsError, parse_js_vars
+
+
+@pytest.mark.parametrize("payload, expected", CORPUS)
+def test_corpus(payload, expected):
+    if expected is JSVarsError:
+        with pytest.raises(JSVarsError):
+            parse_js_vars(payload)
+        return
+    assert parse_js_vars(payload) == expected
+    assert parse_js_vars(payload.encode("utf-8")) == expected
+
+
+@pytest.mark.parametrize(
+    "payload, message, position",
+    [
+        ("a=;", "Expected a value", 2),
+        ("a='open;", "Unterminated string", 2),
+        ("a='x' b;", "Expected ';' after 'a'", 6),
+        ("=1;", "Expected a variable name", 0),
+        ("lamp='4Ch';a=@;", "Expected an integer", 13),
+        # Positions are byte offsets, also after non-ASCII text
+        ("p='é';a=;", "Expected a value", 9),
+    ],
+)
+def test_error_positions(payload, message, position):
+    with pytest.raises(JSVarsError) as info:
+        parse_js_vars(payload)
+    assert info.value.message == message
+    assert info.value.position == position
+
+
+def test_latin1_fallback():
+    assert parse_js_vars(b"p='caf\xe9';") == {"p": "café"}
+
+
+def test_bad_assignments_are_skipped_when_collecting_errors():
+    errors = []
+    result = parse_js_vars("a=1;b=@;c=[1,2];d='x' y;e=2;\n", errors)
+    assert result == {"a": 1, "c": [1, 2], "e": 2}
+    assert [error.position for error in errors] == [6, 22]
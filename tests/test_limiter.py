@@ -0,0 +1,88 @@
+"""Shared request limiter: never more requests in flight than its cap."""
+
+import asyncio
+
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.limiter import RequestLimiter
+from pyhelialux.pyHelialux import Controller
+
+LIMIT = 3
+
+
+def test_cap_holds_under_concurrent_load():
+    async def run():
+        limiter = RequestLimiter(LIMIT)
+        running = 0
+        most = 0
+
+        async def request(i):
+            nonlocal running, most
+            async with limiter:
+                running += 1
+                most = max(most, running)
+                await asyncio.sleep(0.001 * (i % 4))
+                running -= 1
+
+        await asyncio.gather(*(request(i) for i in range(100)))
+        assert most == LIMIT
+        assert limiter.max_in_flight == LIMIT
+        assert limiter.in_flight == 0 and limiter.waiting == 0
+        assert limiter.requests == 100
+        assert limiter.max_waiting == 100 - LIMIT
+
+    asyncio.run(run())
+
+
+def test_cancelled_and_failed_requests_free_their_slot():
+    async def run():
+        limiter = RequestLimiter(1)
+        holder = asyncio.Event()
+
+        async def hold():
+            async with limiter:
+                await holder.wait()
+
+        first = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.waiting == 0
+        holder.set()
+        await first
+
+        try:
+            async with limiter:
+                raise ValueError
+        except ValueError:
+            pass
+        assert limiter.in_flight == 0
+        async with limiter:
+            assert limiter.in_flight == 1
+
+    asyncio.run(run())
+
+
+def test_controllers_sharing_a_limiter_stay_under_it():
+    async def run():
+        limiter = RequestLimiter(LIMIT)
+        emulators = [HelialuxEmulator(latency=0.02) for _ in range(4)]
+        for emulator in emulators:
+            await emulator.start()
+        try:
+            controllers = [Controller(emulator.url, limiter=limiter) for emulator in emulators]
+            try:
+                for _ in range(3):
+                    snapshots = await asyncio.gather(*(c.get_snapshot() for c in controllers))
+                    assert all(snapshot.status_ok for snapshot in snapshots)
+            finally:
+                await asyncio.gather(*(c.close() for c in controllers))
+        finally:
+            for emulator in emulators:
+                await emulator.stop()
+        assert limiter.requests == sum(sum(e.requests.values()) for e in emulators)
+        assert limiter.requests > LIMIT
+        assert limiter.max_in_flight == LIMIT
+
+    asyncio.run(run())
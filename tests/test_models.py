@@ -0,0 +1,110 @@
+"""HelialuxState: immutable, small, and cheap to build on every poll."""
+
+import asyncio
+import dataclasses
+import gc
+import tracemalloc
+
+import pytest
+
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.models import HelialuxSnapshot, HelialuxState
+from pyhelialux.pyHelialux import Controller
+
+# Memory kept per tank for the last snapshot and the state built from it
+MAX_TANK_BYTES = 2048
+# Peak allocated while parsing one poll and building its state
+MAX_POLL_PEAK_BYTES = 8192
+# Growth allowed per poll over POLLS polls: less than any object a leak would keep
+POLLS = 500
+MAX_GROWTH_PER_POLL = 16
+
+
+class CannedController(Controller):
+    """Controller answering from fixed payloads, so only parsing is measured."""
+
+    def __init__(self, payloads):
+        super().__init__("http://helialux.invalid")
+        self._payloads = payloads
+
+    async def _fetch_vars(self, filename):
+        return self._payloads[filename]
+
+
+def _controller():
+    emulator = HelialuxEmulator(start_minutes=700)
+    return CannedController({
+        "statusvars.js": emulator.statusvars().encode(),
+        "wpvars.js": emulator.wpvars().encode(),
+    })
+
+
+async def _poll(controller):
+    snapshot = await controller.get_snapshot()
+    return snapshot, HelialuxState.from_snapshots(snapshot, snapshot)
+
+
+def test_state_is_immutable():
+    state = HelialuxState(channels=bytes((10, 20, 30, 40)))
+    with pytest.raises(TypeError):
+        state.channels[0] = 100
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        state.channels = bytes(4)
+    assert state.is_on
+    assert state.rgbw_color == (102, 76, 51, 25)
+    assert state.brightness == 102
+
+
+def test_online_follows_the_latest_status_poll():
+    status = HelialuxSnapshot(status_ok=True, white=50)
+    assert HelialuxState.from_snapshots(status, None).online
+    stale = HelialuxState.from_snapshots(status, None, online=False)
+    assert not stale.online
+    assert stale.white == 50
+    assert not HelialuxState.from_snapshots(None, HelialuxSnapshot(profiles_ok=True)).online
+
+
+def test_memory_per_tank():
+    async def run():
+        controller = _controller()
+        await _poll(controller)
+        tanks = 200
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            fleet = [await _poll(controller) for _ in range(tanks)]
+            retained = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert len(fleet) == tanks
+        assert retained / tanks <= MAX_TANK_BYTES
+
+    asyncio.run(run())
+
+
+def test_allocations_per_poll():
+    async def run():
+        controller = _controller()
+        await _poll(controller)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            last = await _poll(controller)
+            peak = tracemalloc.get_traced_memory()[1] - before
+            # Let one-off caches (logging, interned names) settle first
+            for _ in range(POLLS):
+                last = await _poll(controller)
+            gc.collect()
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(POLLS):
+                last = await _poll(controller)
+            gc.collect()
+            growth = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        assert last[1].online
+        assert peak <= MAX_POLL_PEAK_BYTES
+        assert growth / POLLS <= MAX_GROWTH_PER_POLL
+
+    asyncio.run(run())
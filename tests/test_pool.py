@@ -0,0 +1,101 @@
+"""Shared session pool: no sessions or sockets outlive the controllers using them."""
+
+import asyncio
+import gc
+import os
+
+import aiohttp
+import pytest
+
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.pool import SessionPool
+from pyhelialux.pyHelialux import Controller
+
+CYCLES = 100
+TANKS = 3
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def _open_sessions():
+    gc.collect()
+    return sum(
+        1 for obj in gc.get_objects() if isinstance(obj, aiohttp.ClientSession) and not obj.closed
+    )
+
+
+async def _settle(baseline, timeout=2.0):
+    """Wait for the emulator to notice the closed connections, return the fd count."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while _open_fds() > baseline and loop.time() < deadline:
+        await asyncio.sleep(0.02)
+    return _open_fds()
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc to count file descriptors")
+def test_setup_unload_cycles_leak_nothing():
+    async def run():
+        pool = SessionPool()
+        async with HelialuxEmulator() as emulator:
+            sessions = _open_sessions()
+            fds = _open_fds()
+            for _ in range(CYCLES):
+                # What async_setup_entry does for each tank, then async_unload_entry
+                controllers = [Controller(emulator.url, pool=pool) for _ in range(TANKS)]
+                for controller in controllers:
+                    snapshot = await controller.get_snapshot()
+                    assert snapshot.status_ok
+                    assert await controller.device_info(lamp=snapshot.lamp)
+                assert pool.users == TANKS
+                for controller in controllers:
+                    await controller.close()
+                assert pool.users == 0
+                assert pool.session is None
+
+            assert _open_sessions() == sessions
+            assert await _settle(fds) == fds
+
+    asyncio.run(run())
+
+
+def test_context_manager_releases_session():
+    async def run():
+        pool = SessionPool()
+        async with HelialuxEmulator() as emulator:
+            async with Controller(emulator.url, pool=pool) as first:
+                async with Controller(emulator.url, pool=pool) as second:
+                    assert await first._get_session() is await second._get_session()
+                    assert pool.users == 2
+                assert pool.users == 1
+            assert pool.session is None
+
+    asyncio.run(run())
+
+
+def test_session_held_on_another_loop_is_not_replaced():
+    pool = SessionPool()
+
+    async def hold():
+        return pool.acquire()
+
+    loop = asyncio.new_event_loop()
+    try:
+        session = loop.run_until_complete(hold())
+        with pytest.raises(RuntimeError):
+            asyncio.run(hold())
+        assert pool.session is session
+        loop.run_until_complete(pool.release())
+        assert session.closed
+    finally:
+        loop.close()
+
+    # Once released, a new loop gets a fresh session
+    async def cycle():
+        pool.acquire()
+        await pool.release()
+
+    asyncio.run(cycle())
+    assert pool.session is None
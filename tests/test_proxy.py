@@ -0,0 +1,98 @@
+"""Caching proxy: concurrent readers share one upstream fetch per file."""
+
+import asyncio
+
+import aiohttp
+
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.proxy import DEFAULT_TTLS, HelialuxProxy
+from pyhelialux.pyHelialux import Controller
+
+CONSUMERS = 10
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _get_all(session, url, count=CONSUMERS):
+    async def get():
+        async with session.get(url) as response:
+            assert response.status == 200
+            return await response.text()
+
+    return await asyncio.gather(*(get() for _ in range(count)))
+
+
+def test_concurrent_consumers_cause_one_upstream_fetch():
+    async def run():
+        # Slow enough that every consumer asks while the first fetch is in flight
+        async with HelialuxEmulator(latency=0.2) as emulator:
+            async with HelialuxProxy(emulator.url) as proxy, aiohttp.ClientSession() as session:
+                bodies = await _get_all(session, f"{proxy.url}/statusvars.js")
+                assert len(set(bodies)) == 1
+                assert emulator.requests == {"/statusvars.js": 1}
+                assert proxy.misses == CONSUMERS
+                assert proxy.coalesced == CONSUMERS - 1
+
+                # Fresh now: more readers are answered from the cache
+                await _get_all(session, f"{proxy.url}/statusvars.js")
+                assert emulator.requests == {"/statusvars.js": 1}
+                assert proxy.hits == CONSUMERS
+
+    asyncio.run(run())
+
+
+def test_controllers_share_the_proxy():
+    async def run():
+        async with HelialuxEmulator(latency=0.1) as emulator:
+            async with HelialuxProxy(emulator.url) as proxy:
+                controllers = [Controller(proxy.url) for _ in range(CONSUMERS)]
+                try:
+                    snapshots = await asyncio.gather(*(c.get_snapshot() for c in controllers))
+                finally:
+                    await asyncio.gather(*(c.close() for c in controllers))
+                assert all(s.current_profile == emulator.profile.name for s in snapshots)
+                assert emulator.requests == {"/statusvars.js": 1, "/wpvars.js": 1}
+
+    asyncio.run(run())
+
+
+def test_expired_file_is_fetched_again():
+    async def run():
+        clock = FakeClock()
+        async with HelialuxEmulator() as emulator:
+            async with HelialuxProxy(emulator.url, clock=clock) as proxy, aiohttp.ClientSession() as session:
+                await _get_all(session, f"{proxy.url}/statusvars.js")
+                clock.now += DEFAULT_TTLS["statusvars.js"] - 0.1
+                await _get_all(session, f"{proxy.url}/statusvars.js")
+                assert emulator.requests == {"/statusvars.js": 1}
+
+                clock.now += 0.2
+                await _get_all(session, f"{proxy.url}/statusvars.js")
+                assert emulator.requests == {"/statusvars.js": 2}
+                # Each file has its own time to live
+                await _get_all(session, f"{proxy.url}/wpvars.js")
+                clock.now += DEFAULT_TTLS["statusvars.js"] + 1
+                await _get_all(session, f"{proxy.url}/wpvars.js")
+                assert emulator.requests == {"/statusvars.js": 2, "/wpvars.js": 1}
+
+    asyncio.run(run())
+
+
+def test_write_drops_the_cached_status():
+    async def run():
+        async with HelialuxEmulator() as emulator:
+            async with HelialuxProxy(emulator.url) as proxy, aiohttp.ClientSession() as session:
+                await _get_all(session, f"{proxy.url}/statusvars.js", count=1)
+                async with session.post(f"{proxy.url}/stat", data={"action": "14", "cswi": "false"}) as response:
+                    assert response.status == 200
+                await _get_all(session, f"{proxy.url}/statusvars.js", count=1)
+                assert emulator.requests["/statusvars.js"] == 2
+                assert proxy.writes == 1
+
+    asyncio.run(run())
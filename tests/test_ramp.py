@@ -0,0 +1,125 @@
+"""Light transitions against the emulator: bounded request rate and clean cancellation."""
+
+import asyncio
+import math
+import time
+
+from pyhelialux.emulator import HelialuxEmulator
+from pyhelialux.pool import SessionPool
+from pyhelialux.pyHelialux import Controller
+from pyhelialux.ramp import RampEngine
+from pyhelialux.tracing import RequestTracer
+
+MIN_INTERVAL = 0.2
+DEBOUNCE = 0.05
+START = (0, 0, 0, 0)
+TARGET = (80, 60, 40, 20)
+INTERRUPT = (10, 10, 10, 10)
+
+
+class Posts(list):
+    """Client-side timestamps of every POST to /stat."""
+
+    def tracer(self):
+        return RequestTracer(
+            on_request_start=lambda trace: self.append(time.monotonic())
+            if trace.endpoint == "/stat" else None
+        )
+
+    def busiest(self, window):
+        """Return the most posts sent within any ``window`` seconds."""
+        busiest = first = 0
+        for last, when in enumerate(self):
+            while when - self[first] >= window:
+                first += 1
+            busiest = max(busiest, last - first + 1)
+        return busiest
+
+
+def _controller(emulator, posts):
+    return Controller(
+        emulator.url,
+        pool=SessionPool(),
+        tracer=posts.tracer(),
+        command_debounce=DEBOUNCE,
+        ramp=RampEngine(min_interval=MIN_INTERVAL),
+    )
+
+
+def test_fade_request_rate_is_bounded():
+    async def run():
+        posts = Posts()
+        transition = 1.2
+        async with HelialuxEmulator() as emulator:
+            async with _controller(emulator, posts) as controller:
+                frames = []
+                assert await controller.queue_manual_color_ramp(
+                    START, TARGET, transition, on_frame=frames.append
+                )
+                assert emulator.channels == TARGET
+                assert frames[-1] == TARGET
+        # One frame per interval plus the first and last, and one request
+        # to start colour simulation
+        assert len(posts) <= math.ceil(transition / MIN_INTERVAL) + 2 + 1
+        assert posts.busiest(1.0) <= 1 / MIN_INTERVAL + 2
+
+    asyncio.run(run())
+
+
+def test_slow_device_skips_frames():
+    async def run():
+        posts = Posts()
+        transition = 1.2
+        async with HelialuxEmulator(latency=MIN_INTERVAL * 1.5) as emulator:
+            async with _controller(emulator, posts) as controller:
+                assert await controller.queue_manual_color_ramp(START, TARGET, transition)
+                assert emulator.channels == TARGET
+                assert controller.ramp.frames_skipped > 0
+        assert len(posts) <= math.ceil(transition / MIN_INTERVAL) + 2 + 1
+
+    asyncio.run(run())
+
+
+def test_newer_colour_cancels_fade():
+    async def run():
+        posts = Posts()
+        async with HelialuxEmulator() as emulator:
+            async with _controller(emulator, posts) as controller:
+                shown = []
+                fade = asyncio.ensure_future(
+                    controller.queue_manual_color_ramp(START, TARGET, 3.0, on_frame=shown.append)
+                )
+                await asyncio.sleep(0.5)
+                assert await controller.queue_manual_color(*INTERRUPT)
+                assert await asyncio.wait_for(fade, MIN_INTERVAL * 2) is False
+                assert emulator.channels == INTERRUPT
+                assert INTERRUPT not in shown
+
+                # Nothing from the old fade arrives afterwards
+                sent = len(posts)
+                await asyncio.sleep(MIN_INTERVAL * 3)
+                assert len(posts) == sent
+                assert emulator.channels == INTERRUPT
+                assert controller.ramp.ramps_stopped == 1
+
+    asyncio.run(run())
+
+
+def test_simulation_command_is_not_held_up_by_fade():
+    async def run():
+        posts = Posts()
+        async with HelialuxEmulator() as emulator:
+            async with _controller(emulator, posts) as controller:
+                fade = asyncio.ensure_future(controller.queue_manual_color_ramp(START, TARGET, 6.0))
+                await asyncio.sleep(0.8)
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                assert await controller.queue_color_simulation(False)
+                assert loop.time() - started < 1.0
+                assert await asyncio.wait_for(fade, MIN_INTERVAL * 2) is False
+
+                await asyncio.sleep(MIN_INTERVAL * 3)
+                # The fade didn't start colour simulation again
+                assert not emulator.color_simulation
+
+    asyncio.run(run())
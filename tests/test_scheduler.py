@@ -0,0 +1,76 @@
+"""Fleet scheduler: tanks polling at the same interval get their own slots."""
+
+from types import SimpleNamespace
+
+from fixtures import hass_stub
+
+hass_stub.install(prefer_installed=False)
+
+from custom_components.juwel_helialux.scheduler import FleetScheduler  # noqa: E402
+
+INTERVAL = 60
+
+
+class Tank:
+    def __init__(self, name):
+        self.tank_name = name
+
+
+class FakeLoop:
+    def __init__(self):
+        self.now = 500.0
+
+    def time(self):
+        return self.now
+
+
+def _fleet(count, max_spacing=2):
+    loop = FakeLoop()
+    scheduler = FleetScheduler(SimpleNamespace(loop=loop), max_spacing=max_spacing)
+    tanks = [Tank(f"Tank {i}") for i in range(count)]
+    for tank in tanks:
+        scheduler.register(tank)
+    return loop, scheduler, tanks
+
+
+def _gaps(times):
+    times = sorted(times)
+    return [b - a for a, b in zip(times, times[1:])]
+
+
+def test_tanks_due_together_are_staggered():
+    loop, scheduler, tanks = _fleet(5)
+    delays = [scheduler.reserve(tank, INTERVAL) for tank in tanks]
+    assert delays[0] == INTERVAL
+    assert all(delay >= INTERVAL for delay in delays)
+    assert min(_gaps(delays)) >= scheduler.max_spacing
+
+
+def test_spacing_shrinks_to_fit_the_fleet_in_the_interval():
+    # 40 tanks at 2s apart wouldn't fit in a 60s interval
+    loop, scheduler, tanks = _fleet(40)
+    delays = [scheduler.reserve(tank, INTERVAL) for tank in tanks]
+    assert min(_gaps(delays)) >= INTERVAL / len(tanks) - 1e-9
+    assert max(delays) < 2 * INTERVAL
+
+
+def test_slots_are_kept_from_poll_to_poll():
+    loop, scheduler, tanks = _fleet(3)
+    planned = {tank: loop.now + scheduler.reserve(tank, INTERVAL) for tank in tanks}
+    for _ in range(5):
+        # Each tank polls on time and plans its next poll one interval later
+        for tank in sorted(tanks, key=lambda tank: planned[tank]):
+            loop.now = planned[tank]
+            scheduler.poll_started(tank)
+            planned[tank] = loop.now + scheduler.reserve(tank, INTERVAL)
+            assert planned[tank] - loop.now == INTERVAL
+    assert min(_gaps(planned.values())) >= scheduler.max_spacing
+    assert scheduler.worst_lag == 0
+
+
+def test_unregistered_tank_frees_its_slot():
+    loop, scheduler, tanks = _fleet(2)
+    scheduler.reserve(tanks[0], INTERVAL)
+    scheduler.unregister(tanks[0])
+    assert scheduler.reserve(tanks[1], INTERVAL) == INTERVAL
+    assert scheduler.stats()["tanks"] == 1
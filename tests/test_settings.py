@@ -0,0 +1,87 @@
+"""EntrySettings: one delayed write per burst, and the move from per-entity files."""
+
+import asyncio
+import os
+
+from fixtures import hass_stub
+
+hass_stub.install(prefer_installed=False)
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import storage  # noqa: E402
+
+from custom_components.juwel_helialux.settings import LEGACY_SETTINGS, EntrySettings  # noqa: E402
+
+ENTRY = "entry"
+SAVE_DELAY = 0.05
+STORE_FILE = f"juwel_helialux.{ENTRY}.settings"
+
+
+def _count_writes(monkeypatch):
+    """Count every store write to disk, per file name."""
+    writes = {}
+    write = storage.Store._write_data
+
+    def counting_write(self, path, data):
+        writes[os.path.basename(path)] = writes.get(os.path.basename(path), 0) + 1
+        return write(self, path, data)
+
+    monkeypatch.setattr(storage.Store, "_write_data", counting_write)
+    return writes
+
+
+def _stored_files(hass):
+    return sorted(os.listdir(hass.config.path(".storage")))
+
+
+def test_burst_of_changes_is_saved_once(tmp_path, monkeypatch):
+    async def run():
+        writes = _count_writes(monkeypatch)
+        hass = HomeAssistant(str(tmp_path))
+        settings = EntrySettings(hass, ENTRY, save_delay=SAVE_DELAY)
+        await settings.async_load()
+        assert len(settings) == 0
+
+        for step in range(40):
+            settings["daytime_simulation_position"] = step / 4
+        settings["daytime_simulation_position"] = 9.75  # unchanged, nothing to save
+        assert writes == {}
+
+        await asyncio.sleep(SAVE_DELAY * 3)
+        await hass.async_block_till_done()
+        assert writes == {STORE_FILE: 1}
+
+        reloaded = EntrySettings(hass, ENTRY)
+        await reloaded.async_load()
+        assert dict(reloaded) == {"daytime_simulation_position": 9.75}
+        await hass.async_stop()
+
+    asyncio.run(run())
+
+
+def test_legacy_files_are_migrated_once(tmp_path, monkeypatch):
+    async def run():
+        hass = HomeAssistant(str(tmp_path))
+        legacy = dict(zip(LEGACY_SETTINGS, (2, 1.5, 13.5)))
+        for key, value in legacy.items():
+            await storage.Store(hass, 1, f"juwel_helialux_{ENTRY}_{key}.json").async_save({"value": value})
+        assert len(_stored_files(hass)) == len(LEGACY_SETTINGS)
+
+        writes = _count_writes(monkeypatch)
+        settings = EntrySettings(hass, ENTRY)
+        await settings.async_load()
+        assert dict(settings) == {key: float(value) for key, value in legacy.items()}
+        assert _stored_files(hass) == [STORE_FILE]
+        assert writes == {STORE_FILE: 1}
+        await hass.async_stop()
+
+        # A second setup loads the single store and writes nothing
+        hass = HomeAssistant(str(tmp_path))
+        again = EntrySettings(hass, ENTRY)
+        await again.async_load()
+        assert dict(again) == dict(settings)
+        assert _stored_files(hass) == [STORE_FILE]
+        assert writes == {STORE_FILE: 1}
+        await hass.async_stop()
+
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+"""Setting up a tank fetches each controller endpoint exactly once."""
+
+import asyncio
+
+from fixtures import hass_stub
+
+hass_stub.install(prefer_installed=False)
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.juwel_helialux import (  # noqa: E402
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.juwel_helialux.const import DOMAIN  # noqa: E402
+from custom_components.juwel_helialux.coordinator import JuwelHelialuxCoordinator  # noqa: E402
+from pyhelialux.emulator import HelialuxEmulator  # noqa: E402
+
+BUDGET = {"/statusvars.js": 1, "/wpvars.js": 1, "/devvars.js": 1}
+
+
+def _host(emulator):
+    return emulator.url.split("://", 1)[1]
+
+
+def test_first_refresh_fetches_each_endpoint_once(tmp_path):
+    async def run():
+        async with HelialuxEmulator() as emulator:
+            hass = HomeAssistant(str(tmp_path))
+            coordinator = JuwelHelialuxCoordinator(hass, _host(emulator), "http", "Test tank", 1)
+            try:
+                await coordinator.async_config_entry_first_refresh()
+                assert coordinator.last_update_success
+                # The first poll also fetched the device info
+                assert coordinator.device_info["sw_version"] == emulator.info[2].lstrip("V")
+            finally:
+                await coordinator.async_shutdown()
+                await hass.async_stop()
+            assert emulator.requests == BUDGET
+
+    asyncio.run(run())
+
+
+def test_entry_setup_fetches_each_endpoint_once(tmp_path):
+    async def run():
+        async with HelialuxEmulator() as emulator:
+            hass = HomeAssistant(str(tmp_path))
+            entry = ConfigEntry(
+                DOMAIN,
+                "test",
+                "Test tank",
+                {"tank_name": "Test tank", "tank_host": _host(emulator), "tank_protocol": "http"},
+            )
+            assert await async_setup_entry(hass, entry)
+            try:
+                entities = hass.config_entries.entities[entry.entry_id]
+                # Every platform added its entities, and each wrote its state
+                assert len(entities) == len(hass.states) > 20
+                assert hass.states.get("light.test_tank_light").state == "on"
+                await hass.async_block_till_done()
+            finally:
+                assert await async_unload_entry(hass, entry)
+                await hass.async_stop()
+            assert emulator.requests == BUDGET
+
+    asyncio.run(run())